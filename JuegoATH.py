@@ -16,31 +16,35 @@ from render_utils import render_text_gradient
 from game_session import GameSession
 from statistics_manager import StatisticsManager
 from achievements_manager import AchievementsManager
-from enhanced_powerups import EnhancedPowerUpManager, create_enhanced_powerup_icons
+from enhanced_powerups import create_enhanced_powerup_icons
+from display_manager import DisplayManager
+from render_queue import circle_sprite, LAYER_STARS, LAYER_PARTICLES
+from sprite_cache import SpriteVariants
+from texture_atlas import load_image
+from asset_pack import MIXER_SETTINGS, load_sound, load_music
+from asset_cache import scaled_image
 
 # ========================
 # CONFIGURACIÓN INICIAL OPTIMIZADA
 # ========================
-def initialize_pygame() -> Tuple[int, int, pygame.Surface]:
+def initialize_pygame(display: DisplayManager) -> Tuple[int, int, pygame.Surface]:
     """Initialize pygame systems with error handling."""
     try:
         pygame.init()
         pygame.freetype.init()
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        pygame.mixer.init(**MIXER_SETTINGS, buffer=512)
         
-        info = pygame.display.Info()
-        width, height = info.current_w, info.current_h
-        screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("SpeedType Animated")
-        
-        return width, height, screen
+        return display.create_screen("SpeedType Animated")
     except Exception as e:
         print(f"Error initializing pygame: {e}")
         # Fallback to smaller resolution
         screen = pygame.display.set_mode((1024, 768))
         return 1024, 768, screen
 
-ANCHO, ALTO, pantalla = initialize_pygame()
+display_manager = DisplayManager.load()
+# Estadísticas del jugador (player_statistics.json): una sola instancia para toda la aplicación
+stats_manager = StatisticsManager()
+ANCHO, ALTO, pantalla = initialize_pygame(display_manager)
 clock = pygame.time.Clock()
 
 # ========================
@@ -87,30 +91,26 @@ FUENTE_LOGO_STYLE = "Impact"
 # ========================
 # CARGA DE RECURSOS
 # ========================
+# Los recursos salen de assets.pak si existe (ver asset_pack.py) o de los archivos sueltos;
+# los fondos escalados a la resolución de la pantalla se guardan en .cache (ver asset_cache.py)
 try:
-    ruta_fondo = os.path.join(os.path.dirname(__file__), "Fondo2.png")
-    fondo_img = pygame.image.load(ruta_fondo).convert()
-    fondo_img = pygame.transform.scale(fondo_img, (ANCHO, ALTO))
+    fondo_img = scaled_image("Fondo2.png", (ANCHO, ALTO))
 except: fondo_img = pygame.Surface((ANCHO, ALTO)); fondo_img.fill(NEGRO)
 
-try:
-    ruta_fondo_pausa = os.path.join(os.path.dirname(__file__), "Fondo2.png")
-    fondo_pausa_img = pygame.image.load(ruta_fondo_pausa).convert()
-    fondo_pausa_img = pygame.transform.scale(fondo_pausa_img, (ANCHO, ALTO))
-except Exception as e: print(f"Error al cargar el fondo de pausa: {e}"); fondo_pausa_img = None
+fondo_pausa_img = fondo_img  # Misma imagen que el fondo de juego: se decodifica una sola vez
 
 estrellas = [[random.randint(0, ANCHO), random.randint(0, ALTO), random.uniform(0.5, 1.5)] for _ in range(100)]
 particulas = []
 music_loaded = False
 try:
-    acierto_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "acierto.wav"))
-    fallo_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "fallo.wav"))
-    game_over_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "game_over.wav"))
-    pygame.mixer.music.load(os.path.join(os.path.dirname(__file__), "musica_fondo.mp3"))
+    acierto_sound = load_sound("acierto.wav")
+    fallo_sound = load_sound("fallo.wav")
+    game_over_sound = load_sound("game_over.wav")
+    load_music("musica_fondo.mp3")
     pygame.mixer.music.set_volume(0.5)
-    powerup_activate_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "powerup.mp3"))
-    shield_hit_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "letraescudo.mp3"))
-    double_score_activate_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "doblep.mp3"))
+    powerup_activate_sound = load_sound("powerup.mp3")
+    shield_hit_sound = load_sound("letraescudo.mp3")
+    double_score_activate_sound = load_sound("doblep.mp3")
     music_loaded = True
 except Exception as e:
     print(f"Error cargando música o sonidos: {e}")
@@ -119,21 +119,26 @@ except Exception as e:
 powerup_icons = {}
 icon_size = 60
 try:
-    powerup_icons["ralentizar"] = pygame.transform.scale(pygame.image.load(os.path.join(os.path.dirname(__file__), "caracol.png")).convert_alpha(), (icon_size, icon_size))
-    powerup_icons["escudo"] = pygame.transform.scale(pygame.image.load(os.path.join(os.path.dirname(__file__), "escudo.png")).convert_alpha(), (icon_size, icon_size))
-    powerup_icons["doble_puntuacion"] = pygame.transform.scale(pygame.image.load(os.path.join(os.path.dirname(__file__), "dos.png")).convert_alpha(), (icon_size, icon_size))
+    # Iconos ya escalados en atlas.png (ver texture_atlas.py); sin atlas se cargan los archivos sueltos
+    powerup_icons["ralentizar"] = load_image("caracol.png", (icon_size, icon_size))
+    powerup_icons["escudo"] = load_image("escudo.png", (icon_size, icon_size))
+    powerup_icons["doble_puntuacion"] = load_image("dos.png", (icon_size, icon_size))
 except Exception as e:
     print(f"Error cargando iconos de power-ups: {e}")
     for p_type in ["ralentizar", "escudo", "doble_puntuacion"]:
         powerup_icons[p_type] = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
+# Iconos de los efectos mejorados (con gráfico de respaldo si falta alguno)
+powerup_icons.update(create_enhanced_powerup_icons(icon_size))
 
 # --- Cargar imagen de la nave ---
 spawner_icons = {}
 spawner_icon_size = (80, 80) # Tamaño para la nave
+SPAWNER_ANGLES = 24 # Orientaciones pre-calculadas de la nave
+SPAWNER_SOURCE_SIZE = (256, 256) # Resolución de la nave usada para generar las rotaciones
 try:
     # Cargar solo nave.png
-    nave_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "nave.png")).convert_alpha()
-    nave_img = pygame.transform.scale(nave_img, spawner_icon_size)
+    nave_src = load_image("nave.png", SPAWNER_SOURCE_SIZE)
+    nave_img = load_image("nave.png", spawner_icon_size)
     
     # Usar la nave para todos los tipos de spawner
     spawner_icons["nave"] = nave_img
@@ -156,33 +161,54 @@ except Exception as e:
     spawner_icons["icono_lateral"] = fallback_surface
     spawner_icons["nave_espacial"] = fallback_surface
     #spawner_icons["barco"] = fallback_surface 
+    nave_src = fallback_surface
+
+# Orientaciones de la nave generadas al cargar (las naves laterales vuelan con el morro por delante)
+spawner_variants = SpriteVariants(nave_src, spawner_icon_size, SPAWNER_ANGLES)
+spawner_icons["barco"] = spawner_variants.for_velocity(-1, 0, mirrored=True)  # Entra por la derecha
+spawner_icons["barco_left"] = spawner_variants.for_velocity(1, 0)  # Entra por la izquierda
 
 # ========================
 # FUNCIONES DE UI Y UTILIDADES
 # ========================
-def dibujar_estrellas(velocidad=1):
+def dibujar_estrellas(velocidad=1, queue=None):
+    """Mueve y dibuja las estrellas del fondo. Con 'queue' (RenderQueue) solo las encola."""
+    sprite = circle_sprite(BLANCO, 2); lote = []
     for estrella in estrellas:
         estrella[1] += estrella[2] * velocidad
         if estrella[1] > ALTO:
             estrella[0] = random.randint(0, ANCHO); estrella[1] = 0
-        pygame.draw.circle(pantalla, BLANCO, (int(estrella[0]), int(estrella[1])), 2)
+        lote.append((sprite, (int(estrella[0]) - 2, int(estrella[1]) - 2)))
+    if queue is not None: queue.layers[LAYER_STARS].extend(lote)
+    else: pantalla.blits(lote, doreturn=False)
 
 def crear_particulas(x, y, color):
     for _ in range(10):
-        particulas.append({'x': x, 'y': y, 'vx': random.uniform(-2, 2), 'vy': random.uniform(-2, 2), 'radius': random.randint(2, 5), 'color': color, 'life': 30})
+        particulas.append({'x': x, 'y': y, 'vx': random.uniform(-2, 2), 'vy': random.uniform(-2, 2), 'radius': random.randint(2, 5), 'color': tuple(color), 'life': 30})
 
-def actualizar_y_dibujar_particulas():
+def actualizar_y_dibujar_particulas(queue=None, paso=1):
+    """Mueve y dibuja las partículas vivas. Con 'queue' (RenderQueue) solo las encola.
+    'paso' es el avance en fotogramas de 60 FPS (escalado por el grupo de partículas de la partida)."""
     global particulas
-    particulas_vivas = []
+    particulas_vivas = []; lote = []; sprites = {}
     for p in particulas:
-        p['x'] += p['vx']; p['y'] += p['vy']; p['radius'] -= 0.1; p['life'] -= 1
+        p['x'] += p['vx'] * paso; p['y'] += p['vy'] * paso; p['radius'] -= 0.1 * paso; p['life'] -= paso
         if p['life'] > 0 and p['radius'] > 0:
-            pygame.draw.circle(pantalla, p['color'], (int(p['x']), int(p['y'])), int(p['radius']))
+            radio = int(p['radius'])
+            if radio >= 1:
+                key = (p['color'], radio); sprite = sprites.get(key)
+                if sprite is None: sprite = sprites[key] = circle_sprite(p['color'], radio)
+                lote.append((sprite, (int(p['x']) - radio, int(p['y']) - radio)))
             particulas_vivas.append(p)
     particulas = particulas_vivas
+    if queue is not None: queue.layers[LAYER_PARTICLES].extend(lote)
+    else: pantalla.blits(lote, doreturn=False)
 
 def guardar_config(fuente, tam, color):
-    with open("config.json", "w") as f: json.dump({"fuente": fuente, "tam": tam, "color": list(color)}, f)
+    # Conservar las demás claves (p. ej. "display") al actualizar la fuente/color
+    data = cargar_config() or {}
+    data.update({"fuente": fuente, "tam": tam, "color": list(color)})
+    with open("config.json", "w") as f: json.dump(data, f)
 
 def cargar_config():
     if os.path.exists("config.json"):
@@ -265,7 +291,7 @@ def pantalla_intro():
     start_time = time.time()
     if music_loaded: pygame.mixer.music.play(-1, 0.0)
     logo_img = None
-    try: logo_img = pygame.transform.scale(pygame.image.load(os.path.join(os.path.dirname(__file__), "Logotipo.png")).convert_alpha(), (ANCHO, ALTO))
+    try: logo_img = scaled_image("Logotipo.png", (ANCHO, ALTO), alpha=True)
     except Exception as e: print(f"Error al cargar Logotipo.png: {e}")
     while True:
         elapsed_time = time.time() - start_time
@@ -278,7 +304,7 @@ def pantalla_intro():
         if elapsed_time < 1.5: alpha = int(255 * (elapsed_time / 1.5))
         elif elapsed_time > 3.0: alpha = int(255 * ((4.5 - elapsed_time) / 1.5))
         if logo_img: logo_img.set_alpha(max(0, min(255, alpha))); pantalla.blit(logo_img, (0, 0))
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_configuracion(config):
     tam = config["tam"]; nombre_fuente = config["fuente"]; color = tuple(config["color"])
@@ -293,6 +319,14 @@ def pantalla_configuracion(config):
     btn_fuente_right = Button(ANCHO//2+160, y_base_botones+100, 40, 40, ">", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
     btn_color_left = Button(ANCHO//2-200, y_base_botones+150, 40, 40, "<", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
     btn_color_right = Button(ANCHO//2+160, y_base_botones+150, 40, 40, ">", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    # Ajustes de pantalla (FPS se aplica al instante; VSync, escala y motor al reiniciar el juego)
+    y_display = ALTO - 260
+    btn_fps_left = Button(ANCHO//2-200, y_display, 40, 40, "<", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_fps_right = Button(ANCHO//2+160, y_display, 40, 40, ">", pygame.freetype.SysFont("arial", 25), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_vsync = Button(ANCHO//2-200, y_display+50, 125, 40, "VSYNC", pygame.freetype.SysFont("arial", 18), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_escala = Button(ANCHO//2-62, y_display+50, 125, 40, "ESCALA", pygame.freetype.SysFont("arial", 18), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    btn_motor = Button(ANCHO//2+75, y_display+50, 125, 40, "MOTOR", pygame.freetype.SysFont("arial", 18), GRIS_OSCURO, GRIS_CLARO, border_radius=5)
+    fuente_display = pygame.freetype.SysFont("arial", 28)
     while True:
         for evento in pygame.event.get():
             if evento.type == pygame.QUIT: pygame.quit(); sys.exit()
@@ -302,7 +336,13 @@ def pantalla_configuracion(config):
             elif btn_fuente_right.handle_event(evento): idx_fuente=(idx_fuente+1)%len(fuentes_disponibles); nombre_fuente=fuentes_disponibles[idx_fuente]
             elif btn_color_left.handle_event(evento): idx_color=(idx_color-1)%len(colores_disponibles); color=colores_disponibles[idx_color]
             elif btn_color_right.handle_event(evento): idx_color=(idx_color+1)%len(colores_disponibles); color=colores_disponibles[idx_color]
+            elif btn_fps_left.handle_event(evento): display_manager.cycle_target_fps(-1)
+            elif btn_fps_right.handle_event(evento): display_manager.cycle_target_fps(1)
+            elif btn_vsync.handle_event(evento): display_manager.vsync = not display_manager.vsync
+            elif btn_escala.handle_event(evento): display_manager.cycle_render_scale(1)
+            elif btn_motor.handle_event(evento): display_manager.cycle_render_backend()
             elif btn_guardar.handle_event(evento) or (evento.type==pygame.KEYDOWN and evento.key==pygame.K_RETURN):
+                display_manager.save()
                 return nombre_fuente, tam, color
         pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas()
         y_base=100; separacion=50
@@ -316,7 +356,14 @@ def pantalla_configuracion(config):
         texto_prev_rect.center = (ANCHO//2, y_base + 4*separacion + 50); pantalla.blit(texto_prev_surf, texto_prev_rect)
         btn_tam_left.draw(pantalla); btn_tam_right.draw(pantalla); btn_fuente_left.draw(pantalla); btn_fuente_right.draw(pantalla)
         btn_color_left.draw(pantalla); btn_color_right.draw(pantalla); btn_guardar.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        latencia = display_manager.get_measured_latency(); tiempo_cuadro = display_manager.get_backend().get_frame_time_ms()
+        texto_fps, rect_fps = fuente_display.render(f"Pantalla: {display_manager.get_fps_label()}" + (f" ({latencia:.0f} ms)" if latencia is not None else "")
+                                                    + (f" - {tiempo_cuadro:.1f} ms/cuadro" if tiempo_cuadro is not None else ""), BLANCO)
+        rect_fps.center = (ANCHO//2, y_display+20); pantalla.blit(texto_fps, rect_fps)
+        btn_vsync.text = f"VSYNC: {'SÍ' if display_manager.vsync else 'NO'}"; btn_escala.text = f"ESCALA: {int(display_manager.render_scale*100)}%"
+        btn_motor.text = f"MOTOR: {display_manager.render_backend.upper()}"
+        btn_fps_left.draw(pantalla); btn_fps_right.draw(pantalla); btn_vsync.draw(pantalla); btn_escala.draw(pantalla); btn_motor.draw(pantalla)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_menu_principal():
     # --- LÍNEA AÑADIDA ---
@@ -356,7 +403,7 @@ def pantalla_menu_principal():
         rect_titulo = pygame.Rect(0, ALTO // 4 - 50, ANCHO, 100)
         render_text_gradient(fuente_titulo, "SPEEDTYPE", rect_titulo, pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
         for btn in botones: btn.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_seleccion_modo_juego():
     fuente_opciones = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 30)
@@ -374,7 +421,7 @@ def pantalla_seleccion_modo_juego():
         pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5)
         render_text_gradient(pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60), "SELECCIONAR MODO", pygame.Rect(0, ALTO//4-50, ANCHO, 100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 4)
         btn_arcane.draw(pantalla); btn_versus.draw(pantalla); btn_infinito.draw(pantalla); btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_configuracion_arcane():
     fuente_titulo_estilo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
@@ -401,7 +448,7 @@ def pantalla_configuracion_arcane():
         render_text_gradient(fuente_titulo_estilo, "LÍMITE DE FALLOS", pygame.Rect(0,ALTO//4-50,ANCHO,100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
         fallos_texto, fallos_rect = fuente_fallos_num.render(f"{fallos_disponibles[fallos_seleccionado_idx]} fallos", BLANCO); fallos_rect.center = (ANCHO//2, ALTO//2-10); pantalla.blit(fallos_texto, fallos_rect)
         btn_fallos_left.draw(pantalla); btn_fallos_right.draw(pantalla); btn_iniciar.draw(pantalla); btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_configuracion_versus():
     fuente_titulo_estilo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
@@ -428,7 +475,7 @@ def pantalla_configuracion_versus():
         render_text_gradient(fuente_titulo_estilo, "LÍMITE DE TIEMPO", pygame.Rect(0,ALTO//4-50,ANCHO,100), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 3)
         tiempo_texto, tiempo_rect = fuente_tiempo_num.render(f"{tiempos_disponibles[tiempo_seleccionado_idx]} min", BLANCO); tiempo_rect.center = (ANCHO//2, ALTO//2-10); pantalla.blit(tiempo_texto, tiempo_rect)
         btn_tiempo_left.draw(pantalla); btn_tiempo_right.draw(pantalla); btn_iniciar.draw(pantalla); btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_de_pausa():
     fuente_pausa_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60)
@@ -449,7 +496,7 @@ def pantalla_de_pausa():
         pantalla.blit(superficie_oscura, (0,0))
         render_text_gradient(fuente_pausa_titulo, "PAUSA", pygame.Rect(0, ALTO//2-200, ANCHO, 70), pantalla, [BLANCO, (200,200,200)], COLOR_CONTORNO, 3)
         btn_reanudar.draw(pantalla); btn_guardar_salir.draw(pantalla); btn_salir_sin_guardar.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_fin_juego(score, aciertos, fallos, num_jugadores, scores_j1=None, scores_j2=None):
     fuente_ui_go_text = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 40)
@@ -469,7 +516,7 @@ def pantalla_fin_juego(score, aciertos, fallos, num_jugadores, scores_j1=None, s
             t2, r2 = fuente_ui_go_stats.render(f"Puntaje: {score}", BLANCO); r2.center = (ANCHO//2, ALTO//2 - 20); pantalla.blit(t2, r2)
             t3, r3 = fuente_ui_go_stats.render(f"Aciertos: {aciertos} Fallos: {fallos} Precisión: {prec:.2f}%", BLANCO); r3.center = (ANCHO//2, ALTO//2 + 20); pantalla.blit(t3, r3)
             btn_reiniciar.draw(pantalla); btn_salir_go.draw(pantalla)
-            pygame.display.flip(); clock.tick(60)
+            display_manager.present(); display_manager.tick(clock)
     else:
         fuente_resultado_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60)
         fuente_resultado_texto = pygame.freetype.SysFont("arial", 40)
@@ -492,7 +539,7 @@ def pantalla_fin_juego(score, aciertos, fallos, num_jugadores, scores_j1=None, s
             fuente_ganador = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
             render_text_gradient(fuente_ganador, f"GANADOR: {ganador}", pygame.Rect(0, 320, ANCHO, 80), pantalla, [color_ganador, BLANCO], COLOR_CONTORNO, 3)
             btn_reiniciar.draw(pantalla); btn_menu.draw(pantalla)
-            pygame.display.flip(); clock.tick(60)
+            display_manager.present(); display_manager.tick(clock)
 
 def confirmar_salida():
     if music_loaded and pygame.mixer.music.get_busy(): pygame.mixer.music.pause()
@@ -510,7 +557,7 @@ def confirmar_salida():
         pygame.draw.rect(pantalla, NEGRO, caja_rect, border_radius=15); pygame.draw.rect(pantalla, BLANCO, caja_rect, 3, border_radius=15)
         mensaje_texto, mensaje_rect = pygame.freetype.SysFont("arial", 25).render("¿Estás seguro de que quieres salir?", BLANCO); mensaje_rect.center = (caja_rect.centerx, caja_rect.y + 40); pantalla.blit(mensaje_texto, mensaje_rect)
         btn_si.draw(pantalla); btn_no.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def mostrar_conteo_regresivo(segundos, fuente_obj, color):
     superficie_oscura = pygame.Surface((ANCHO, ALTO), pygame.SRCALPHA); superficie_oscura.fill((0, 0, 0, 180))
@@ -518,7 +565,7 @@ def mostrar_conteo_regresivo(segundos, fuente_obj, color):
     for i in range(segundos, 0, -1):
         pantalla.blit(fondo_img, (0, 0)); dibujar_estrellas(0.5); pantalla.blit(superficie_oscura, (0,0))
         render_text_gradient(fuente_conteo, str(i), pygame.Rect(0,0,ANCHO,ALTO), pantalla, [COLOR_GRADIENTE_TOP, COLOR_GRADIENTE_BOTTOM], COLOR_CONTORNO, 5)
-        pygame.display.flip(); pygame.time.delay(1000)
+        display_manager.present(); pygame.time.delay(1000)
 
 def pantalla_ingresar_nombre(score):
     nombre_jugador = ""; fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50); fuente_input = pygame.freetype.SysFont("arial", 60); fuente_instr = pygame.freetype.SysFont("arial", 25)
@@ -537,7 +584,7 @@ def pantalla_ingresar_nombre(score):
         caja_rect = pygame.Rect(ANCHO//2 - 100, ALTO//2 - 40, 200, 80)
         pygame.draw.rect(pantalla, GRIS_OSCURO, caja_rect, border_radius=10); pygame.draw.rect(pantalla, BLANCO, caja_rect, 3, border_radius=10)
         nombre_surf, nombre_rect = fuente_input.render(nombre_jugador, BLANCO); nombre_rect.center = caja_rect.center; pantalla.blit(nombre_surf, nombre_rect)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_highscores():
     fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 60); fuente_score = pygame.freetype.SysFont("arial", 40)
@@ -561,7 +608,7 @@ def pantalla_highscores():
             for i, entry in enumerate(highscores):
                 texto, rect = fuente_score.render(f"{i+1}. {entry['nombre']} - {entry['score']}", BLANCO); rect.center = (ANCHO//2, 200 + i*60); pantalla.blit(texto, rect)
         btn_volver.draw(pantalla); btn_limpiar.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 def pantalla_instrucciones():
     """Pantalla que muestra información de los power-ups con imágenes y descripciones."""
@@ -605,8 +652,7 @@ def pantalla_instrucciones():
     powerup_images = {}
     for powerup in powerups_info:
         try:
-            img = pygame.image.load(os.path.join(os.path.dirname(__file__), powerup["imagen"])).convert_alpha()
-            powerup_images[powerup["nombre"]] = pygame.transform.scale(img, (80, 80))
+            powerup_images[powerup["nombre"]] = load_image(powerup["imagen"], (80, 80))
         except Exception as e:
             print(f"Error cargando {powerup['imagen']}: {e}")
             # Crear imagen de fallback con color representativo
@@ -687,8 +733,8 @@ def pantalla_instrucciones():
         # Botón volver
         btn_volver.draw(pantalla)
         
-        pygame.display.flip()
-        clock.tick(60)
+        display_manager.present()
+        display_manager.tick(clock)
         
 def pantalla_logros():
     """Pantalla que muestra los logros del jugador."""
@@ -819,8 +865,8 @@ def pantalla_logros():
         # Botón volver
         btn_volver.draw(pantalla)
         
-        pygame.display.flip()
-        clock.tick(60)
+        display_manager.present()
+        display_manager.tick(clock)
 
 def pantalla_seleccionar_partida(saved_games):
     fuente_titulo = pygame.freetype.SysFont(FUENTE_LOGO_STYLE, 50)
@@ -848,7 +894,7 @@ def pantalla_seleccionar_partida(saved_games):
         for load_btn, delete_btn, _ in btns:
             load_btn.draw(pantalla); delete_btn.draw(pantalla)
         btn_volver.draw(pantalla)
-        pygame.display.flip(); clock.tick(60)
+        display_manager.present(); display_manager.tick(clock)
 
 # ========================
 # EJECUCIÓN PRINCIPAL
@@ -876,7 +922,7 @@ if __name__ == '__main__':
                 time_limit_minutes = pantalla_configuracion_versus()
                 if time_limit_minutes != "volver_seleccion_modo": game_options = {"num_jugadores": 2, "initial_speed": 2.0, "count_wrong_key_faults": True, "time_limit_seconds": time_limit_minutes * 60, "fallos_limit": 999}
             elif modo_seleccionado == "infinito":
-                game_options = {"num_jugadores": 1, "initial_speed": 1.0, "count_wrong_key_faults": False, "time_limit_seconds": 0, "fallos_limit": 999999}
+                game_options = {"num_jugadores": 1, "initial_speed": 1.0, "count_wrong_key_faults": False, "time_limit_seconds": 0, "fallos_limit": 999999, "curva_niveles": "infinito"}
         elif accion == "highscores":
             pantalla_highscores()
             accion = "menu_principal"
@@ -891,7 +937,7 @@ if __name__ == '__main__':
             accion = "menu_principal"
         elif accion == "configuracion":
             nombre_fuente, tam, color = pantalla_configuracion(config)
-            config = {"fuente": nombre_fuente, "tam": tam, "color": color}
+            config.update({"fuente": nombre_fuente, "tam": tam, "color": color})
             guardar_config(nombre_fuente, tam, color); continue
         elif accion == "cargar_partida":
             while True:
@@ -906,11 +952,14 @@ if __name__ == '__main__':
                         "initial_speed": initial_state.get("velocidad", 1.5),
                         "count_wrong_key_faults": True,
                         "fallos_limit": initial_state.get("fallos_limit", 10),
-                        "time_limit_seconds": initial_state.get("time_limit_seconds", 0)
+                        "time_limit_seconds": initial_state.get("time_limit_seconds", 0),
+                        "curva_niveles": initial_state.get("curva_niveles", "arcane")
                     }
                 break
 
         if game_options:
+            # Grabar las partidas en replays/ es opcional: "grabar_partidas": true en config.json
+            game_options["grabar_partida"] = bool(config.get("grabar_partidas", False))
             current_config = {"fuente": config["fuente"], "tam": config["tam"], "color": config["color"]}
             game_session = GameSession(sys.modules[__name__], current_config, game_options, initial_state, save_timestamp)
             resultado_juego = game_session.run()
@@ -1,12 +1,18 @@
 import pygame
 import random
 
+from display_manager import DisplayManager
+
 # Inicializa Pygame
 pygame.init()
 
 # Configura la pantalla
 pantalla = pygame.display.set_mode((800, 600))
 
+# Ritmo de fotogramas según la frecuencia configurada (config.json)
+display_manager = DisplayManager.load()
+reloj = pygame.time.Clock()
+
 # Configura la fuente para las letras
 fuente = pygame.font.SysFont("Arial", 30)
 
@@ -53,4 +59,4 @@ while True:
 
     # Actualiza la pantalla
     pygame.display.flip()
-    pygame.time.Clock().tick(60)
\ No newline at end of file
+    display_manager.tick(reloj)
\ No newline at end of file
@@ -0,0 +1,91 @@
+# asset_cache.py
+"""
+Caché en disco de recursos derivados: fondos escalados a la resolución de la
+pantalla y ya convertidos a su formato de píxel. Cada entrada es un volcado
+crudo de los píxeles (.raw), identificado por el resumen del archivo de
+origen, la resolución y el formato:
+
+    .cache/scaled/<nombre>-<resumen>-<ancho>x<alto>-<formato>.raw
+
+En los arranques siguientes se lee el volcado directamente en una superficie
+del formato de la pantalla, sin decodificar ni escalar. Si cambia el archivo
+de origen cambia su resumen: la entrada antigua deja de usarse y se borra.
+"""
+
+import os
+from typing import Tuple
+
+import pygame
+
+from asset_pack import ASSET_DIR, load_surface, source_digest
+
+CACHE_DIR = os.path.join(ASSET_DIR, ".cache", "scaled")
+
+
+def _target_surface(size: Tuple[int, int], alpha: bool) -> pygame.Surface:
+    """Superficie vacía en el formato que producirían convert()/convert_alpha()."""
+    display = pygame.display.get_surface()
+    if alpha:
+        return pygame.Surface(size, pygame.SRCALPHA, 32)
+    return pygame.Surface(size, 0, display) if display is not None else pygame.Surface(size)
+
+
+def _format_tag(surface: pygame.Surface) -> str:
+    masks = "".join(f"{mask:x}" for mask in surface.get_masks())
+    return f"{surface.get_bitsize()}b{masks}"
+
+
+def _prune(stem: str, suffix: str, keep: str):
+    """Borra las versiones anteriores (otro resumen de origen) de la misma entrada."""
+    try:
+        for filename in os.listdir(CACHE_DIR):
+            if filename.startswith(f"{stem}-") and filename.endswith(f"-{suffix}") and filename != keep:
+                os.remove(os.path.join(CACHE_DIR, filename))
+    except OSError:
+        pass
+
+
+def _convert(surface: pygame.Surface, alpha: bool) -> pygame.Surface:
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def scaled_image(name: str, size: Tuple[int, int], alpha: bool = False) -> pygame.Surface:
+    """
+    Recurso 'name' escalado a 'size' (pygame.transform.scale) en el formato de la
+    pantalla, desde la caché si ya existe. Lanza las mismas excepciones que load_surface.
+    """
+    size = (int(size[0]), int(size[1]))
+    surface = _target_surface(size, alpha)
+    stem = os.path.splitext(name)[0]
+    tag = _format_tag(surface)
+    suffix = f"{size[0]}x{size[1]}-{tag}.raw"
+    filename = f"{stem}-{source_digest(name)}-{suffix}"
+    path = os.path.join(CACHE_DIR, filename)
+
+    pixels = memoryview(surface.get_view("1"))
+    try:
+        if os.path.getsize(path) == pixels.nbytes:
+            # Lectura directa sobre los píxeles de la superficie, sin copias intermedias
+            with open(path, "rb", buffering=0) as f:
+                if f.readinto(pixels) == pixels.nbytes:
+                    return surface
+    except OSError:
+        pass  # Sin entrada en caché (o ilegible): se genera
+    finally:
+        pixels.release()  # Libera el bloqueo de la superficie
+
+    surface = _convert(pygame.transform.scale(load_surface(name, alpha=alpha), size), alpha)
+    if _format_tag(surface) != tag:
+        return surface  # Formato inesperado: no se guarda un volcado que no se podría leer
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(surface.get_view("1"))
+        os.replace(temp_path, path)
+        _prune(stem, suffix, filename)
+    except OSError as e:
+        print(f"No se pudo guardar {filename} en la caché: {e}")
+    return surface
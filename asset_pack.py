@@ -0,0 +1,294 @@
+# asset_pack.py
+"""
+Paquete de recursos en un solo archivo (assets.pak), leído con mmap.
+
+Formato:
+    MAGIC (8 bytes) | longitud de la cabecera (uint32 little-endian) | cabecera JSON | datos
+
+La cabecera indexa cada recurso por nombre con su desplazamiento, longitud
+dentro del archivo y el resumen (blake2b) del archivo original. Tipos de recurso:
+
+- "image": píxeles ya decodificados en formato BGRA (el formato nativo de
+  convert_alpha); se cargan con pygame.image.frombuffer sobre el mmap, sin copias.
+  El archivo se mapea con copia en escritura (ACCESS_COPY): las superficies se
+  pueden modificar como cualquier otra (las páginas tocadas se copian en memoria
+  del proceso) y el archivo en disco nunca cambia.
+- "sound": muestras PCM ya decodificadas al formato del mezclador con el que se
+  empaquetaron; se cargan con pygame.mixer.Sound(buffer=...).
+- "file": bytes del archivo original (música, JSON, fuentes...).
+
+Si no existe el paquete, o con la variable de entorno ATH_ASSETS=loose, se
+cargan los archivos sueltos del directorio del juego (modo de desarrollo).
+
+El paquete se construye con:
+    python asset_pack.py [--output assets.pak] [--list]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+PACK_FILE = "assets.pak"
+PACK_MAGIC = b"ATHPAK01"
+PACK_ALIGN = 64  # Alineación de cada recurso dentro del archivo
+ASSET_MODE_ENV = "ATH_ASSETS"  # "loose" fuerza los archivos sueltos
+
+# Formato del mezclador del juego (JuegoATH.initialize_pygame); los sonidos se
+# empaquetan ya convertidos a él
+MIXER_SETTINGS = {"frequency": 22050, "size": -16, "channels": 2}
+
+KIND_IMAGE = "image"
+KIND_SOUND = "sound"
+KIND_FILE = "file"
+
+# Recursos que carga el juego, con el tipo con el que se empaquetan
+PACK_ASSETS: List[Tuple[str, str]] = [
+    ("Fondo2.png", KIND_IMAGE),
+    ("Logotipo.png", KIND_IMAGE),
+    ("atlas.png", KIND_IMAGE),
+    ("atlas.json", KIND_FILE),
+    ("levels.json", KIND_FILE),
+    ("acierto.wav", KIND_SOUND),
+    ("fallo.wav", KIND_SOUND),
+    ("game_over.wav", KIND_SOUND),
+    ("powerup.mp3", KIND_SOUND),
+    ("letraescudo.mp3", KIND_SOUND),
+    ("doblep.mp3", KIND_SOUND),
+    ("musica_fondo.mp3", KIND_FILE),
+]
+
+
+class AssetPack:
+    """Paquete abierto: índice de la cabecera y vista del archivo mapeado con copia en escritura."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            # Copia en escritura: con ACCESS_READ escribir en una superficie del paquete (fill, blit
+            # sobre un icono...) no lanza una excepción sino que termina el proceso (SIGSEGV)
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._view = memoryview(self._mmap)
+        if bytes(self._view[:len(PACK_MAGIC)]) != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"{path} no es un paquete de recursos válido")
+        start = len(PACK_MAGIC)
+        (header_length,) = struct.unpack_from("<I", self._view, start)
+        header = json.loads(bytes(self._view[start + 4:start + 4 + header_length]).decode("utf-8"))
+        self.assets: Dict[str, Dict] = header["assets"]
+        self.mixer = tuple(header["mixer"]) if header.get("mixer") else None
+
+    def has(self, name: str) -> bool:
+        return name in self.assets
+
+    def digest(self, name: str) -> Optional[str]:
+        return self.assets[name].get("digest")
+
+    def data(self, name: str) -> memoryview:
+        """Vista (sin copia) de los bytes del recurso."""
+        entry = self.assets[name]
+        return self._view[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def surface(self, name: str) -> pygame.Surface:
+        """Superficie que comparte memoria con el paquete (imágenes "image") o decodificada ("file").
+        Se puede modificar: los cambios quedan en la copia del proceso, no en el archivo."""
+        entry = self.assets[name]
+        if entry["kind"] == KIND_IMAGE:
+            return pygame.image.frombuffer(self.data(name), tuple(entry["size"]), entry["format"])
+        return pygame.image.load(io.BytesIO(self.data(name)), name)
+
+    def sound(self, name: str) -> Optional[pygame.mixer.Sound]:
+        """Sonido del paquete; None si las muestras no coinciden con el formato del mezclador actual."""
+        entry = self.assets[name]
+        if entry["kind"] == KIND_SOUND:
+            if self.mixer != pygame.mixer.get_init():
+                return None
+            return pygame.mixer.Sound(buffer=self.data(name))
+        return pygame.mixer.Sound(file=io.BytesIO(self.data(name)))
+
+    def close(self):
+        """Cierra el archivo. Si aún hay superficies o sonidos sobre el mapa, el mapa se conserva
+        hasta que se liberen (cerrarlo dejaría esas superficies apuntando a memoria no válida)."""
+        self._file.close()
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            pass  # Vistas exportadas: el mapa se libera con el último objeto que lo usa
+
+
+_pack = None
+_pack_loaded = False
+_music_file = None  # pygame.mixer.music lee del objeto mientras suena
+
+
+def get_pack() -> Optional[AssetPack]:
+    """Paquete del juego, abierto la primera vez que se pide (None en modo de archivos sueltos)."""
+    global _pack, _pack_loaded
+    if not _pack_loaded:
+        _pack_loaded = True
+        path = os.path.join(ASSET_DIR, PACK_FILE)
+        if os.environ.get(ASSET_MODE_ENV) != "loose" and os.path.exists(path):
+            try:
+                _pack = AssetPack(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error abriendo {PACK_FILE}, se usarán los archivos sueltos: {e}")
+    return _pack
+
+
+def asset_path(name: str) -> str:
+    return os.path.join(ASSET_DIR, name)
+
+
+def load_surface(name: str, alpha: bool = True) -> pygame.Surface:
+    """
+    Imagen 'name'. Del paquete se obtiene en formato nativo y sin copia (comparte memoria
+    con el paquete, con copia en escritura: se puede modificar); el archivo suelto se
+    convierte (convert_alpha, o convert con alpha=False) si hay pantalla.
+    """
+    pack = get_pack()
+    if pack is not None and pack.has(name):
+        return pack.surface(name)
+    image = pygame.image.load(asset_path(name))
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha() if alpha else image.convert()
+    return image
+
+
+def load_sound(name: str) -> pygame.mixer.Sound:
+    pack = get_pack()
+    if pack is not None and pack.has(name):
+        sound = pack.sound(name)
+        if sound is not None:
+            return sound
+    return pygame.mixer.Sound(asset_path(name))
+
+
+def load_music(name: str):
+    """Carga la música de fondo en pygame.mixer.music."""
+    global _music_file
+    pack = get_pack()
+    if pack is not None and pack.has(name):
+        _music_file = io.BytesIO(pack.data(name))
+        pygame.mixer.music.load(_music_file, os.path.splitext(name)[1].lstrip("."))
+    else:
+        pygame.mixer.music.load(asset_path(name))
+
+
+def file_digest(path: str) -> str:
+    """Resumen del contenido de un archivo (identifica la versión de un recurso)."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def source_digest(name: str) -> str:
+    """Resumen del archivo original de 'name' (guardado en el paquete o calculado del archivo suelto)."""
+    pack = get_pack()
+    if pack is not None and pack.has(name) and pack.digest(name):
+        return pack.digest(name)
+    return file_digest(asset_path(name))
+
+
+def read_bytes(name: str) -> bytes:
+    pack = get_pack()
+    if pack is not None and pack.has(name):
+        return bytes(pack.data(name))
+    with open(asset_path(name), "rb") as f:
+        return f.read()
+
+
+# ========================
+# EMPAQUETADO
+# ========================
+def _encode_image(path: str) -> Tuple[bytes, Dict]:
+    source = pygame.image.load(path)
+    rgba = pygame.Surface(source.get_size(), pygame.SRCALPHA, 32)
+    rgba.blit(source, (0, 0))
+    return pygame.image.tobytes(rgba, "BGRA"), {"size": list(rgba.get_size()), "format": "BGRA"}
+
+
+def _encode_sound(path: str) -> bytes:
+    return pygame.mixer.Sound(path).get_raw()
+
+
+def build_pack(directory: str = ASSET_DIR, output: str = PACK_FILE, assets: List[Tuple[str, str]] = PACK_ASSETS) -> Dict[str, Dict]:
+    """Lee los recursos de 'directory' y escribe el paquete en 'output'. Retorna el índice."""
+    mixer_format = None
+    try:
+        pygame.mixer.init(**MIXER_SETTINGS)
+        mixer_format = pygame.mixer.get_init()
+    except pygame.error as e:
+        print(f"Mezclador no disponible ({e}); los sonidos se guardarán sin decodificar.")
+
+    entries, payloads = {}, []
+    for name, kind in assets:
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            print(f"[AVISO] No se encontró {name}, no se empaqueta")
+            continue
+        extra = {}
+        if kind == KIND_IMAGE:
+            payload, extra = _encode_image(path)
+        elif kind == KIND_SOUND and mixer_format is not None:
+            payload = _encode_sound(path)
+        else:
+            kind = KIND_FILE
+            with open(path, "rb") as f:
+                payload = f.read()
+        entries[name] = {"kind": kind, "length": len(payload), "digest": file_digest(path), **extra}
+        payloads.append((name, payload))
+
+    # Los desplazamientos dependen de la longitud de la cabecera, que los contiene:
+    # se reservan con un valor fijo de ancho suficiente y se recalcula hasta que cuadran
+    header_length = 0
+    while True:
+        offset = len(PACK_MAGIC) + 4 + header_length
+        for name, payload in payloads:
+            offset = -(-offset // PACK_ALIGN) * PACK_ALIGN
+            entries[name]["offset"] = offset
+            offset += len(payload)
+        header = json.dumps({"version": 1, "mixer": mixer_format, "assets": entries}, sort_keys=True).encode("utf-8")
+        if len(header) <= header_length:
+            header = header.ljust(header_length)  # Relleno con espacios (JSON válido)
+            break
+        header_length = len(header) + 64
+
+    with open(output, "wb") as f:
+        f.write(PACK_MAGIC)
+        f.write(struct.pack("<I", header_length))
+        f.write(header)
+        for name, payload in payloads:
+            f.write(b"\0" * (entries[name]["offset"] - f.tell()))
+            f.write(payload)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye el paquete de recursos del juego")
+    parser.add_argument("--output", default=os.path.join(ASSET_DIR, PACK_FILE), help="Archivo de salida")
+    parser.add_argument("--list", action="store_true", help="Mostrar el contenido del paquete existente")
+    args = parser.parse_args()
+    if args.list:
+        pack = AssetPack(args.output)
+        for name, entry in sorted(pack.assets.items(), key=lambda item: item[1]["offset"]):
+            print(f"{name:20} {entry['kind']:6} {entry['length']:>10} bytes @ {entry['offset']}")
+        pack.close()
+        return
+    entries = build_pack(ASSET_DIR, args.output)
+    total = sum(entry["length"] for entry in entries.values())
+    print(f"[OK] {args.output}: {len(entries)} recursos, {total / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+# benchmarks/bench_gameplay.py
+"""
+Casos de benchmark de las rutas calientes del juego.
+Requiere que SDL_VIDEODRIVER/SDL_AUDIODRIVER estén configurados antes de importar
+este módulo (run_benchmarks.py lo hace) y que el directorio de trabajo sea
+desechable: guardar_partida y los logros escriben archivos en él.
+"""
+
+import random
+
+import pygame
+import pygame.freetype
+
+import JuegoATH as main
+from game_session import GameSession, TOW_REACH
+from enhanced_powerups import letters_in_radius
+from keyboard_layout_manager import KeyboardLayoutManager
+from achievements_manager import AchievementsManager
+from powerups import PowerUp
+from game_clock import GameClock
+from force_field import Attractor, apply_attraction
+from level_curve import LevelCurve
+import render_utils
+import render_backend
+from render_utils import render_text_gradient
+from harness import Benchmark
+
+# La cuenta regresiva bloquea 3 s con pygame.time.delay; no forma parte de lo que se mide.
+main.mostrar_conteo_regresivo = lambda *args, **kwargs: None
+
+CONFIG = {"fuente": "arial", "tam": 60, "color": (255, 255, 255)}
+OPCIONES_1P = {"num_jugadores": 1, "initial_speed": 1.5, "count_wrong_key_faults": True,
+               "time_limit_seconds": 0, "fallos_limit": 999999}
+LETRAS = [chr(ord('A') + i) for i in range(26)]
+
+
+def _new_session(num_letters: int) -> GameSession:
+    """Sesión 1P con 'num_letters' letras en pantalla, situadas lejos de los bordes."""
+    random.seed(1234)
+    session = GameSession(main, dict(CONFIG), dict(OPCIONES_1P))
+    session.letras_en_pantalla = []
+    session._spawn_new_letters(count=num_letters)
+    for letra in session.letras_en_pantalla:
+        letra['icon_y'] = random.randint(100, main.ALTO // 2)
+    session._rebuild_letter_grid()
+    return session
+
+
+def _bench_update_state(num_letters: int) -> Benchmark:
+    return Benchmark(f"GameSession._update_state[{num_letters} letras]",
+                     lambda s: s._update_state(1 / 60.0),
+                     setup=lambda: _new_session(num_letters), loops=60, repeat=5)
+
+
+def _setup_effects(num_letters: int):
+    """Sesión con dos imanes y un multiplicador apilados (ninguno vence durante la medición)."""
+    session = _new_session(num_letters)
+    for tipo in ("iman", "iman", "multiplicador"):
+        session.effects.activar(tipo).duracion = 3600
+    session.effects.restore(session.effects.snapshot())  # Re-planifica con la duración ampliada
+    return session
+
+
+def _bench_effects(num_letters: int) -> Benchmark:
+    return Benchmark(f"GameSession._update_state[{num_letters} letras, efectos]",
+                     lambda s: s._update_state(1 / 60.0),
+                     setup=lambda: _setup_effects(num_letters), loops=60, repeat=5)
+
+
+def _setup_field(num_letters: int):
+    """Iconos repartidos por la pantalla y cuatro atractores, uno con cada curva de caída."""
+    session = _new_session(num_letters)
+    cx, cy = main.ANCHO / 2, main.ALTO / 2
+    attractors = [Attractor(cx, cy, 2.5, 50), Attractor(cx / 2, cy, 3.0, 20, 400, "lineal"),
+                  Attractor(cx * 1.5, cy / 2, 4.0, 30, None, "inversa"),
+                  Attractor(cx, cy * 1.5, 4.0, 30, 900, "cuadratica")]
+    return session.letras_en_pantalla, attractors
+
+
+def _bench_field(num_letters: int) -> Benchmark:
+    return Benchmark(f"apply_attraction[{num_letters} letras, 4 atractores]",
+                     lambda state: apply_attraction(state[0], state[1], 1.0, 4.0),
+                     setup=lambda: _setup_field(num_letters), loops=60, repeat=5)
+
+
+def _blast_query(session):
+    """Letras alcanzadas por una explosión de 300 px en el centro: consulta en la rejilla y filtro exacto."""
+    session._sync_letter_grid()
+    cx, cy = main.ANCHO / 2, main.ALTO / 2
+    return letters_in_radius(session.letter_grid.query(cx, cy, 300 + TOW_REACH), (cx, cy), 300)
+
+
+def _setup_wave():
+    """Oleada de 50 letras pendiente: cada fotograma medido crea como mucho max_per_frame."""
+    session = _new_session(10)
+    session.spawner.max_letters = 100
+    session.spawner.wave(50, 0.0)
+    return session
+
+
+def _setup_level_curve():
+    """Curva infinita con 60 niveles ya generados; se consultan totales al azar dentro de ellos."""
+    curve = LevelCurve.load("infinito")
+    curve.get(60)
+    random.seed(1234)
+    return curve, [random.randrange(curve.thresholds[-1]) for _ in range(1000)]
+
+
+def _level_lookups(state):
+    curve, totals = state
+    for total in totals:
+        curve.level_for(total)
+
+
+def _setup_keypress():
+    session = _new_session(100)
+    main.particulas.clear()
+    return session
+
+
+def _keypress(session):
+    session._handle_keypress_j1(random.choice(LETRAS))
+
+
+def _setup_hud():
+    """Sesión con combo alto y tres power-ups activos: el peor caso habitual del HUD."""
+    session = _new_session(10)
+    session.player_managers["J1"].racha_actual = 16
+    for tipo in ("ralentizar", "escudo", "doble_puntuacion"):
+        session.powerup_manager.activar(tipo, now=session.frame_now)
+    return session
+
+
+_sdl2_backend = None
+
+
+def _setup_draw_backend(name: str):
+    """Sesión de 100 letras dibujando con el motor indicado (ver render_backend.py)."""
+    global _sdl2_backend
+    session = _setup_keypress()
+    if name == render_backend.BACKEND_SDL2:
+        if _sdl2_backend is None:
+            _sdl2_backend = render_backend.SDL2Backend(main.pantalla, "benchmark", main.pantalla.get_size())
+        session.backend = _sdl2_backend
+    else:
+        session.backend = render_backend.SoftwareBackend(main.pantalla)
+    return session
+
+
+def _draw_backend_benchmarks():
+    cases = []
+    for name in render_backend.BACKEND_OPTIONS:
+        try:
+            _setup_draw_backend(name)
+        except render_backend.BACKEND_ERRORS as e:
+            print(f"Motor {name} no disponible para benchmarks: {e}")
+            continue
+        cases.append(Benchmark(f"GameSession._draw_elements[100 letras motor={name}]", lambda s: s._draw_elements(),
+                               setup=lambda name=name: _setup_draw_backend(name), loops=30, repeat=5))
+    return cases
+
+
+def _setup_particles():
+    main.particulas.clear()
+    for _ in range(50):
+        main.crear_particulas(main.ANCHO // 2, main.ALTO // 2, (255, 255, 0))
+    return None
+
+
+def _setup_gradient(size: int):
+    return pygame.freetype.SysFont(main.FUENTE_LOGO_STYLE, size)
+
+
+def _gradient(size: int, text: str, border: int) -> Benchmark:
+    def run(font):
+        render_text_gradient(font, text, pygame.Rect(0, 0, main.ANCHO, size * 2), main.pantalla,
+                             [main.COLOR_GRADIENTE_TOP, main.COLOR_GRADIENTE_BOTTOM], main.COLOR_CONTORNO, border)
+    return Benchmark(f"render_text_gradient[{size}px borde={border}]", run,
+                     setup=lambda: _setup_gradient(size), loops=20, repeat=5)
+
+
+def _gradient_fill(size: int, fill, label: str) -> Benchmark:
+    """Relleno del degradado de un glifo, sin caché ni borde (NumPy frente al relleno por líneas)."""
+    colors = [main.COLOR_GRADIENTE_TOP, (255, 128, 0), main.COLOR_GRADIENTE_BOTTOM]
+    return Benchmark(f"gradient_fill[{label} {size}px]", lambda font: fill(font, "NIVEL 4", colors),
+                     setup=lambda: _setup_gradient(size), loops=20, repeat=5)
+
+
+def _gradient_miss(size: int) -> Benchmark:
+    """render_text_gradient con la caché vacía: coste completo de componer el texto."""
+    def run(font):
+        render_utils._text_cache.clear()
+        render_text_gradient(font, "NIVEL 4", pygame.Rect(0, 0, main.ANCHO, size * 2), main.pantalla,
+                             [main.COLOR_GRADIENTE_TOP, main.COLOR_GRADIENTE_BOTTOM], main.COLOR_CONTORNO, 3)
+    return Benchmark(f"render_text_gradient[sin caché {size}px]", run,
+                     setup=lambda: _setup_gradient(size), loops=20, repeat=5)
+
+
+def _gradient_fill_benchmarks():
+    cases = []
+    for size in (30, 60, 100, 200):
+        cases.append(_gradient_fill(size, render_utils.gradient_glyph_python, "python"))
+        if render_utils.numpy is not None:
+            cases.append(_gradient_fill(size, render_utils.gradient_glyph_numpy, "numpy"))
+        cases.append(_gradient_miss(size))
+    return cases
+
+
+def _setup_outline():
+    font = pygame.freetype.SysFont(main.FUENTE_LOGO_STYLE, 80)
+    return render_utils.gradient_glyph(font, "NIVEL 4", [main.COLOR_GRADIENTE_TOP, main.COLOR_GRADIENTE_BOTTOM])
+
+
+def _outline_benchmarks():
+    """Contorno por dilatación del glifo: el coste debe crecer poco con el grosor."""
+    engines = [("mask", render_utils.outline_mask)]
+    if render_utils.numpy is not None:
+        engines.append(("numpy", render_utils.outline_numpy))
+    cases = []
+    for label, outline in engines:
+        for thickness in (2, 8, 16):
+            cases.append(Benchmark(f"outline[{label} borde={thickness}]",
+                                   lambda glyph, o=outline, t=thickness: o(glyph, t, main.COLOR_CONTORNO),
+                                   setup=_setup_outline, loops=20, repeat=5))
+        cases.append(Benchmark(f"outline[{label} borde=3 halo=8]",
+                               lambda glyph, o=outline: o(glyph, 3, main.COLOR_CONTORNO, 8, (255, 255, 0)),
+                               setup=_setup_outline, loops=20, repeat=5))
+    return cases
+
+
+def _setup_powerups(count: int):
+    """Gestor con 'count' efectos apilados de larga duración (ninguno vence durante la medición)."""
+    clock = GameClock()
+    manager = PowerUp(clock=clock)
+    for i in range(count):
+        manager.activar(f"efecto_{i}", 3600 + i)
+    return clock, manager
+
+
+def _powerup_tick(state):
+    clock, manager = state
+    clock.tick(1 / 60.0)
+    manager.actualizar()
+
+
+def _bench_powerups(count: int) -> Benchmark:
+    return Benchmark(f"PowerUp.actualizar[{count} activos]", _powerup_tick,
+                     setup=lambda: _setup_powerups(count), loops=2000, repeat=5)
+
+
+def _save_state():
+    session = _new_session(30)
+    return session._create_save_state()
+
+
+def _setup_achievements():
+    manager = AchievementsManager()
+    for achievement in manager.achievements.values():
+        achievement.unlocked = False
+    return manager
+
+
+STATS = {'wpm': 35.0, 'accuracy': 92.0, 'total_keystrokes': 400, 'correct_keystrokes': 368,
+         'incorrect_keystrokes': 32, 'current_streak': 12, 'max_streak': 30,
+         'average_reaction_time': 0.8, 'session_duration': 420.0, 'key_stats': {}}
+
+
+def get_benchmarks():
+    keyboard = KeyboardLayoutManager()
+    return [
+        _gradient(30, "PAUSA", 2),
+        _gradient(100, "3", 5),
+        _gradient(80, "NIVEL 4", 3),
+        *_gradient_fill_benchmarks(),
+        *_outline_benchmarks(),
+        _bench_update_state(10),
+        _bench_update_state(100),
+        _bench_update_state(1000),
+        _bench_effects(1000),
+        Benchmark("GameSession._update_state[oleada de 50]", lambda s: s._update_state(1 / 60.0),
+                  setup=_setup_wave, loops=25, repeat=5),
+        _bench_field(500),
+        _bench_field(1000),
+        Benchmark("SpatialHash consulta de explosión[1000 letras]", _blast_query,
+                  setup=lambda: _new_session(1000), loops=200, repeat=5),
+        Benchmark("LevelCurve.level_for[60 niveles, 1000 consultas]", _level_lookups,
+                  setup=_setup_level_curve, loops=20, repeat=5),
+        _bench_powerups(3),
+        _bench_powerups(1000),
+        Benchmark("GameSession._handle_keypress_j1", _keypress, setup=_setup_keypress, loops=50, repeat=5),
+        Benchmark("GameSession._draw_hud", lambda s: s._draw_hud(), setup=_setup_hud, loops=200, repeat=5),
+        Benchmark("GameSession._draw_shield_effect[100 letras]", lambda s: s._draw_shield_effect(),
+                  setup=lambda: _new_session(100), loops=200, repeat=5),
+        *_draw_backend_benchmarks(),
+        Benchmark("actualizar_y_dibujar_particulas[500]", lambda _: main.actualizar_y_dibujar_particulas(),
+                  setup=_setup_particles, loops=30, repeat=5),
+        Benchmark("dibujar_estrellas", lambda _: main.dibujar_estrellas(1), loops=200, repeat=5),
+        Benchmark("guardar_partida", lambda state: main.guardar_partida(state, "arcane"),
+                  setup=_save_state, loops=20, repeat=5),
+        Benchmark("cargar_partida", lambda _: main.cargar_partida(), loops=50, repeat=5),
+        Benchmark("KeyboardLayoutManager.obtener_nueva_letra[1P]",
+                  lambda _: keyboard.obtener_nueva_letra(player_id="J1", num_jugadores=1), loops=10000, repeat=5),
+        Benchmark("KeyboardLayoutManager.obtener_nueva_letra[2P]",
+                  lambda _: keyboard.obtener_nueva_letra(player_id="J2", num_jugadores=2), loops=10000, repeat=5),
+        Benchmark("AchievementsManager.check_achievements",
+                  lambda manager: manager.check_achievements(dict(STATS)), setup=_setup_achievements,
+                  loops=1, repeat=20),
+    ]
@@ -0,0 +1,108 @@
+# benchmarks/harness.py
+"""
+Infraestructura mínima de benchmarks (solo biblioteca estándar).
+Cada caso se mide en varias repeticiones de N iteraciones; se guarda el tiempo
+por iteración (mínimo, media y desviación) en JSON y se compara con una línea
+base con un umbral de regresión.
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_THRESHOLD = 0.10  # 10% más lento que la línea base = regresión
+
+
+class Benchmark:
+    """Un caso de benchmark: 'func' se ejecuta 'loops' veces por repetición.
+    'setup' (opcional) se llama antes de cada repetición y su resultado se pasa a 'func'."""
+
+    def __init__(self, name: str, func: Callable, setup: Optional[Callable] = None,
+                 loops: int = 100, repeat: int = 7):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.loops = loops
+        self.repeat = repeat
+
+    def run(self) -> Dict:
+        timings = []
+        for _ in range(self.repeat):
+            ctx = self.setup() if self.setup else None
+            func = self.func
+            loops = range(self.loops)
+            start = time.perf_counter()
+            for _ in loops:
+                func(ctx)
+            timings.append((time.perf_counter() - start) / self.loops)
+        return {
+            "min_s": min(timings),
+            "mean_s": statistics.fmean(timings),
+            "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "loops": self.loops,
+            "repeat": self.repeat,
+        }
+
+
+def run_all(benchmarks: List[Benchmark], only: Optional[str] = None) -> Dict:
+    """Ejecuta los benchmarks (filtrados por subcadena 'only') y retorna el documento de resultados."""
+    results = {}
+    for bench in benchmarks:
+        if only and only not in bench.name:
+            continue
+        results[bench.name] = bench.run()
+        print(f"{bench.name:<48} {format_time(results[bench.name]['min_s'])}")
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.3f} ms"
+    return f"{seconds * 1e6:9.2f} us"
+
+
+def save_results(document: Dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def load_results(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Compara el mínimo por iteración de cada caso contra la línea base.
+    Imprime la tabla de cambios y retorna los nombres de los casos que empeoraron más que 'threshold'.
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base:
+            print(f"{name:<48} (sin línea base)")
+            continue
+        ratio = result["min_s"] / base["min_s"] if base["min_s"] > 0 else 1.0
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag = "  <-- REGRESIÓN"
+            regressions.append(name)
+        print(f"{name:<48} {format_time(base['min_s'])} -> {format_time(result['min_s'])}  x{ratio:5.2f}{flag}")
+    return regressions
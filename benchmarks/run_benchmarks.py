@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# benchmarks/run_benchmarks.py
+"""
+Ejecuta los benchmarks del juego sin ventana ni audio (drivers 'dummy' de SDL).
+
+Uso:
+    python benchmarks/run_benchmarks.py                  # medir y comparar con baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline  # medir y fijar la línea base
+    python benchmarks/run_benchmarks.py --only gradient --threshold 0.2
+    python benchmarks/run_benchmarks.py --require-baseline   # CI: falla si no hay línea base
+
+Los resultados se guardan en benchmarks/results/latest.json. El proceso termina
+con código 1 si algún caso es más lento que la línea base por encima del umbral.
+
+El repositorio no incluye baseline.json: los tiempos solo son comparables en la
+misma máquina. Genera la línea base con --save-baseline en el equipo (o runner
+de CI) donde se vaya a comparar, a partir de la rama principal. Sin línea base
+solo se miden los casos y el código de salida es 0, así que la CI debe aportarla
+(--baseline RUTA) y ejecutar con --require-baseline, que termina con código 2
+si falta, para que el umbral de regresión no se omita en silencio.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+
+# Debe configurarse antes de importar pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de rutas calientes de SpeedType")
+    parser.add_argument("--only", help="Ejecutar solo los casos cuyo nombre contenga esta cadena")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Archivo JSON de línea base")
+    parser.add_argument("--threshold", type=float, help="Empeoramiento relativo tolerado (0.10 = 10%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como nueva línea base")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="Terminar con error si no existe la línea base (para CI)")
+    args = parser.parse_args()
+
+    # Los casos escriben partidas/logros en el directorio actual: usar uno temporal
+    work_dir = tempfile.mkdtemp(prefix="speedtype_bench_")
+    os.chdir(work_dir)
+
+    import harness
+    import bench_gameplay
+
+    benchmarks = bench_gameplay.get_benchmarks()
+    document = harness.run_all(benchmarks, args.only)
+    harness.save_results(document, args.output)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.save_baseline:
+        harness.save_results(document, args.baseline)
+        print(f"Línea base actualizada: {args.baseline}")
+        return 0
+
+    baseline = harness.load_results(args.baseline)
+    if baseline is None:
+        print("No hay línea base; ejecuta con --save-baseline para crearla.")
+        return 2 if args.require_baseline else 0
+    print("\nComparación con la línea base:")
+    threshold = args.threshold if args.threshold is not None else harness.DEFAULT_THRESHOLD
+    regressions = harness.compare(document, baseline, threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regresión(es) por encima del {threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
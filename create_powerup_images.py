@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 """
 Script para crear las imágenes de los nuevos power-ups.
-Genera imágenes PNG de alta calidad para cada power-up.
+Genera imágenes PNG de alta calidad para cada power-up y empaqueta todos los
+iconos del juego en un atlas (atlas.png + atlas.json, ver texture_atlas.py).
+
+Uso:
+    python create_powerup_images.py           # crear imágenes y reconstruir el atlas
+    python create_powerup_images.py --atlas   # solo reconstruir el atlas
 """
 
+import argparse
+import json
 import pygame
 import math
 import os
 
+from texture_atlas import ATLAS_IMAGE, ATLAS_INDEX, sprite_key
+
 # Inicializar pygame para crear imágenes
 pygame.init()
 
@@ -272,12 +281,79 @@ def create_time_bomb_image():
     
     return surface
 
+# Iconos empaquetados en el atlas, a los tamaños con los que los usa el juego
+# (JuegoATH.icon_size = 60, spawner_icon_size = 80, pantalla de power-ups = 80,
+#  fuente de las rotaciones de la nave = SPAWNER_SOURCE_SIZE).
+ATLAS_ENTRIES = [
+    ("nave.png", (80, 80)),
+    ("nave.png", (256, 256)),
+    ("caracol.png", (60, 60)),
+    ("escudo.png", (60, 60)),
+    ("dos.png", (60, 60)),
+    ("caracol.png", (80, 80)),
+    ("escudo.png", (80, 80)),
+    ("dos.png", (80, 80)),
+    ("hielo.png", (60, 60)),
+    ("iman.png", (60, 60)),
+    ("x3.png", (60, 60)),
+    ("vidaExtra.png", (60, 60)),
+    ("bomba_tiempo.png", (60, 60)),
+]
+ATLAS_PADDING = 1  # Píxeles transparentes entre iconos
+ATLAS_MAX_WIDTH = 1024
+
+
+def pack_atlas(sizes, max_width=ATLAS_MAX_WIDTH, padding=ATLAS_PADDING):
+    """
+    Empaquetado por estantes: coloca los rectángulos de mayor a menor altura,
+    fila a fila. Retorna ({clave: (x, y)}, (ancho, alto)) del atlas.
+    """
+    positions = {}
+    x = y = shelf_height = width = 0
+    for key, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])):
+        if x > 0 and x + w > max_width:
+            y += shelf_height + padding; x = 0; shelf_height = 0
+        positions[key] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        width = max(width, x - padding)
+    return positions, (width, y + shelf_height)
+
+
+def build_atlas(directory, entries=ATLAS_ENTRIES):
+    """Escala cada icono una vez (smoothscale) y guarda atlas.png + atlas.json en 'directory'."""
+    images = {}
+    for filename, size in entries:
+        source = pygame.image.load(os.path.join(directory, filename))
+        rgba = pygame.Surface(source.get_size(), pygame.SRCALPHA, 32)
+        rgba.blit(source, (0, 0))  # smoothscale necesita 32 bits (algunos PNG son de paleta)
+        images[sprite_key(filename, size)] = pygame.transform.smoothscale(rgba, size)
+
+    positions, atlas_size = pack_atlas({key: image.get_size() for key, image in images.items()})
+    atlas = pygame.Surface(atlas_size, pygame.SRCALPHA, 32)
+    sprites = {}
+    for key, (x, y) in positions.items():
+        image = images[key]
+        atlas.blit(image, (x, y))
+        sprites[key] = {"x": x, "y": y, "w": image.get_width(), "h": image.get_height()}
+
+    pygame.image.save(atlas, os.path.join(directory, ATLAS_IMAGE))
+    with open(os.path.join(directory, ATLAS_INDEX), "w") as f:
+        json.dump({"image": ATLAS_IMAGE, "size": list(atlas_size), "sprites": sprites}, f, indent=2, sort_keys=True)
+    print(f"[OK] Atlas {atlas_size[0]}x{atlas_size[1]} con {len(sprites)} iconos: {ATLAS_IMAGE}, {ATLAS_INDEX}")
+
+
 def main():
     """Función principal para crear todas las imágenes"""
-    print("Creando imágenes de power-ups...")
-    
-    # Crear directorio si no existe
+    parser = argparse.ArgumentParser(description="Genera las imágenes de power-ups y el atlas de iconos")
+    parser.add_argument("--atlas", action="store_true", help="Solo reconstruir el atlas con las imágenes existentes")
+    args = parser.parse_args()
     current_dir = os.path.dirname(os.path.abspath(__file__))
+    if args.atlas:
+        build_atlas(current_dir)
+        return
+
+    print("Creando imágenes de power-ups...")
     
     # Crear las imágenes
     images = {
@@ -295,6 +371,7 @@ def main():
         print(f"[OK] Creada: {filename}")
     
     print("¡Todas las imágenes de power-ups han sido creadas exitosamente!")
+    build_atlas(current_dir)
     
     # Mostrar las imágenes creadas (opcional)
     print("\nImágenes creadas:")
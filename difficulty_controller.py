@@ -0,0 +1,199 @@
+# difficulty_controller.py
+"""
+Dificultad adaptativa (modo 1 jugador): un controlador PID que mantiene la
+tasa de aciertos del jugador cerca de un objetivo.
+
+Cada pulsación (acierto o fallo) y cada letra perdida entran en una ventana
+deslizante de los últimos 'ventana' sucesos; los tiempos de reacción de los
+aciertos, en otra. Las dos guardan sumas acumuladas, así que registrar un
+suceso cuesta O(1). Por letra se lleva además una media móvil exponencial de
+la tasa de pérdida (letras perdidas y aciertos lentos), también O(1) por suceso.
+
+Una vez por segundo de juego (update) el controlador calcula el error:
+
+    error = objetivo - tasa de aciertos + peso_reaccion * (reacción relativa al objetivo)
+
+Un error positivo (el jugador no llega) baja el factor de dificultad; uno
+negativo (le sobra) lo sube. El factor, entre factor_min y factor_max,
+multiplica la velocidad de las letras nuevas y el ritmo de apariciones. Con
+el factor alto las letras que más se pierden salen más a menudo; con el
+factor bajo, las demás (letter_weights, para KeyboardLayoutManager.set_weights).
+
+Todo se mide en segundos del reloj de juego, así que las grabaciones se
+re-simulan igual. El estado se serializa en forma relativa (to_dict/load_dict)
+para las partidas guardadas y exacta (snapshot/restore) para los keyframes.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+EVENT_HIT = "acierto"
+EVENT_MISS = "fallo"     # Tecla equivocada
+EVENT_ESCAPE = "escape"  # Letra que salió de la pantalla sin teclear
+
+DEFAULT_SETTINGS = {
+    "objetivo": 0.85,                  # Tasa de aciertos a mantener
+    "ventana": 20,                     # Sucesos de la ventana deslizante
+    "min_sucesos": 8,                  # Por debajo, no se ajusta
+    "kp": 0.8, "ki": 0.15, "kd": 0.2,
+    "integral_max": 2.0,               # Anti-windup: límite del término integral acumulado
+    "reaccion_objetivo": 1.5,          # Segundos desde la aparición hasta el acierto
+    "peso_reaccion": 0.1,
+    "factor_min": 0.6, "factor_max": 1.6,
+    "intervalo": 1.0,                  # Segundos de juego entre ajustes
+    "suavizado_letras": 0.2,           # Alfa de la media de pérdida por letra
+    "letra_dificil": 0.3,              # Media de pérdida a partir de la cual una letra es difícil
+    "banda_pesos": 0.15,               # Distancia del factor a 1 que activa los pesos de letras
+}
+
+
+class RollingWindow:
+    """Últimos 'size' valores con su suma acumulada: add y mean en O(1)."""
+
+    def __init__(self, size: int):
+        self.values: Deque[float] = deque(maxlen=size)
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def mean(self, default: float = 0.0) -> float:
+        return self.total / len(self.values) if self.values else default
+
+    def load(self, values):
+        self.values.clear(); self.total = 0.0
+        for value in values:
+            self.add(value)
+
+
+class DifficultyController:
+    """Controlador PID del factor de dificultad, alimentado por los sucesos de la partida."""
+
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        size = self.settings["ventana"]
+        self.hits = RollingWindow(size)       # 1 por acierto, 0 por fallo o escape
+        self.misses = RollingWindow(size)     # 1 por tecla equivocada
+        self.escapes = RollingWindow(size)    # 1 por letra perdida
+        self.reactions = RollingWindow(size)  # Segundos de los aciertos
+        self.letter_loss: Dict[str, float] = {}
+        self.factor = 1.0
+        self.integral = 0.0
+        self.last_error: Optional[float] = None
+        self.next_update = self.settings["intervalo"]
+        self.weights: Optional[Dict[str, int]] = None  # Últimos pesos de letras entregados
+
+    # --- Sucesos (O(1)) ---
+    def _record(self, event: str):
+        self.hits.add(1.0 if event == EVENT_HIT else 0.0)
+        self.misses.add(1.0 if event == EVENT_MISS else 0.0)
+        self.escapes.add(1.0 if event == EVENT_ESCAPE else 0.0)
+
+    def _letter(self, char: str, lost: float):
+        alpha = self.settings["suavizado_letras"]
+        loss = self.letter_loss.get(char, 0.0)
+        self.letter_loss[char] = loss + alpha * (lost - loss)
+
+    def record_hit(self, char: str, reaction: Optional[float] = None):
+        """Acierto; un acierto lento cuenta para su letra como pérdida parcial (el doble del objetivo = 1)."""
+        self._record(EVENT_HIT)
+        if reaction is None or reaction < 0:
+            self._letter(char, 0.0); return
+        self.reactions.add(reaction)
+        target = self.settings["reaccion_objetivo"]
+        self._letter(char, max(0.0, min(1.0, (reaction - target) / target)))
+
+    def record_miss(self):
+        self._record(EVENT_MISS)
+
+    def record_escape(self, char: str):
+        self._record(EVENT_ESCAPE); self._letter(char, 1.0)
+
+    # --- Métricas de la ventana ---
+    def hit_rate(self) -> float:
+        return self.hits.mean(default=self.settings["objetivo"])
+
+    def miss_rate(self) -> float:
+        return self.misses.mean()
+
+    def escape_rate(self) -> float:
+        return self.escapes.mean()
+
+    def reaction_time(self) -> float:
+        return self.reactions.mean(default=self.settings["reaccion_objetivo"])
+
+    # --- Control ---
+    def error(self) -> float:
+        s = self.settings
+        reaction = (self.reaction_time() - s["reaccion_objetivo"]) / s["reaccion_objetivo"]
+        return s["objetivo"] - self.hit_rate() + s["peso_reaccion"] * max(-1.0, min(1.0, reaction))
+
+    def update(self, now: float) -> bool:
+        """Ajusta el factor si ha llegado el instante del siguiente ajuste. Retorna True si lo ajustó."""
+        if now < self.next_update:
+            return False
+        s = self.settings
+        dt = s["intervalo"]
+        self.next_update = max(self.next_update + dt, now)
+        if len(self.hits) < s["min_sucesos"]:
+            return False
+        error = self.error()
+        limit = s["integral_max"]
+        self.integral = max(-limit, min(limit, self.integral + error * dt))
+        derivative = 0.0 if self.last_error is None else (error - self.last_error) / dt
+        self.last_error = error
+        output = s["kp"] * error + s["ki"] * self.integral + s["kd"] * derivative
+        self.factor = max(s["factor_min"], min(s["factor_max"], 1.0 - output))
+        return True
+
+    def letter_weights(self, alphabet) -> Optional[Dict[str, int]]:
+        """
+        Pesos de las letras de 'alphabet' según el factor: por encima de la banda, las letras
+        difíciles salen el doble; por debajo, las fáciles. None dentro de la banda (reparto normal).
+        """
+        s = self.settings
+        if abs(self.factor - 1.0) < s["banda_pesos"]:
+            return None
+        hard = self.factor > 1.0
+        weights = {char: 2 for char in alphabet
+                   if (self.letter_loss.get(char, 0.0) >= s["letra_dificil"]) == hard}
+        # Si todas las letras caen del mismo lado, doblarlas todas es el reparto normal
+        return weights if weights and len(weights) < len(alphabet) else None
+
+    # --- Serialización ---
+    def _state(self) -> Dict:
+        return {"factor": self.factor, "integral": self.integral, "last_error": self.last_error,
+                "hits": list(self.hits.values), "misses": list(self.misses.values),
+                "escapes": list(self.escapes.values), "reactions": list(self.reactions.values),
+                "letter_loss": dict(self.letter_loss), "weights": self.weights}
+
+    def _load_state(self, data: Dict):
+        self.factor = data.get("factor", 1.0)
+        self.integral = data.get("integral", 0.0)
+        self.last_error = data.get("last_error")
+        for name in ("hits", "misses", "escapes", "reactions"):
+            getattr(self, name).load(data.get(name, []))
+        self.letter_loss = dict(data.get("letter_loss", {}))
+        self.weights = data.get("weights")
+
+    def to_dict(self, now: float) -> Dict:
+        """Forma relativa: segundos que faltan para el siguiente ajuste."""
+        return dict(self._state(), proximo_ajuste=self.next_update - now)
+
+    def load_dict(self, data: Dict, now: float):
+        self._load_state(data)
+        self.next_update = now + data.get("proximo_ajuste", self.settings["intervalo"])
+
+    def snapshot(self) -> Dict:
+        """Estado con el instante exacto del siguiente ajuste (keyframes de las grabaciones)."""
+        return dict(self._state(), siguiente_ajuste=self.next_update)
+
+    def restore(self, data: Dict):
+        self._load_state(data)
+        self.next_update = data["siguiente_ajuste"]
@@ -0,0 +1,208 @@
+# display_manager.py
+"""
+Configuración de pantalla: frecuencia objetivo, VSync, aceleración por hardware,
+resolución interna de renderizado escalada a la ventana y motor de dibujo
+(software o texturas SDL2, ver render_backend.py).
+Las preferencias se guardan en config.json bajo la clave "display", junto con
+la latencia entrada-presentación medida para cada combinación de ajustes.
+"""
+
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from render_backend import SoftwareBackend, SDL2Backend, BACKEND_OPTIONS, BACKEND_SOFTWARE, BACKEND_SDL2, BACKEND_ERRORS
+
+# Frecuencias seleccionables. 0 significa "sin límite" (clock.tick(0) no duerme).
+REFRESH_OPTIONS = [60, 120, 144, 0]
+# pygame.SCALED amplía la resolución interna por factores enteros: solo las escalas
+# 1/n llenan la ventana (con 0.75 quedaría un recuadro de 0.75 con bordes negros).
+RENDER_SCALE_OPTIONS = [1.0, 0.5]
+CONFIG_PATH = "config.json"
+LATENCY_WINDOW = 120  # Muestras para el promedio móvil de latencia
+
+
+class DisplayManager:
+    """Gestiona el modo de video y el ritmo de fotogramas del juego."""
+
+    def __init__(self, target_fps: int = 60, vsync: bool = False,
+                 render_scale: float = 1.0, hardware_accel: bool = True,
+                 latency_ms: Optional[Dict[str, float]] = None, render_backend: str = BACKEND_SOFTWARE):
+        self.target_fps = target_fps if target_fps in REFRESH_OPTIONS else 60
+        self.vsync = vsync
+        self.render_scale = render_scale if render_scale in RENDER_SCALE_OPTIONS else 1.0
+        self.hardware_accel = hardware_accel
+        self.latency_ms = dict(latency_ms or {})  # {setting_key: latencia media en ms}
+        self.render_backend = render_backend if render_backend in BACKEND_OPTIONS else BACKEND_SOFTWARE
+        self.backend = None  # Motor de dibujo realmente creado (SoftwareBackend o SDL2Backend)
+
+        # Estado de la medición de latencia en curso
+        self._pending_input_ms = None
+        self._latency_samples = []
+        self.vsync_active = False  # VSync realmente concedido por el driver
+
+    # ------------------------------------------------------------------
+    # Modo de video
+    # ------------------------------------------------------------------
+    def create_screen(self, caption: str = "SpeedType Animated") -> Tuple[int, int, pygame.Surface]:
+        """
+        Crea la superficie de pantalla según la configuración.
+        Retorna (ancho, alto, pantalla), donde ancho/alto son la resolución
+        interna de renderizado (la lógica del juego trabaja en estas coordenadas).
+        """
+        info = pygame.display.Info()
+        desktop_w, desktop_h = info.current_w, info.current_h
+        divisor = round(1 / self.render_scale)  # Factor entero con el que SCALED amplía
+        width = max(320, desktop_w // divisor)
+        height = max(240, desktop_h // divisor)
+
+        flags = 0
+        if self.hardware_accel:
+            flags |= pygame.HWSURFACE | pygame.DOUBLEBUF
+        # SCALED usa el renderer de SDL: escala la resolución interna a la ventana
+        # y es requisito para solicitar VSync sin OpenGL.
+        if self.vsync or self.render_scale != 1.0:
+            flags |= pygame.SCALED
+
+        if self.render_backend == BACKEND_SDL2:
+            try:
+                return self._create_sdl2_screen(width, height, (desktop_w, desktop_h), caption)
+            except BACKEND_ERRORS as e:
+                print(f"Motor SDL2 no disponible ({e}); se usará el dibujo por software.")
+
+        screen = None
+        self.vsync_active = False
+        if self.vsync:
+            try:
+                screen = pygame.display.set_mode((width, height), flags, vsync=1)
+                self.vsync_active = True
+            except pygame.error as e:
+                print(f"VSync no disponible ({e}); se usará el limitador de fotogramas.")
+        if screen is None:
+            screen = pygame.display.set_mode((width, height), flags)
+        pygame.display.set_caption(caption)
+        self.backend = SoftwareBackend(screen)
+        return width, height, screen
+
+    def _create_sdl2_screen(self, width: int, height: int, window_size: Tuple[int, int], caption: str):
+        # La ventana de pygame.display queda oculta: su superficie sirve de pantalla lógica
+        # (y permite convert()/convert_alpha()); SDL2Backend presenta en su propia ventana.
+        screen = pygame.display.set_mode((width, height), pygame.HIDDEN)
+        self.backend = SDL2Backend(screen, caption, window_size, self.vsync)
+        # El Renderer de SDL2 no informa de si el driver concedió VSync: se asume la petición
+        self.vsync_active = self.vsync
+        return width, height, screen
+
+    def get_backend(self):
+        """Motor de dibujo activo; por software sobre la pantalla actual si no se creó ninguno."""
+        if self.backend is None:
+            self.backend = SoftwareBackend(pygame.display.get_surface())
+        return self.backend
+
+    def present(self):
+        """Presenta el fotograma (sustituye a pygame.display.flip())."""
+        self.get_backend().present()
+
+    def cycle_render_backend(self) -> str:
+        """Alterna el motor de dibujo (se aplica al reiniciar)."""
+        idx = BACKEND_OPTIONS.index(self.render_backend)
+        self.render_backend = BACKEND_OPTIONS[(idx + 1) % len(BACKEND_OPTIONS)]
+        return self.render_backend
+
+    # ------------------------------------------------------------------
+    # Ritmo de fotogramas
+    # ------------------------------------------------------------------
+    def tick(self, clock: pygame.time.Clock) -> int:
+        """Avanza el reloj respetando la frecuencia objetivo. Retorna los ms transcurridos."""
+        return clock.tick(self.target_fps)
+
+    def cycle_target_fps(self, step: int = 1) -> int:
+        """Selecciona la frecuencia siguiente (o anterior) de REFRESH_OPTIONS."""
+        idx = REFRESH_OPTIONS.index(self.target_fps) if self.target_fps in REFRESH_OPTIONS else 0
+        self.target_fps = REFRESH_OPTIONS[(idx + step) % len(REFRESH_OPTIONS)]
+        return self.target_fps
+
+    def cycle_render_scale(self, step: int = 1) -> float:
+        """Selecciona la escala de resolución interna siguiente (se aplica al reiniciar)."""
+        idx = RENDER_SCALE_OPTIONS.index(self.render_scale) if self.render_scale in RENDER_SCALE_OPTIONS else 0
+        self.render_scale = RENDER_SCALE_OPTIONS[(idx + step) % len(RENDER_SCALE_OPTIONS)]
+        return self.render_scale
+
+    def get_fps_label(self) -> str:
+        return "Sin límite" if self.target_fps == 0 else f"{self.target_fps} FPS"
+
+    # ------------------------------------------------------------------
+    # Latencia entrada -> presentación
+    # ------------------------------------------------------------------
+    def setting_key(self) -> str:
+        """Clave que identifica la combinación de ajustes en uso en latency_ms
+        (VSync según lo concedido por el driver, no según lo solicitado)."""
+        vsync = "vsync" if self.vsync_active else "novsync"
+        key = f"{self.target_fps or 'uncapped'}_{vsync}_{int(self.render_scale * 100)}"
+        return key if self.render_backend == BACKEND_SOFTWARE else f"{key}_{self.render_backend}"
+
+    def mark_input(self, event_ms: Optional[int] = None):
+        """Registra el instante (ms de pygame.time.get_ticks) de la entrada a medir.
+        Solo se conserva la primera entrada pendiente hasta el siguiente flip."""
+        if self._pending_input_ms is None:
+            self._pending_input_ms = pygame.time.get_ticks() if event_ms is None else event_ms
+
+    def mark_present(self):
+        """Llamar justo después de presentar el fotograma: cierra la muestra pendiente."""
+        if self._pending_input_ms is None:
+            return
+        self._latency_samples.append(pygame.time.get_ticks() - self._pending_input_ms)
+        self._pending_input_ms = None
+        if len(self._latency_samples) > LATENCY_WINDOW:
+            del self._latency_samples[0]
+        self.latency_ms[self.setting_key()] = round(sum(self._latency_samples) / len(self._latency_samples), 2)
+
+    def get_measured_latency(self) -> Optional[float]:
+        """Latencia media medida para los ajustes actuales, o None si no hay datos."""
+        return self.latency_ms.get(self.setting_key())
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    def to_dict(self) -> Dict:
+        return {
+            "target_fps": self.target_fps,
+            "vsync": self.vsync,
+            "render_scale": self.render_scale,
+            "hardware_accel": self.hardware_accel,
+            "latency_ms": self.latency_ms,
+            "render_backend": self.render_backend,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DisplayManager":
+        return cls(target_fps=data.get("target_fps", 60),
+                   vsync=data.get("vsync", False),
+                   render_scale=data.get("render_scale", 1.0),
+                   hardware_accel=data.get("hardware_accel", True),
+                   latency_ms=data.get("latency_ms", {}),
+                   render_backend=data.get("render_backend", BACKEND_SOFTWARE))
+
+    @classmethod
+    def load(cls, path: str = CONFIG_PATH) -> "DisplayManager":
+        """Carga los ajustes de pantalla desde config.json (valores por defecto si no existen)."""
+        try:
+            with open(path, "r") as f:
+                return cls.from_dict(json.load(f).get("display", {}))
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return cls()
+
+    def save(self, path: str = CONFIG_PATH):
+        """Guarda los ajustes en config.json conservando el resto de claves."""
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f: data = json.load(f)
+            except (json.JSONDecodeError, OSError): data = {}
+        data["display"] = self.to_dict()
+        try:
+            with open(path, "w") as f: json.dump(data, f)
+        except OSError as e:
+            print(f"Error guardando configuración de pantalla: {e}")
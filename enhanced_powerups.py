@@ -1,303 +1,267 @@
 # enhanced_powerups.py
 """
-Sistema de power-ups mejorado con nuevos efectos y mecánicas avanzadas.
-Extiende el sistema de power-ups existente con nuevas funcionalidades.
+Power-ups mejorados como una canalización de efectos orientada a datos.
+
+Un efecto activo es solo un registro (tipo, instante de activación, duración y
+parámetros); no guarda nada en las letras. En cada fotograma el gestor compone
+los efectos activos en un FrameEffects y la sesión aplica cada etapa una sola
+vez sobre el almacén de letras (GameSession.letras_en_pantalla), modificando
+los diccionarios en su sitio:
+
+- group_time_scale: escala el tiempo de cada grupo de entidades (congelador:
+  letras a 0, partículas y estrellas más lentas; ver GameClock.group_dt).
+- attraction_field: desplaza cada icono hacia los atractores (imán, ver force_field.py).
+- score_multiplier: multiplica los puntos de cada acierto (multiplicador).
+- fallos_budget: fallos extra permitidos antes de terminar (vida extra).
+- area_clear: elimina en una pasada las letras dentro del radio de la explosión
+  (bomba de tiempo, al vencer su cuenta atrás en el reloj de juego). La sesión
+  obtiene las candidatas de su rejilla espacial (spatial_hash.py).
+
+Los efectos se apilan: las escalas y los multiplicadores se multiplican, los
+atractores se suman y los presupuestos se acumulan. El coste por fotograma es
+lineal en el número de letras. Los vencimientos se planifican en el
+TimerScheduler de la sesión (timer_scheduler.py) sobre su reloj de juego.
 """
 
+from typing import Callable, Dict, List, Optional, Tuple
+
 import pygame
-import random
-import math
-import time
-from typing import Dict, List, Tuple, Optional
-from powerups import PowerUp
-
-class FreezerPowerUp(PowerUp):
-    """Power-up que congela todas las letras por un tiempo determinado."""
-    
-    def __init__(self, x, y):
-        super().__init__(x, y, "congelador", (150, 200, 255), 8.0)  # 8 segundos de duración
-        self.freeze_effect_active = False
-        self.original_speeds = {}  # Guarda las velocidades originales
-    
-    def activate(self, game_session):
-        """Activa el efecto de congelación."""
-        super().activate(game_session)
-        self.freeze_effect_active = True
-        
-        # Guardar velocidades originales y congelar letras
-        for letra in game_session.letras:
-            if 'original_speed' not in letra:
-                letra['original_speed'] = {
-                    'vx': letra.get('vx', 0),
-                    'vy': letra.get('vy', 0),
-                    'icon_vx': letra.get('icon_vx', 0),
-                    'icon_vy': letra.get('icon_vy', 0)
-                }
-            
-            # Congelar movimiento
-            letra['vx'] = 0
-            letra['vy'] = 0
-            if 'icon_vx' in letra:
-                letra['icon_vx'] = 0
-            if 'icon_vy' in letra:
-                letra['icon_vy'] = 0
-        
-        print("¡CONGELADOR ACTIVADO! Todas las letras están congeladas.")
-    
-    def update(self, game_session):
-        """Actualiza el efecto de congelación."""
-        super().update(game_session)
-        
-        if self.freeze_effect_active and not self.active:
-            # Restaurar velocidades cuando el efecto termine
-            for letra in game_session.letras:
-                if 'original_speed' in letra:
-                    letra['vx'] = letra['original_speed']['vx']
-                    letra['vy'] = letra['original_speed']['vy']
-                    if 'icon_vx' in letra:
-                        letra['icon_vx'] = letra['original_speed']['icon_vx']
-                    if 'icon_vy' in letra:
-                        letra['icon_vy'] = letra['original_speed']['icon_vy']
-                    del letra['original_speed']
-            
-            self.freeze_effect_active = False
-            print("El efecto de congelación ha terminado.")
-    
-    def apply_to_new_letter(self, letra):
-        """Aplica el efecto de congelación a nuevas letras que aparezcan."""
-        if self.freeze_effect_active:
-            letra['original_speed'] = {
-                'vx': letra.get('vx', 0),
-                'vy': letra.get('vy', 0),
-                'icon_vx': letra.get('icon_vx', 0),
-                'icon_vy': letra.get('icon_vy', 0)
-            }
-            letra['vx'] = 0
-            letra['vy'] = 0
-            if 'icon_vx' in letra:
-                letra['icon_vx'] = 0
-            if 'icon_vy' in letra:
-                letra['icon_vy'] = 0
-
-class MagnetPowerUp(PowerUp):
-    """Power-up que atrae todas las letras hacia el centro de la pantalla."""
-    
-    def __init__(self, x, y):
-        super().__init__(x, y, "iman", (255, 100, 255), 6.0)  # 6 segundos de duración
-        self.magnet_strength = 0.5  # Fuerza de atracción
-        self.center_x = 0
-        self.center_y = 0
-    
-    def activate(self, game_session):
-        """Activa el efecto magnético."""
-        super().activate(game_session)
-        
-        # Obtener centro de la pantalla desde game_session
-        self.center_x = game_session.main.ANCHO // 2
-        self.center_y = game_session.main.ALTO // 2
-        
-        print("¡IMÁN ACTIVADO! Las letras son atraídas hacia el centro.")
-    
-    def update(self, game_session):
-        """Actualiza el efecto magnético."""
-        super().update(game_session)
-        
-        if self.active:
-            # Aplicar fuerza magnética a todas las letras
-            for letra in game_session.letras:
-                # Calcular dirección hacia el centro
-                dx = self.center_x - letra['x']
-                dy = self.center_y - letra['y']
-                distance = math.sqrt(dx*dx + dy*dy)
-                
-                if distance > 50:  # Solo atraer si está lejos del centro
-                    # Normalizar y aplicar fuerza
-                    force_x = (dx / distance) * self.magnet_strength
-                    force_y = (dy / distance) * self.magnet_strength
-                    
-                    # Aplicar fuerza a la velocidad
-                    letra['vx'] = letra.get('vx', 0) + force_x
-                    letra['vy'] = letra.get('vy', 0) + force_y
-                    
-                    # También atraer el ícono si existe
-                    if 'icon_x' in letra and 'icon_y' in letra:
-                        icon_dx = self.center_x - letra['icon_x']
-                        icon_dy = self.center_y - letra['icon_y']
-                        icon_distance = math.sqrt(icon_dx*icon_dx + icon_dy*icon_dy)
-                        
-                        if icon_distance > 50:
-                            icon_force_x = (icon_dx / icon_distance) * self.magnet_strength
-                            icon_force_y = (icon_dy / icon_distance) * self.magnet_strength
-                            
-                            letra['icon_vx'] = letra.get('icon_vx', 0) + icon_force_x
-                            letra['icon_vy'] = letra.get('icon_vy', 0) + icon_force_y
-
-class MultiplierPowerUp(PowerUp):
-    """Power-up que triplica los puntos obtenidos temporalmente."""
-    
-    def __init__(self, x, y):
-        super().__init__(x, y, "multiplicador", (255, 215, 0), 10.0)  # 10 segundos de duración
-        self.multiplier = 3
-        self.original_scoring = None
-    
-    def activate(self, game_session):
-        """Activa el multiplicador de puntos."""
-        super().activate(game_session)
-        
-        # Marcar que el multiplicador está activo
-        game_session.score_multiplier = self.multiplier
-        
-        print(f"¡MULTIPLICADOR x{self.multiplier} ACTIVADO! Puntos triplicados.")
-    
-    def update(self, game_session):
-        """Actualiza el multiplicador."""
-        super().update(game_session)
-        
-        if not self.active and hasattr(game_session, 'score_multiplier'):
-            # Restaurar multiplicador normal cuando termine
-            game_session.score_multiplier = 1
-            print("El multiplicador de puntos ha terminado.")
-
-class ExtraLifePowerUp(PowerUp):
-    """Power-up que otorga una vida extra (fallo adicional)."""
-    
-    def __init__(self, x, y):
-        super().__init__(x, y, "vida_extra", (255, 100, 100), 0.1)  # Efecto instantáneo
-        self.lives_granted = 1
-    
-    def activate(self, game_session):
-        """Otorga vida extra."""
-        super().activate(game_session)
-        
-        # Aumentar el límite de fallos
-        if hasattr(game_session, 'game_options') and 'fallos_limit' in game_session.game_options:
-            game_session.game_options['fallos_limit'] += self.lives_granted
-            print(f"¡VIDA EXTRA! +{self.lives_granted} fallo adicional permitido.")
-        
-        # Efecto inmediato, se desactiva automáticamente
-        self.active = False
-
-class TimeBombPowerUp(PowerUp):
-    """Power-up que elimina todas las letras en pantalla después de un tiempo."""
-    
-    def __init__(self, x, y):
-        super().__init__(x, y, "bomba_tiempo", (255, 50, 50), 3.0)  # 3 segundos de cuenta regresiva
-        self.countdown = 3.0
-        self.warning_sound_played = False
-    
-    def activate(self, game_session):
-        """Inicia la cuenta regresiva de la bomba."""
-        super().activate(game_session)
-        self.countdown = 3.0
-        print("¡BOMBA DE TIEMPO ACTIVADA! Eliminará todas las letras en 3 segundos.")
-    
-    def update(self, game_session):
-        """Actualiza la cuenta regresiva."""
-        if self.active:
-            self.countdown -= 1/60.0  # Asumiendo 60 FPS
-            
-            # Sonido de advertencia a 1 segundo
-            if self.countdown <= 1.0 and not self.warning_sound_played:
-                self.warning_sound_played = True
-                # Aquí se podría reproducir un sonido de advertencia
-            
-            # Explotar cuando llegue a 0
-            if self.countdown <= 0:
-                self.explode(game_session)
-                self.active = False
-        
-        super().update(game_session)
-    
-    def explode(self, game_session):
-        """Elimina todas las letras y otorga puntos."""
-        letters_destroyed = len(game_session.letras)
-        
-        # Otorgar puntos por cada letra eliminada
-        bonus_points = letters_destroyed * 10
-        if hasattr(game_session, 'player_managers'):
-            for player_id in game_session.player_managers:
-                game_session.player_managers[player_id].add_score(bonus_points)
-        
-        # Eliminar todas las letras
-        game_session.letras.clear()
-        
-        print(f"¡EXPLOSIÓN! {letters_destroyed} letras eliminadas. +{bonus_points} puntos de bonificación.")
 
-class EnhancedPowerUpManager:
-    """Gestor mejorado de power-ups con los nuevos tipos."""
-    
+from force_field import Attractor, apply_attraction
+from game_clock import GROUP_LETTERS, GROUP_PARTICLES, GROUP_STARS
+from texture_atlas import load_image
+
+# Parámetros de cada tipo. 'etapa' indica cómo participa en la canalización;
+# 'requiere_letras' marca los efectos que solo tienen sentido con el almacén de letras (1 jugador).
+EFFECT_SPECS = {
+    'congelador': {"duracion": 8.0, "etapa": "group_time_scale",
+                   "escalas": {GROUP_LETTERS: 0.0, GROUP_PARTICLES: 0.25, GROUP_STARS: 0.1}},
+    'iman': {"duracion": 6.0, "etapa": "attraction_field", "fuerza": 2.5, "radio_minimo": 50,
+             "alcance": None, "caida": "constante", "velocidad_maxima": 4.0, "requiere_letras": True},
+    'multiplicador': {"duracion": 10.0, "etapa": "score_multiplier", "multiplicador": 3},
+    'vida_extra': {"duracion": 0.0, "etapa": "fallos_budget", "fallos": 1},
+    'bomba_tiempo': {"duracion": 3.0, "etapa": "area_clear", "puntos_por_letra": 10, "radio": 300,
+                     "requiere_letras": True},
+}
+
+# Pesos de aparición relativos (los power-ups originales de powerups.py reparten ORIGINAL_SPAWN_WEIGHT)
+SPAWN_WEIGHTS = {
+    'congelador': 20,
+    'iman': 20,
+    'multiplicador': 15,
+    'vida_extra': 10,
+    'bomba_tiempo': 10,
+}
+ORIGINAL_SPAWN_WEIGHT = 25
+
+
+class ActiveEffect:
+    """Registro de un efecto activo; los instantes son del reloj de juego."""
+
+    __slots__ = ("tipo", "tiempo_activado", "duracion", "params", "handle")
+
+    def __init__(self, tipo: str, tiempo_activado: float, duracion: float, params: Dict):
+        self.tipo = tipo
+        self.tiempo_activado = tiempo_activado
+        self.duracion = duracion
+        self.params = params
+        self.handle = None  # TimerHandle de su vencimiento
+
+    @property
+    def vencimiento(self) -> float:
+        return self.tiempo_activado + self.duracion
+
+    def to_dict(self) -> Dict:
+        return {"tipo": self.tipo, "tiempo_activado": self.tiempo_activado,
+                "duracion": self.duracion, "params": self.params}
+
+
+class FrameEffects:
+    """Composición de los efectos activos que se aplica a las letras en un fotograma."""
+
+    __slots__ = ("group_scales", "attractors", "max_pull", "score_multiplier")
+
     def __init__(self):
-        self.active_powerups = []
-        self.powerup_types = {
-            'congelador': FreezerPowerUp,
-            'iman': MagnetPowerUp,
-            'multiplicador': MultiplierPowerUp,
-            'vida_extra': ExtraLifePowerUp,
-            'bomba_tiempo': TimeBombPowerUp
-        }
-        
-        # Probabilidades de aparición (suman 100)
-        self.spawn_probabilities = {
-            'congelador': 20,
-            'iman': 20,
-            'multiplicador': 15,
-            'vida_extra': 10,
-            'bomba_tiempo': 10,
-            # Los power-ups originales tendrán el 25% restante
-        }
-    
-    def create_random_powerup(self, x: int, y: int) -> PowerUp:
-        """Crea un power-up aleatorio en las coordenadas especificadas."""
-        rand_val = random.randint(1, 100)
-        cumulative = 0
-        
-        for powerup_type, probability in self.spawn_probabilities.items():
-            cumulative += probability
-            if rand_val <= cumulative:
-                return self.powerup_types[powerup_type](x, y)
-        
-        # Fallback a congelador si algo sale mal
-        return FreezerPowerUp(x, y)
-    
-    def update_all_powerups(self, game_session):
-        """Actualiza todos los power-ups activos."""
-        for powerup in self.active_powerups[:]:  # Copia de la lista para modificar durante iteración
-            powerup.update(game_session)
-            if not powerup.active:
-                self.active_powerups.remove(powerup)
-    
-    def add_powerup(self, powerup: PowerUp):
-        """Añade un power-up a la lista de activos."""
-        self.active_powerups.append(powerup)
-    
-    def get_active_powerups_info(self) -> List[Dict]:
-        """Obtiene información de todos los power-ups activos."""
-        info = []
-        for powerup in self.active_powerups:
-            info.append({
-                'type': powerup.type,
-                'remaining_time': powerup.duration,
-                'color': powerup.color,
-                'active': powerup.active
-            })
-        return info
-    
-    def has_active_powerup(self, powerup_type: str) -> bool:
-        """Verifica si hay un power-up específico activo."""
-        return any(p.type == powerup_type and p.active for p in self.active_powerups)
-    
-    def clear_all_powerups(self):
-        """Elimina todos los power-ups activos."""
-        self.active_powerups.clear()
+        self.group_scales: Dict[str, float] = {}  # Grupo de entidades -> escala de tiempo
+        self.attractors: List[Attractor] = []
+        self.max_pull: Optional[float] = None  # Velocidad máxima del campo de atracción (px por fotograma)
+        self.score_multiplier = 1
+
+
+# --- Etapas de composición: cada efecto activo se pliega en el FrameEffects del fotograma ---
+def group_time_scale(frame: FrameEffects, params: Dict):
+    for group, scale in params["escalas"].items():
+        frame.group_scales[group] = frame.group_scales.get(group, 1.0) * scale
+
+
+def attraction_field(frame: FrameEffects, params: Dict):
+    frame.attractors.append(Attractor(params["x"], params["y"], params["fuerza"], params["radio_minimo"],
+                                      params.get("alcance"), params.get("caida", "constante")))
+    cap = params.get("velocidad_maxima")
+    if cap is not None:
+        frame.max_pull = cap if frame.max_pull is None else min(frame.max_pull, cap)
+
+
+def score_multiplier(frame: FrameEffects, params: Dict):
+    frame.score_multiplier *= params["multiplicador"]
+
+
+FRAME_STAGES: Dict[str, Callable[[FrameEffects, Dict], None]] = {
+    "group_time_scale": group_time_scale,
+    "attraction_field": attraction_field,
+    "score_multiplier": score_multiplier,
+}
+
+
+# --- Etapas sobre el almacén de letras (apply_attraction está en force_field.py) ---
+def letters_in_radius(letras: List[Dict], center: Tuple[float, float], radius: Optional[float]) -> List[Dict]:
+    """Consulta espacial: letras cuya posición está a 'radius' o menos de 'center' (todas si radius es None)."""
+    if radius is None:
+        return list(letras)
+    cx, cy = center
+    limite = radius * radius
+    return [letra for letra in letras
+            if (letra['letter_x'] - cx) ** 2 + (letra['letter_y'] - cy) ** 2 <= limite]
+
+
+def remove_letters(letras: List[Dict], removed: List[Dict]):
+    """Quita 'removed' del almacén en una sola pasada (por identidad, no por igualdad de diccionarios)."""
+    if len(removed) == len(letras):
+        letras.clear()
+    elif removed:
+        ids = {id(letra) for letra in removed}
+        letras[:] = [letra for letra in letras if id(letra) not in ids]
+
+
+
+class EnhancedPowerUpManager:
+    """
+    Efectos activos de los power-ups mejorados. Comparte el planificador (y su reloj)
+    con el PowerUp de la sesión; actualizar() devuelve los efectos terminados para que
+    la sesión aplique las etapas de fin (area_clear de la bomba). Cada vez que cambian
+    los activos se actualizan las escalas por grupo del reloj: entrar o salir de una
+    congelación no depende del número de letras.
+    """
+
+    def __init__(self, scheduler, width: int, height: int):
+        self.scheduler = scheduler
+        self.clock = scheduler.clock
+        self.width, self.height = width, height
+        self.activos: List[ActiveEffect] = []
+        self.fallos_budget = 0  # Fallos extra acumulados por 'vida_extra'
+        self._terminados: List[ActiveEffect] = []
+        self._frame: Optional[FrameEffects] = None  # Composición en caché; se invalida al cambiar los activos
+
+    def _now(self, now=None):
+        return self.clock.now if now is None else now
+
+    def spawn_weights(self, with_letters: bool = True) -> Dict[str, int]:
+        """Pesos de aparición de los tipos disponibles (sin los que necesitan letras en 2 jugadores)."""
+        return {tipo: peso for tipo, peso in SPAWN_WEIGHTS.items()
+                if with_letters or not EFFECT_SPECS[tipo].get("requiere_letras")}
+
+    def activar(self, tipo: str, now=None) -> Optional[ActiveEffect]:
+        """
+        Activa un efecto. Los efectos con duración se apilan con los del mismo tipo que ya
+        estén activos; los instantáneos (vida extra) se aplican y no quedan activos.
+        """
+        spec = EFFECT_SPECS[tipo]
+        if spec["etapa"] == "fallos_budget":
+            self.fallos_budget += spec["fallos"]
+            return None
+        params = {key: value for key, value in spec.items() if key not in ("duracion", "etapa", "requiere_letras")}
+        if spec["etapa"] in ("attraction_field", "area_clear"):
+            params["x"], params["y"] = self.width / 2, self.height / 2
+        effect = ActiveEffect(tipo, self._now(now), spec["duracion"], params)
+        self._add(effect)
+        return effect
+
+    def _add(self, effect: ActiveEffect):
+        self.activos.append(effect)
+        effect.handle = self.scheduler.schedule_at(effect.vencimiento, self._expire, effect)
+        self._changed()
+
+    def _expire(self, effect: ActiveEffect):
+        self.activos.remove(effect)
+        effect.handle = None
+        self._terminados.append(effect)
+        self._changed()
+
+    def _changed(self):
+        """Invalida la composición y lleva sus escalas por grupo al reloj de juego."""
+        self._frame = None
+        self.clock.set_group_scales(self.frame().group_scales)
+
+    def actualizar(self, now=None) -> List[ActiveEffect]:
+        """Dispara los vencimientos pendientes y retorna los efectos terminados en este ciclo."""
+        self.scheduler.run_due(self._now(now))
+        terminados, self._terminados = self._terminados, []
+        return terminados
+
+    def frame(self) -> FrameEffects:
+        """Composición de los efectos activos; solo se recalcula cuando cambian."""
+        if self._frame is None:
+            frame = FrameEffects()
+            for effect in self.activos:
+                stage = FRAME_STAGES.get(EFFECT_SPECS[effect.tipo]["etapa"])
+                if stage is not None:
+                    stage(frame, effect.params)
+            self._frame = frame
+        return self._frame
+
+    def esta_activo(self, tipo: str) -> bool:
+        return any(effect.tipo == tipo for effect in self.activos)
+
+    def hud_entries(self, now=None) -> List[Tuple[str, float, int]]:
+        """(tipo, segundos restantes del más largo, efectos apilados) por tipo activo, en orden de activación."""
+        now = self._now(now)
+        entries = {}
+        for effect in self.activos:
+            restante = max(0.0, effect.vencimiento - now)
+            prev = entries.get(effect.tipo)
+            entries[effect.tipo] = (max(restante, prev[0]), prev[1] + 1) if prev else (restante, 1)
+        return [(tipo, restante, count) for tipo, (restante, count) in entries.items()]
+
+    def clear(self):
+        for effect in self.activos:
+            self.scheduler.cancel(effect.handle)
+        self.activos = []
+        self._terminados = []
+        self._changed()
+
+    # --- Serialización ---
+    def to_dict(self, now=None) -> Dict:
+        """Forma relativa para las partidas guardadas: segundos restantes de cada efecto."""
+        now = self._now(now)
+        return {"fallos_extra": self.fallos_budget,
+                "activos": [{"tipo": e.tipo, "restante": max(0.0, e.vencimiento - now), "duracion": e.duracion,
+                             "params": e.params} for e in self.activos]}
+
+    def load_dict(self, data: Dict, now=None):
+        now = self._now(now)
+        self.restore({"fallos_extra": data.get("fallos_extra", 0),
+                      "activos": [{"tipo": e["tipo"], "tiempo_activado": now - (e["duracion"] - e["restante"]),
+                                   "duracion": e["duracion"], "params": e["params"]}
+                                  for e in data.get("activos", []) if e.get("tipo") in EFFECT_SPECS]})
+
+    def snapshot(self) -> Dict:
+        """Estado con los instantes exactos del reloj (keyframes de las grabaciones)."""
+        return {"fallos_extra": self.fallos_budget, "activos": [effect.to_dict() for effect in self.activos]}
+
+    def restore(self, data: Dict):
+        """Sustituye los efectos activos por los de 'data' (forma de snapshot) y re-planifica sus vencimientos."""
+        self.clear()
+        self.fallos_budget = data.get("fallos_extra", 0)
+        for info in data.get("activos", []):
+            self._add(ActiveEffect(info["tipo"], info["tiempo_activado"], info["duracion"], dict(info["params"])))
+
 
 # Función de utilidad para integración con el sistema existente
-def create_enhanced_powerup_icons(main_game) -> Dict:
+def create_enhanced_powerup_icons(icon_size: int = 60) -> Dict:
     """Carga iconos para los nuevos power-ups desde archivos de imagen."""
-    import os
-    
     icons = {}
-    icon_size = (60, 60)
-    
+    size = (icon_size, icon_size)
+
     # Mapeo de tipos de power-up a archivos de imagen
     powerup_image_files = {
         'congelador': 'hielo.png',
@@ -306,7 +270,7 @@ def create_enhanced_powerup_icons(main_game) -> Dict:
         'vida_extra': 'vidaExtra.png',
         'bomba_tiempo': 'bomba_tiempo.png'
     }
-    
+
     # Colores de respaldo si no se puede cargar la imagen
     powerup_colors = {
         'congelador': (150, 200, 255),
@@ -315,30 +279,22 @@ def create_enhanced_powerup_icons(main_game) -> Dict:
         'vida_extra': (255, 100, 100),
         'bomba_tiempo': (255, 50, 50)
     }
-    
+
     for powerup_type, image_file in powerup_image_files.items():
         try:
-            # Intentar cargar la imagen desde archivo
-            image_path = os.path.join(os.path.dirname(__file__), image_file)
-            if os.path.exists(image_path):
-                loaded_image = pygame.image.load(image_path).convert_alpha()
-                # Escalar la imagen al tamaño deseado
-                scaled_image = pygame.transform.scale(loaded_image, icon_size)
-                icons[powerup_type] = scaled_image
-                print(f"Cargada imagen para {powerup_type}: {image_file}")
-            else:
-                raise FileNotFoundError(f"No se encontró {image_file}")
-                
+            # Cargar la imagen desde el atlas o, si no está empaquetada, desde archivo
+            icons[powerup_type] = load_image(image_file, size)
+
         except (pygame.error, FileNotFoundError) as e:
             print(f"No se pudo cargar {image_file} para {powerup_type}: {e}")
             print(f"Usando gráfico de respaldo para {powerup_type}")
-            
+
             # Crear gráfico de respaldo
-            surface = pygame.Surface(icon_size, pygame.SRCALPHA)
+            surface = pygame.Surface(size, pygame.SRCALPHA)
             color = powerup_colors[powerup_type]
             pygame.draw.circle(surface, color, (30, 30), 25)
             pygame.draw.circle(surface, (255, 255, 255), (30, 30), 25, 3)
-            
+
             # Añadir símbolo distintivo de respaldo
             if powerup_type == 'congelador':
                 points = [(30, 10), (40, 25), (30, 40), (20, 25)]
@@ -357,7 +313,7 @@ def create_enhanced_powerup_icons(main_game) -> Dict:
             elif powerup_type == 'bomba_tiempo':
                 pygame.draw.circle(surface, (0, 0, 0), (30, 35), 12)
                 pygame.draw.line(surface, (255, 255, 255), (30, 23), (30, 15), 3)
-            
+
             icons[powerup_type] = surface
-    
+
     return icons
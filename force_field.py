@@ -0,0 +1,133 @@
+# force_field.py
+"""
+Campo de atracción por lotes para el imán (enhanced_powerups.py).
+
+El campo se evalúa sobre los arrays de posiciones de todos los iconos a la vez:
+un bucle por atractor (pocos) y operaciones vectoriales sobre las letras. Cada
+atractor tiene una fuerza, un radio mínimo (dentro de él no atrae), un alcance
+opcional y una curva de caída; la velocidad resultante de cada letra se recorta
+a una velocidad máxima.
+
+Con NumPy se usan arrays; sin él, un bucle de Python equivalente. Las dos ramas
+hacen las mismas operaciones en el mismo orden, así que dan resultados idénticos
+(las grabaciones se re-simulan igual con o sin NumPy).
+"""
+
+import math
+from operator import itemgetter
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# NumPy es opcional: sin él se usa el bucle de Python
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Curvas de caída de la fuerza con la distancia d (r = radio mínimo, a = alcance):
+# constante: 1 | lineal: 1 - d/a | inversa: r/d | cuadratica: (r/d)^2
+FALLOFFS = ("constante", "lineal", "inversa", "cuadratica")
+
+# Por debajo de este número de letras el bucle de Python es más rápido que preparar los arrays
+NUMPY_MIN_LETTERS = 48
+
+_icon_position = itemgetter('icon_x', 'icon_y')
+
+
+class Attractor(NamedTuple):
+    """Punto de atracción; 'fuerza' en píxeles por fotograma de 60 FPS."""
+    x: float
+    y: float
+    fuerza: float
+    radio_minimo: float = 0.0
+    alcance: Optional[float] = None  # Sin alcance, atrae a cualquier distancia
+    caida: str = "constante"
+
+
+def _weight_python(attractor: Attractor, d: float) -> float:
+    caida = attractor.caida
+    if caida == "lineal":
+        return attractor.fuerza * (1.0 - d / attractor.alcance)
+    if caida == "inversa":
+        return attractor.fuerza * (attractor.radio_minimo / d)
+    if caida == "cuadratica":
+        ratio = attractor.radio_minimo / d
+        return attractor.fuerza * (ratio * ratio)
+    return attractor.fuerza
+
+
+def field_python(xs: Sequence[float], ys: Sequence[float], attractors: Sequence[Attractor],
+                 max_speed: Optional[float] = None) -> Tuple[List[float], List[float]]:
+    """Velocidad del campo (px por fotograma) en cada posición, con listas de Python."""
+    vxs, vys = [], []
+    for x, y in zip(xs, ys):
+        mx = my = 0.0
+        for attractor in attractors:
+            dx, dy = attractor.x - x, attractor.y - y
+            d = math.sqrt(dx * dx + dy * dy)
+            if d > attractor.radio_minimo and (attractor.alcance is None or d < attractor.alcance):
+                w = _weight_python(attractor, d)
+                mx += dx / d * w
+                my += dy / d * w
+        if max_speed is not None:
+            speed = math.sqrt(mx * mx + my * my)
+            if speed > max_speed:
+                scale = max_speed / speed
+                mx *= scale; my *= scale
+        vxs.append(mx); vys.append(my)
+    return vxs, vys
+
+
+def field_numpy(xs, ys, attractors: Sequence[Attractor], max_speed: Optional[float] = None):
+    """Velocidad del campo (px por fotograma) en cada posición, con arrays de NumPy."""
+    mx = numpy.zeros_like(xs); my = numpy.zeros_like(ys)
+    ux = numpy.empty_like(xs); uy = numpy.empty_like(ys)
+    for attractor in attractors:
+        dx = attractor.x - xs; dy = attractor.y - ys
+        d = numpy.sqrt(dx * dx + dy * dy)
+        mask = d > attractor.radio_minimo
+        if attractor.alcance is not None:
+            mask &= d < attractor.alcance
+        if not mask.any():
+            continue
+        caida = attractor.caida
+        if caida == "lineal":
+            w = attractor.fuerza * (1.0 - d / attractor.alcance)
+        elif caida in ("inversa", "cuadratica"):
+            ratio = numpy.divide(attractor.radio_minimo, d, out=numpy.zeros_like(d), where=mask)
+            w = attractor.fuerza * (ratio if caida == "inversa" else ratio * ratio)
+        else:
+            w = attractor.fuerza
+        # Dirección unitaria solo donde atrae (evita dividir por d = 0 bajo el atractor)
+        ux.fill(0.0); uy.fill(0.0)
+        numpy.divide(dx, d, out=ux, where=mask); numpy.divide(dy, d, out=uy, where=mask)
+        mx += ux * w; my += uy * w
+    if max_speed is not None:
+        speed = numpy.sqrt(mx * mx + my * my)
+        fast = speed > max_speed
+        if fast.any():
+            scale = numpy.divide(max_speed, speed, out=numpy.ones_like(speed), where=fast)
+            mx *= scale; my *= scale
+    return mx, my
+
+
+def apply_attraction(letras: List[dict], attractors: Sequence[Attractor], step: float,
+                     max_speed: Optional[float] = None):
+    """
+    Desplaza los iconos de 'letras' según el campo; 'step' son fotogramas de 60 FPS
+    simulados (60 * dt). Es un desplazamiento, no una aceleración: al terminar el efecto
+    las letras siguen su trayectoria original.
+    """
+    if not letras or not attractors:
+        return
+    if numpy is not None and len(letras) >= NUMPY_MIN_LETTERS:
+        pos = numpy.array(list(map(_icon_position, letras)), dtype=numpy.float64)
+        xs, ys = pos[:, 0], pos[:, 1]
+        mx, my = field_numpy(xs, ys, attractors, max_speed)
+        new_x = (xs + mx * step).tolist(); new_y = (ys + my * step).tolist()
+    else:
+        xs = [letra['icon_x'] for letra in letras]; ys = [letra['icon_y'] for letra in letras]
+        mx, my = field_python(xs, ys, attractors, max_speed)
+        new_x = [x + vx * step for x, vx in zip(xs, mx)]
+        new_y = [y + vy * step for y, vy in zip(ys, my)]
+    for letra, x, y in zip(letras, new_x, new_y):
+        letra['icon_x'] = x; letra['icon_y'] = y
@@ -0,0 +1,119 @@
+# game_clock.py
+"""
+Reloj de juego monótono. Se muestrea una vez por fotograma (tick) y todos los
+temporizadores de la partida leen de él:
+
+- now: segundos de juego transcurridos. No avanza en pausa ni durante los
+  fotogramas anormalmente largos (cuenta atrás, arrastre de ventana...), que se
+  recortan a MAX_FRAME_DT.
+- dt: paso de simulación del fotograma, escalado por time_scale. Los efectos de
+  cámara lenta o congelación cambian la escala (0.5, 0.0) en lugar de tocar
+  velocidades; los temporizadores (now) siguen en tiempo real de juego.
+- group_dt(grupo): paso de un grupo de entidades (letras, partículas, estrellas),
+  con su propia escala sobre dt. Congelar las letras es cambiar un número, sin
+  recorrerlas, y las partículas o el fondo pueden seguir a otro ritmo.
+
+Se serializa en forma relativa (segundos de juego), así que un temporizador
+guardado como "restante" sigue siendo válido al cargar en otra ejecución.
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+MAX_FRAME_DT = 0.25  # Segundos; un fotograma más largo cuenta como este máximo
+
+# Grupos de entidades con escala de tiempo propia
+GROUP_LETTERS = "letras"
+GROUP_PARTICLES = "particulas"
+GROUP_STARS = "estrellas"
+
+
+class GameClock:
+    """Tiempo de juego de una sesión, independiente del reloj de pared."""
+
+    def __init__(self, start: float = 0.0, time_scale: float = 1.0,
+                 source: Callable[[], float] = time.perf_counter, max_dt: float = MAX_FRAME_DT):
+        self.now = float(start)
+        self.time_scale = time_scale
+        self.group_scales: Dict[str, float] = {}  # Grupo -> escala sobre dt (1.0 si no está)
+        self.dt = 0.0  # Paso escalado del último fotograma
+        self.real_dt = 0.0  # Paso sin escalar del último fotograma
+        self.paused = False
+        self.max_dt = max_dt
+        self._source = source
+        self._last_sample = None
+
+    def tick(self, real_dt: Optional[float] = None) -> float:
+        """
+        Avanza un fotograma. 'real_dt' es la duración del fotograma en segundos (p. ej. la
+        de pygame.time.Clock.tick); si es None se mide con la fuente monótona.
+        Retorna el paso escalado (dt).
+        """
+        sample = self._source()
+        if real_dt is None:
+            real_dt = 0.0 if self._last_sample is None else sample - self._last_sample
+        self._last_sample = sample
+        if self.paused:
+            self.real_dt = self.dt = 0.0
+            return 0.0
+        self.real_dt = min(max(real_dt, 0.0), self.max_dt)
+        self.now += self.real_dt
+        self.dt = self.real_dt * self.time_scale
+        return self.dt
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        """Reanuda sin contar el tiempo en pausa."""
+        self.paused = False
+        self._last_sample = None
+
+    def set_time_scale(self, scale: float):
+        self.time_scale = max(0.0, scale)
+
+    def set_group_scales(self, scales: Dict[str, float]):
+        """Sustituye las escalas por grupo; los grupos que no aparecen vuelven a 1.0."""
+        self.group_scales = {group: max(0.0, scale) for group, scale in scales.items() if scale != 1.0}
+
+    def group_scale(self, group: str) -> float:
+        return self.group_scales.get(group, 1.0)
+
+    def group_dt(self, group: str) -> float:
+        """Paso escalado del último fotograma para las entidades de 'group'."""
+        return self.dt * self.group_scales.get(group, 1.0)
+
+    def reset(self, now: float = 0.0):
+        self.now = float(now)
+        self.dt = self.real_dt = 0.0
+        self._last_sample = None
+
+    # --- Temporizadores ---
+    def deadline(self, seconds: float) -> float:
+        """Instante de juego en el que vence un temporizador de 'seconds'."""
+        return self.now + seconds
+
+    def remaining(self, deadline: float) -> float:
+        return max(0.0, deadline - self.now)
+
+    def expired(self, deadline: float) -> bool:
+        return self.now >= deadline
+
+    # --- Serialización ---
+    def to_dict(self) -> Dict:
+        return {"now": self.now, "time_scale": self.time_scale, "paused": self.paused,
+                "group_scales": dict(self.group_scales)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GameClock":
+        clock = cls(data.get("now", 0.0), data.get("time_scale", 1.0))
+        clock.paused = data.get("paused", False)
+        clock.set_group_scales(data.get("group_scales", {}))
+        return clock
+
+    def load_dict(self, data: Dict):
+        """Restaura el estado guardado con to_dict sobre este mismo reloj (las referencias siguen válidas)."""
+        self.reset(data.get("now", 0.0))
+        self.time_scale = data.get("time_scale", 1.0)
+        self.paused = data.get("paused", False)
+        self.set_group_scales(data.get("group_scales", {}))
@@ -4,19 +4,42 @@ import pygame
 import pygame.freetype
 import random
 import math
-import time
 import sys
 
 from powerups import PowerUp, ShieldPowerUp
 from score_manager import ScoreManager
 from keyboard_layout_manager import KeyboardLayoutManager
+from input_manager import InputManager, reaction_time
+from replay import ReplayRecorder
+from hud import HUD
+from render_queue import RenderQueue, LAYER_BACKGROUND, LAYER_SPAWNERS, LAYER_LETTERS
+from shield_effect import ShieldEffect, EndangeredTracker, letter_danger
+from game_clock import GameClock, GROUP_LETTERS, GROUP_PARTICLES, GROUP_STARS
+from timer_scheduler import TimerScheduler
+from enhanced_powerups import EnhancedPowerUpManager, ORIGINAL_SPAWN_WEIGHT, apply_attraction, letters_in_radius, remove_letters
+from spatial_hash import SpatialHash
+from spawn_scheduler import SpawnScheduler
+from level_curve import LevelCurve, DEFAULT_CURVE
+from difficulty_controller import DifficultyController
+
+# Índice espacial de las letras (por la posición de su nave); la letra remolcada va a menos
+# de TOW_REACH píxeles de ella, así que las consultas sobre letras amplían el radio en esa cantidad.
+SPATIAL_CELL_SIZE = 128
+TOW_REACH = 80
+# Aparición: se prueban hasta SPAWN_ATTEMPTS posiciones y se usa la primera sin naves a menos
+# de SPAWN_CLEARANCE píxeles (o la menos concurrida).
+SPAWN_ATTEMPTS = 6
+SPAWN_CLEARANCE = 120
+WAVE_DURATION = 4.0  # Segundos en los que se reparte la oleada de un cambio de nivel
 
 class GameSession:
     """ Encapsula toda la lógica y el estado de una sesión de juego activa. """
-    def __init__(self, main_module, config, game_options, initial_state=None, save_timestamp=None):
+    def __init__(self, main_module, config, game_options, initial_state=None, save_timestamp=None,
+                 seed=None, show_countdown=True, record_replay=None):
         # Referencias al módulo principal
         self.main = main_module
         self.pantalla = self.main.pantalla
+        self.backend = self.main.display_manager.get_backend()  # Fachada de dibujo (software o SDL2)
         self.clock = self.main.clock
         
         # Configuración y Opciones
@@ -24,6 +47,18 @@ class GameSession:
         self.game_options = game_options
         self.save_timestamp = save_timestamp
         self.game_mode = "arcane" if self.game_options["num_jugadores"] == 1 else "versus"
+
+        # Aleatoriedad de la lógica de juego (apariciones, power-ups, letras) con semilla propia,
+        # para que una grabación pueda re-simularse. Los efectos visuales siguen usando 'random'.
+        self.seed = seed if seed is not None else random.randrange(2**63)
+        self.rng = random.Random(self.seed)
+        # Reloj de juego: avanza una vez por fotograma, se detiene en pausa y escala la simulación
+        self.game_clock = GameClock()
+        # Vencimientos de efectos temporales (power-ups): se disparan solo cuando toca
+        self.scheduler = TimerScheduler(self.game_clock)
+        # Grabación de la partida (replay.py): opcional, con la opción "grabar_partida"
+        self.record_replay = self.game_options.get("grabar_partida", False) if record_replay is None else record_replay
+        self.recorder = None
         
         # Fuentes
         self.fuente_letras = pygame.freetype.SysFont(self.config["fuente"], self.config["tam"])
@@ -33,25 +68,40 @@ class GameSession:
         fuente_btn_pausa = pygame.freetype.SysFont(self.main.FUENTE_LOGO_STYLE, 20)
         self.btn_pausa = self.main.Button(self.main.ANCHO - 120, 10, 110, 40, "PAUSA", fuente_btn_pausa, self.main.GRIS_OSCURO, self.main.GRIS_CLARO)
         self.btn_pausa.set_logo_style(True)
+        self.hud = HUD(self.main, self.fuente_ui)
+        self.render_queue = RenderQueue(); self.render_queue.tow_color = self.main.GRIS_CLARO
+        self._glyph_cache = {}
+        # Recursos estáticos: con el motor SDL2 se suben como texturas una sola vez
+        for surf in [self.main.fondo_img, *self.main.spawner_icons.values(), *self.main.powerup_icons.values()]:
+            self.backend.upload(surf)
+        self.shield_effect = ShieldEffect(self.config["tam"]//2 + 10)
+        # Letras más amenazadas (las que muestran el anillo del escudo), mantenidas en _update_state
+        self.endangered = EndangeredTracker(self.game_options.get("shield_targets", 1))
         
         # Managers
-        self.powerup_manager = PowerUp()
-        self.keyboard_manager = KeyboardLayoutManager()
+        self.powerup_manager = PowerUp(clock=self.game_clock, scheduler=self.scheduler)
+        # Efectos mejorados (congelador, imán, multiplicador, vida extra, bomba): se componen por fotograma
+        self.effects = EnhancedPowerUpManager(self.scheduler, self.main.ANCHO, self.main.ALTO)
+        self.keyboard_manager = KeyboardLayoutManager(rng=self.rng)
         self.player_managers = {}
+        self.input_manager = InputManager()
+        # Estadísticas de la aplicación (JuegoATH.stats_manager): la sesión empieza de cero
+        self.stats_manager = self.main.stats_manager
+        self.stats_manager.reset_session()
 
         # Estado del Juego
         self.letras_en_pantalla = []
+        self.letter_grid = SpatialHash(SPATIAL_CELL_SIZE)  # id(letra) -> posición de su nave
+        self._letter_grid_dirty = False  # Las letras se movieron desde la última sincronización
         self.jugadores = {}
         
-        # Lógica de Velocidad y Niveles
-        self.level_data = {
-            1: {"threshold": 0, "speed": 2.0},
-            2: {"threshold": 30, "speed": 2.5},
-            3: {"threshold": 80, "speed": 3.0},
-            4: {"threshold": 150, "speed": 3.5}
-        }
+        # Lógica de Velocidad y Niveles: curva de levels.json (umbrales, velocidad y apariciones por nivel).
+        # El modo infinito usa una curva con niveles procedurales sin fin.
+        self.level_curve = LevelCurve.load(self.game_options.get("curva_niveles", DEFAULT_CURVE))
+        self.total_aciertos = 0  # Aciertos de todos los jugadores, acumulados en cada acierto
         self.nivel_actual = 1
-        self.velocidad = self.level_data[1]["speed"]
+        self._next_level_at = self.level_curve.next_threshold(1)
+        self.velocidad = self.level_curve.get(1)["speed"]
         self.target_speed = 0
         self.hits_since_levelup = 0
         self.hits_for_increment = 0
@@ -59,32 +109,34 @@ class GameSession:
         self.nivel_mostrado = False
         self.tiempo_mostrar_nivel = 0
         self.duracion_mensaje_nivel = 2
+        # Línea de tiempo de apariciones (1 jugador): flujo según el nivel, oleadas y tope de letras
+        self.spawner = SpawnScheduler(self.game_clock, self.rng, self._spawn_rate)
+        # Dificultad adaptativa (1 jugador): ajusta velocidad, ritmo de apariciones y letras cada segundo
+        adaptativa = self.game_options.get("dificultad_adaptativa", self.game_options["num_jugadores"] == 1)
+        self.difficulty = DifficultyController() if adaptativa else None
+        self._apply_level_spawning()
 
         # Timers y Flags
         self.run_flag = True
-        self.tiempo_inicio_juego = time.time()
-        self.tiempo_pausado_total = 0
-        self.tiempo_transcurrido_cargado = 0
+        self.tiempo_transcurrido = 0
         
         if initial_state:
-            self._load_state(initial_state)
+            self._load_state(initial_state, show_countdown)
         else:
             self._setup_new_game()
-            self.main.mostrar_conteo_regresivo(3, self.fuente_letras, self.config["color"])
-            self.tiempo_inicio_juego = time.time()
+            if show_countdown: self.main.mostrar_conteo_regresivo(3, self.fuente_letras, self.config["color"])
         
         self._calculate_gradual_speed_steps()
 
     def _calculate_gradual_speed_steps(self):
         next_level = self.nivel_actual + 1
-        if next_level not in self.level_data:
+        if not self.level_curve.has_level(next_level):
             self.hits_for_increment = 0; return
 
-        next_level_info = self.level_data[next_level]
+        next_level_info = self.level_curve.get(next_level)
         self.target_speed = next_level_info["speed"]
         
-        total_aciertos_actual = sum(m.get_aciertos() for m in self.player_managers.values())
-        hits_to_next_level = next_level_info["threshold"] - total_aciertos_actual
+        hits_to_next_level = next_level_info["threshold"] - self.total_aciertos
         speed_diff = self.target_speed - self.velocidad
         
         if speed_diff <= 0.01:
@@ -98,13 +150,14 @@ class GameSession:
 
     def _spawn_new_letters(self, count=1):
         if self.game_options["num_jugadores"] != 1: return
-        for _ in range(count):
-            char = self.keyboard_manager.obtener_nueva_letra(player_id="J1", num_jugadores=1)
+        for char in self.keyboard_manager.next_n(count, player_id="J1", num_jugadores=1):
             spawn_type = 'top'
             if self.nivel_actual >= 3:
-                spawn_type = random.choice(['top', 'top', 'left', 'right'])
+                spawn_type = self.rng.choice(['top', 'top', 'left', 'right'])
 
-            letra = {'char': char, 'color': self.config["color"], 'anim_offset': random.uniform(0, 2 * math.pi)}
+            letra = {'char': char, 'color': self.config["color"], 'anim_offset': self.rng.uniform(0, 2 * math.pi),
+                     'spawn_t': self.frame_now}
+            velocidad = self._letter_speed()
             letra['icon_active'] = True
 
             icon_surface = None
@@ -120,21 +173,30 @@ class GameSession:
                 icon_surface = self.main.spawner_icons['nave']
 
             if spawn_type == 'left':
+                icon_x = -icon_surface.get_width()
                 letra.update({
-                    'icon_x': -icon_surface.get_width(), 'icon_y': random.randint(50, self.main.ALTO - 150),
-                    'icon_vx': self.velocidad * 0.75, 'icon_vy': self.velocidad * 0.1
+                    'icon_x': icon_x, 'icon_y': self._pick_spawn_position(lambda: (icon_x, self.rng.randint(50, self.main.ALTO - 150)))[1],
+                    'icon_vx': velocidad * 0.75, 'icon_vy': velocidad * 0.1
                 })
             elif spawn_type == 'right':
+                icon_x = self.main.ANCHO + icon_surface.get_width()
                 letra.update({
-                    'icon_x': self.main.ANCHO + icon_surface.get_width(), 'icon_y': random.randint(50, self.main.ALTO - 150),
-                    'icon_vx': -self.velocidad * 0.75, 'icon_vy': self.velocidad * 0.1
+                    'icon_x': icon_x, 'icon_y': self._pick_spawn_position(lambda: (icon_x, self.rng.randint(50, self.main.ALTO - 150)))[1],
+                    'icon_vx': -velocidad * 0.75, 'icon_vy': velocidad * 0.1
                 })
             else:
+                icon_y = -icon_surface.get_height()
                 letra.update({
-                    'icon_x': random.randint(self.config["tam"], self.main.ANCHO - self.config["tam"]), 'icon_y': -icon_surface.get_height(),
-                    'icon_vx': 0, 'icon_vy': self.velocidad
+                    'icon_x': self._pick_spawn_position(lambda: (self.rng.randint(self.config["tam"], self.main.ANCHO - self.config["tam"]), icon_y))[0],
+                    'icon_y': icon_y, 'icon_vx': 0, 'icon_vy': velocidad
                 })
 
+            if spawn_type != 'top':
+                # Orientar la nave lateral según su velocidad (variante pre-calculada)
+                letra['icon_heading'] = self.main.spawner_variants.index_for_velocity(letra['icon_vx'], letra['icon_vy'])
+                letra['icon_mirrored'] = letra['icon_vx'] < 0
+                icon_surface = self._spawner_surface(letra)
+
             distancia_remolque = 20
             if letra['icon_type'] == 'nave':
                 letra['letter_x'] = letra['icon_x']
@@ -147,66 +209,213 @@ class GameSession:
                     letra['letter_x'] = letra['icon_x'] - icon_surface.get_width() / 2 - distancia_remolque
             
             self.letras_en_pantalla.append(letra)
+            self.letter_grid.insert(id(letra), letra['icon_x'], letra['icon_y'], letra)
+            self.endangered.offer(letra, letter_danger(letra, self.main.ANCHO, self.main.ALTO))
+            if self.recorder: self.recorder.record_spawn(letra)
+
+    def _pick_spawn_position(self, sample):
+        """
+        Muestreo por rechazo: 'sample()' propone una posición de nave (usa self.rng); se toma la
+        primera sin naves cerca o, tras SPAWN_ATTEMPTS intentos, la menos concurrida.
+        """
+        self._sync_letter_grid()
+        best, best_crowd = None, None
+        for _ in range(SPAWN_ATTEMPTS):
+            x, y = sample()
+            crowd = self.letter_grid.count_within(x, y, SPAWN_CLEARANCE)
+            if crowd == 0: return x, y
+            if best is None or crowd < best_crowd: best, best_crowd = (x, y), crowd
+        return best
+
+    def _remove_letter(self, letra):
+        self.letras_en_pantalla.remove(letra); self.letter_grid.remove(id(letra)); self.endangered.discard(letra)
+
+    def _sync_letter_grid(self):
+        """
+        Lleva a la rejilla las posiciones actuales antes de una consulta. Las altas y bajas son
+        inmediatas; los movimientos se aplican aquí (O(1) por letra) y solo en los fotogramas que
+        consultan, en lugar de en cada paso de movimiento.
+        """
+        if self._letter_grid_dirty:
+            move = self.letter_grid.move
+            for letra in self.letras_en_pantalla: move(id(letra), letra['icon_x'], letra['icon_y'])
+            self._letter_grid_dirty = False
+
+    def _rebuild_letter_grid(self):
+        """Re-indexa las letras tras sustituir el almacén (carga de partidas, keyframes)."""
+        self.letter_grid.clear()
+        for letra in self.letras_en_pantalla:
+            self.letter_grid.insert(id(letra), letra['icon_x'], letra['icon_y'], letra)
+        self._letter_grid_dirty = False
+
+    def _spawn_rate(self, now):
+        """Curva de ritmo del flujo de apariciones: letras por segundo del nivel actual (por el factor de dificultad)."""
+        rate = self.level_curve.get(self.nivel_actual)["spawn_rate"]
+        return rate * self.difficulty.factor if self.difficulty else rate
+
+    def _letter_speed(self):
+        """Velocidad de las letras nuevas: la del nivel por el factor de dificultad adaptativa."""
+        return self.velocidad * self.difficulty.factor if self.difficulty else self.velocidad
+
+    def _apply_difficulty(self):
+        """Tras un ajuste del controlador: reparto de letras según el factor (solo si cambia)."""
+        weights = self.difficulty.letter_weights(self.keyboard_manager.all_game_letters)
+        if weights != self.difficulty.weights:
+            self.keyboard_manager.set_weights(weights)
+            self.difficulty.weights = weights
+
+    def _apply_level_spawning(self):
+        self._next_level_at = self.level_curve.next_threshold(self.nivel_actual)
+        info = self.level_curve.get(self.nivel_actual)
+        self.spawner.max_letters, self.spawner.min_letters = info["max_letras"], info["min_letras"]
+
+    def _spawner_surface(self, letra):
+        """Sprite de la nave de una letra: la orientación guardada en 'icon_heading'/'icon_mirrored' o el icono de su tipo."""
+        heading = letra.get('icon_heading')
+        if heading is None:
+            return self.main.spawner_icons[letra['icon_type']]
+        # Partidas guardadas antes de 'icon_mirrored': se deduce de la velocidad
+        return self.main.spawner_variants.get(heading, mirrored=letra.get('icon_mirrored', letra['icon_vx'] < 0))
 
     def _setup_new_game(self):
         if self.game_options["num_jugadores"] == 1:
             self.player_managers["J1"] = ScoreManager()
             self.letras_en_pantalla = []
             self._spawn_new_letters(count=1)
+            self.spawner.start()
         else:
             self.player_managers["J1"] = ScoreManager(); self.player_managers["J2"] = ScoreManager()
             self.jugadores = {"J1": {"color": self.main.VERDE}, "J2": {"color": self.main.AMARILLO}}
             self.current_turn_player = "J1"
             self.active_letter = self.keyboard_manager.obtener_nueva_letra(player_id="J1", num_jugadores=2)
+            self.active_letter_spawn_t = self.frame_now
             self.active_letter_y = 0
-            self.active_letter_x = random.randint(self.config["tam"], self.main.ANCHO // 2 - self.config["tam"])
+            self.active_letter_x = self.rng.randint(self.config["tam"], self.main.ANCHO // 2 - self.config["tam"])
             
-    def _load_state(self, state):
+    def _load_state(self, state, show_countdown=True):
         self.velocidad = state.get("velocidad", self.game_options["initial_speed"])
-        self.tiempo_transcurrido_cargado = state.get("tiempo_transcurrido", 0)
-        self.keyboard_manager = KeyboardLayoutManager.from_dict(state.get("keyboard_layout_manager", {}))
-        self.powerup_manager.activos = state.get("power_ups_activos", {})
+        self.nivel_actual = state.get("nivel_actual", 1); self._apply_level_spawning()
+        self.game_clock.reset(state.get("tiempo_transcurrido", 0)); self.tiempo_transcurrido = self.game_clock.now
+        self.keyboard_manager = KeyboardLayoutManager.from_dict(state.get("keyboard_layout_manager", {}), rng=self.rng)
+        power_ups = state.get("power_ups_activos", {})
+        self.powerup_manager.load_dict(power_ups)
+        # Las partidas antiguas aplicaban 'ralentizar' dividiendo la velocidad
+        if "restante" not in power_ups.get("ralentizar", {"restante": 0}): self.velocidad *= 2
+        self._apply_time_scale()
+        self.effects.load_dict(state.get("efectos", {}))
         self.player_managers["J1"] = ScoreManager.from_dict(state.get("score_manager_j1", {}))
         if self.game_options["num_jugadores"] == 2: self.player_managers["J2"] = ScoreManager.from_dict(state.get("score_manager_j2", {}))
-        if self.game_options["num_jugadores"] == 1: self.letras_en_pantalla = state.get("letras_en_pantalla", [])
+        if self.game_options["num_jugadores"] == 1:
+            self.letras_en_pantalla = state.get("letras_en_pantalla", [])
+            # Los instantes de aparición son del reloj de juego, que se restaura con la partida;
+            # las partidas anteriores no los guardaban: cuentan desde la carga
+            for letra in self.letras_en_pantalla: letra.pop('spawn_ms', None); letra.setdefault('spawn_t', self.game_clock.now)
+            self._rebuild_endangered(); self._rebuild_letter_grid()
+            self.spawner.load_dict(state.get("spawner", {}))
         else:
             self.jugadores = {"J1": {"color": self.main.VERDE}, "J2": {"color": self.main.AMARILLO}}
             self.current_turn_player = state.get("current_turn_player", "J1")
             self.active_letter = state.get("active_letter"); self.active_letter_x = state.get("active_letter_x"); self.active_letter_y = state.get("active_letter_y")
+            self.active_letter_spawn_t = state.get("active_letter_spawn_t", self.game_clock.now)
+        self.total_aciertos = sum(m.get_aciertos() for m in self.player_managers.values())
+        if self.difficulty: self.difficulty.load_dict(state.get("dificultad", {}), self.game_clock.now)
         if self.powerup_manager.esta_activo("doble_puntuacion"):
             for manager in self.player_managers.values(): manager.activate_double_score()
-        self.main.mostrar_conteo_regresivo(3, self.fuente_letras, self.config["color"])
-        self.tiempo_inicio_juego = time.time()
+        if show_countdown: self.main.mostrar_conteo_regresivo(3, self.fuente_letras, self.config["color"])
+
+    def _rebuild_endangered(self):
+        self.endangered.begin()
+        for letra in self.letras_en_pantalla:
+            self.endangered.offer(letra, letter_danger(letra, self.main.ANCHO, self.main.ALTO))
 
     def _create_save_state(self):
-        tiempo_transcurrido = (time.time()-self.tiempo_inicio_juego-self.tiempo_pausado_total)+self.tiempo_transcurrido_cargado
-        state = {"velocidad": self.velocidad, "tiempo_transcurrido": tiempo_transcurrido,
+        # Todos los tiempos se guardan relativos al reloj de juego (segundos jugados, segundos restantes)
+        state = {"velocidad": self.velocidad, "tiempo_transcurrido": self.game_clock.now, "nivel_actual": self.nivel_actual,
+                 "curva_niveles": self.game_options.get("curva_niveles", DEFAULT_CURVE),
                  "fallos_limit": self.game_options["fallos_limit"], "score_manager_j1": self.player_managers["J1"].to_dict(),
-                 "keyboard_layout_manager": self.keyboard_manager.to_dict(), "power_ups_activos": self.powerup_manager.activos}
-        if self.game_options["num_jugadores"] == 1: state["letras_en_pantalla"] = self.letras_en_pantalla
+                 "keyboard_layout_manager": self.keyboard_manager.to_dict(), "power_ups_activos": self.powerup_manager.to_dict(),
+                 "efectos": self.effects.to_dict()}
+        if self.game_options["num_jugadores"] == 1: state.update({"letras_en_pantalla": self.letras_en_pantalla, "spawner": self.spawner.to_dict()})
         else: state.update({"score_manager_j2": self.player_managers["J2"].to_dict(), "time_limit_seconds": self.game_options["time_limit_seconds"],
                               "current_turn_player": self.current_turn_player, "active_letter": self.active_letter,
-                              "active_letter_x": self.active_letter_x, "active_letter_y": self.active_letter_y})
+                              "active_letter_x": self.active_letter_x, "active_letter_y": self.active_letter_y,
+                              "active_letter_spawn_t": self.active_letter_spawn_t})
+        if self.difficulty: state["dificultad"] = self.difficulty.to_dict(self.game_clock.now)
         return state
 
+    def _create_keyframe_state(self):
+        """ Estado completo para un keyframe de grabación: el de guardado más todo lo necesario para re-simular. """
+        state = self._create_save_state()
+        state.update({"rng": self.rng.getstate(), "nivel_actual": self.nivel_actual, "target_speed": self.target_speed,
+                      "hits_since_levelup": self.hits_since_levelup, "hits_for_increment": self.hits_for_increment,
+                      "nivel_mostrado": self.nivel_mostrado, "tiempo_mostrar_nivel": self.tiempo_mostrar_nivel,
+                      "game_clock": self.game_clock.to_dict(),
+                      # Instantes exactos del reloj: al reconstruir desde 'restante' la re-simulación podría diferir en redondeo
+                      "power_ups_reloj": self.powerup_manager.activos, "efectos_reloj": self.effects.snapshot(),
+                      "spawner_reloj": self.spawner.snapshot()})
+        if self.difficulty: state["dificultad_reloj"] = self.difficulty.snapshot()
+        return state
+
+    def _restore_keyframe_state(self, state):
+        """ Restaura un keyframe creado por _create_keyframe_state (reproducción de grabaciones). """
+        self._load_state(state, show_countdown=False)
+        version, internal, gauss = state["rng"]; self.rng.setstate((version, tuple(internal), gauss))
+        for key in ("nivel_actual", "target_speed", "hits_since_levelup", "hits_for_increment", "nivel_mostrado",
+                    "tiempo_mostrar_nivel"):
+            setattr(self, key, state[key])
+        self._apply_level_spawning()
+        self.game_clock.load_dict(state["game_clock"])
+        self.powerup_manager.restore(state["power_ups_reloj"])
+        self.effects.restore(state["efectos_reloj"])
+        if self.game_options["num_jugadores"] == 1:
+            self.spawner.restore(state["spawner_reloj"])
+            for letra in self.letras_en_pantalla: letra['color'] = tuple(letra['color'])
+        if self.difficulty: self.difficulty.restore(state["dificultad_reloj"])
+
+    @property
+    def frame_now(self):
+        """Instante del fotograma en curso en el reloj de juego (segundos jugados)."""
+        return self.game_clock.now
+
+    def _begin_frame(self, dt_ms, now=None):
+        """
+        Muestrea el reloj una vez por fotograma; toda la lógica del fotograma usa este instante.
+        'now' (reproducción de grabaciones) fija el instante grabado. Retorna el paso escalado en segundos.
+        """
+        dt = self.game_clock.tick(dt_ms / 1000.0)
+        if now is not None: self.game_clock.now = now
+        return dt
+
+    def _apply_time_scale(self):
+        """Escala de tiempo de la simulación según los power-ups activos ('ralentizar' = cámara lenta).
+        Las escalas por grupo (congelador) las mantiene self.effects en el mismo reloj."""
+        self.game_clock.set_time_scale(0.5 if self.powerup_manager.esta_activo("ralentizar") else 1.0)
+
     def _handle_pause(self):
-        tiempo_inicio_pausa = time.time()
+        self.game_clock.pause()
         accion_pausa = self.main.pantalla_de_pausa()
-        self.tiempo_pausado_total += time.time() - tiempo_inicio_pausa
+        self.game_clock.resume()
+        # El reloj de pygame no se avanzó durante la pausa: descartar ese intervalo para que el
+        # siguiente fotograma no lo cuente como tiempo de juego (el dt explícito ignora resume())
+        self.clock.tick()
         if accion_pausa == "guardar_y_salir":
             self.main.guardar_partida(self._create_save_state(), self.game_mode, self.save_timestamp)
             self.run_flag = False; return "menu_principal"
         elif accion_pausa == "salir_sin_guardar":
             self.run_flag = False; return "menu_principal"
-        elif accion_pausa == "reanudar":
-            tiempo_actual = time.time(); self.tiempo_transcurrido_cargado += (tiempo_actual - self.tiempo_inicio_juego - self.tiempo_pausado_total)
-            self.tiempo_inicio_juego = tiempo_actual; self.tiempo_pausado_total = 0
 
     def _handle_events(self):
-        for evento in pygame.event.get():
+        for evento, stroke in self.input_manager.poll():
             if evento.type == pygame.QUIT: self.run_flag = False; return "quit"
-            if self.btn_pausa.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE): return self._handle_pause()
-            if evento.type == pygame.KEYDOWN and pygame.K_a <= evento.key <= pygame.K_z: self._handle_keypress(pygame.key.name(evento.key).upper())
+            if self.btn_pausa.handle_event(evento) or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
+                resultado = self._handle_pause()
+                # Tras reanudar, los tiempos de la sesión cambian: re-sincronizar la grabación
+                if resultado is None and self.recorder: self.recorder.record_keyframe(self._create_keyframe_state(), seekable=False)
+                return resultado
+            if stroke:
+                if self.recorder: self.recorder.record_key(stroke.letter, stroke.timestamp)
+                self.main.display_manager.mark_input(stroke.timestamp)
+                self._handle_keypress(stroke.letter)
         return None
 
     def _handle_keypress(self, typed_letter):
@@ -227,29 +436,38 @@ class GameSession:
         for letra in self.letras_en_pantalla:
             if typed_letter == letra['char']: letra_acertada = letra; break
         if letra_acertada:
-            j1_manager.add_score(); self.main.acierto_sound.play()
+            # Reacción en segundos de juego: no cuenta la pausa ni la cuenta regresiva y se re-simula igual
+            reaccion = reaction_time(letra_acertada.get('spawn_t'), self.frame_now)
+            self.stats_manager.record_keystroke(typed_letter, True, reaccion)
+            j1_manager.add_score(self.effects.frame().score_multiplier); self.total_aciertos += 1; self.main.acierto_sound.play()
+            if self.difficulty: self.difficulty.record_hit(letra_acertada['char'], reaccion)
             
             self.main.crear_particulas(letra_acertada["letter_x"], letra_acertada["letter_y"], letra_acertada["color"])
             
-            self.letras_en_pantalla.remove(letra_acertada)
-            if not self.letras_en_pantalla:
-                self._spawn_new_letters(count=2 if self.nivel_actual >= 3 else 1)
+            self._remove_letter(letra_acertada)
             if j1_manager.get_aciertos()%10==0 and not self.powerup_manager.activos: self._spawn_powerup()
             return True
-        else: self._handle_miss(j1_manager); return False
+        else:
+            self.stats_manager.record_keystroke(typed_letter, False)
+            if self.difficulty: self.difficulty.record_miss()
+            self._handle_miss(j1_manager); return False
 
     def _handle_keypress_j2(self, typed_letter):
         current_manager = self.player_managers[self.current_turn_player]
         if typed_letter == self.active_letter:
-            current_manager.add_score(); self.main.acierto_sound.play()
+            self.stats_manager.record_keystroke(typed_letter, True, reaction_time(self.active_letter_spawn_t, self.frame_now))
+            current_manager.add_score(self.effects.frame().score_multiplier); self.total_aciertos += 1; self.main.acierto_sound.play()
             if current_manager.get_aciertos()%10==0 and not self.powerup_manager.activos: self._spawn_powerup()
             self.current_turn_player = "J2" if self.current_turn_player == "J1" else "J1"
             self.active_letter = self.keyboard_manager.obtener_nueva_letra(player_id=self.current_turn_player, num_jugadores=2)
+            self.active_letter_spawn_t = self.frame_now
             self.active_letter_y = 0; margen = self.config["tam"]
-            if self.current_turn_player == "J1": self.active_letter_x = random.randint(margen, self.main.ANCHO//2-margen)
-            else: self.active_letter_x = random.randint(self.main.ANCHO//2+margen, self.main.ANCHO-margen)
+            if self.current_turn_player == "J1": self.active_letter_x = self.rng.randint(margen, self.main.ANCHO//2-margen)
+            else: self.active_letter_x = self.rng.randint(self.main.ANCHO//2+margen, self.main.ANCHO-margen)
             return True
-        else: self._handle_miss(current_manager); return False
+        else:
+            self.stats_manager.record_keystroke(typed_letter, False)
+            self._handle_miss(current_manager); return False
 
     def _handle_miss(self, manager):
         shielded_hit = self.powerup_manager.esta_activo("escudo")
@@ -258,39 +476,76 @@ class GameSession:
         elif not shielded_hit and self.main.fallo_sound: self.main.fallo_sound.play()
             
     def _spawn_powerup(self):
-        effects = {"ralentizar": {"d": 10, "s": self.main.powerup_activate_sound, "e": lambda: setattr(self, 'velocidad', self.velocidad/2)},
+        effects = {"ralentizar": {"d": 10, "s": self.main.powerup_activate_sound, "e": self._apply_time_scale},
                    "escudo": {"d": 10, "s": self.main.powerup_activate_sound, "e": None},
                    "doble_puntuacion": {"d": 5, "s": self.main.double_score_activate_sound, "e": lambda: [m.activate_double_score() for m in self.player_managers.values()]}}
-        tipo = random.choice(list(effects.keys())); info = effects[tipo]
+        # Los originales reparten su peso; el resto son efectos mejorados (enhanced_powerups.py)
+        weights = {tipo: ORIGINAL_SPAWN_WEIGHT / len(effects) for tipo in effects}
+        weights.update(self.effects.spawn_weights(with_letters=self.game_options["num_jugadores"] == 1))
+        tipo = self.rng.choices(list(weights), list(weights.values()))[0]
+        if tipo not in effects:
+            self.effects.activar(tipo)
+            if self.main.powerup_activate_sound: self.main.powerup_activate_sound.play()
+            return
+        info = effects[tipo]
         self.powerup_manager.activar(tipo, info["d"])
         if info["s"]: info["s"].play()
         if info["e"]: info["e"]()
 
+    def _area_clear(self, effect):
+        """Fin de la bomba: elimina de una pasada las letras dentro del radio y las puntúa en bloque."""
+        if self.game_options["num_jugadores"] != 1: return
+        params = effect.params; radio = params["radio"]
+        if radio is None: removed = list(self.letras_en_pantalla)
+        else:
+            # Consulta en la rejilla (naves a menos de radio + TOW_REACH) y filtro exacto por la posición de la letra
+            self._sync_letter_grid()
+            cercanas = self.letter_grid.query(params["x"], params["y"], radio + TOW_REACH)
+            removed = letters_in_radius(cercanas, (params["x"], params["y"]), radio)
+        remove_letters(self.letras_en_pantalla, removed)
+        for letra in removed:
+            self.letter_grid.remove(id(letra)); self.endangered.discard(letra)
+            self.main.crear_particulas(letra["letter_x"], letra["letter_y"], letra["color"])
+        if removed:
+            self.player_managers["J1"].award_batch(len(removed), params["puntos_por_letra"], self.effects.frame().score_multiplier)
+
     def _update_state(self, dt):
-        tiempo_actual = time.time()
-        self.tiempo_transcurrido = (tiempo_actual-self.tiempo_inicio_juego-self.tiempo_pausado_total)+self.tiempo_transcurrido_cargado
+        tiempo_actual = self.frame_now
+        self.tiempo_transcurrido = tiempo_actual
         terminados = self.powerup_manager.actualizar()
         for tipo in terminados:
-            if tipo == "ralentizar": self.velocidad *= 2
+            if tipo == "ralentizar": self._apply_time_scale()
             elif tipo == "doble_puntuacion": [m.deactivate_double_score() for m in self.player_managers.values()]
+        for effect in self.effects.actualizar():
+            if effect.tipo == "bomba_tiempo": self._area_clear(effect)
+        frame = self.effects.frame()
+        # Paso de movimiento de las letras: el congelador pone su grupo a escala 0 sin tocar sus velocidades
+        motion_dt = dt * self.game_clock.group_scale(GROUP_LETTERS)
         
-        total_aciertos = sum(m.get_aciertos() for m in self.player_managers.values())
+        # Un fotograma sin cambio de nivel solo compara el total con el siguiente umbral; al cruzarlo, bisect
         nuevo_nivel = self.nivel_actual
-        for level, data in sorted(self.level_data.items(), reverse=True):
-            if total_aciertos >= data["threshold"]: nuevo_nivel = level; break
+        if self.total_aciertos >= self._next_level_at: nuevo_nivel = self.level_curve.level_for(self.total_aciertos)
         if nuevo_nivel != self.nivel_actual:
             self.nivel_actual = nuevo_nivel; self.nivel_mostrado = True
-            self.tiempo_mostrar_nivel = time.time(); self.hits_since_levelup = 0
-            self._calculate_gradual_speed_steps()
-        if self.nivel_mostrado and (time.time()-self.tiempo_mostrar_nivel > self.duracion_mensaje_nivel): self.nivel_mostrado = False
+            self.tiempo_mostrar_nivel = tiempo_actual; self.hits_since_levelup = 0
+            self._calculate_gradual_speed_steps(); self._apply_level_spawning()
+            # Oleada del nuevo nivel, repartida tras el mensaje de nivel
+            oleada = self.level_curve.get(nuevo_nivel)["oleada"]
+            if oleada and self.game_options["num_jugadores"] == 1:
+                self.spawner.wave(oleada, WAVE_DURATION, at=tiempo_actual + self.duracion_mensaje_nivel)
+        if self.nivel_mostrado and (tiempo_actual-self.tiempo_mostrar_nivel > self.duracion_mensaje_nivel): self.nivel_mostrado = False
+        if self.difficulty and self.difficulty.update(tiempo_actual): self._apply_difficulty()
         
         if self.game_options["num_jugadores"] == 1:
+            self.endangered.begin(); ancho, alto = self.main.ANCHO, self.main.ALTO
+            if frame.attractors and motion_dt: apply_attraction(self.letras_en_pantalla, frame.attractors, 60 * motion_dt, frame.max_pull)
+            self._letter_grid_dirty = True
             for letra in list(self.letras_en_pantalla):
-                letra['icon_x'] += letra['icon_vx'] * 60 * dt
-                letra['icon_y'] += letra['icon_vy'] * 60 * dt
+                letra['icon_x'] += letra['icon_vx'] * 60 * motion_dt
+                letra['icon_y'] += letra['icon_vy'] * 60 * motion_dt
 
                 if letra['icon_active']:
-                    icon_surface = self.main.spawner_icons[letra['icon_type']]
+                    icon_surface = self._spawner_surface(letra)
                     distancia_remolque = 20
                     easing_factor = 0.1
                     
@@ -310,44 +565,70 @@ class GameSession:
                 
                 if (letra['icon_y'] > self.main.ALTO + 50 or letra['icon_x'] > self.main.ANCHO + 100 or letra['icon_x'] < -100):
                     self._handle_miss(self.player_managers["J1"])
-                    self.letras_en_pantalla.remove(letra)
-                    if not self.letras_en_pantalla:
-                        self._spawn_new_letters(count=2 if self.nivel_actual >= 3 else 1)
+                    if self.difficulty: self.difficulty.record_escape(letra['char'])
+                    self._remove_letter(letra)
+                else:
+                    self.endangered.offer(letra, letter_danger(letra, ancho, alto))
+            # Apariciones vencidas en la línea de tiempo (como mucho max_per_frame por fotograma)
+            nuevas = self.spawner.due(len(self.letras_en_pantalla), tiempo_actual)
+            if nuevas: self._spawn_new_letters(count=nuevas)
         else:
-            self.active_letter_y += self.velocidad * 60 * dt
+            self.active_letter_y += self.velocidad * 60 * motion_dt
             if self.active_letter_y > self.main.ALTO:
                 self._handle_miss(self.player_managers[self.current_turn_player])
                 self.current_turn_player = "J2" if self.current_turn_player == "J1" else "J1"
                 self.active_letter = self.keyboard_manager.obtener_nueva_letra(player_id=self.current_turn_player, num_jugadores=2)
+                self.active_letter_spawn_t = self.frame_now
                 self.active_letter_y = 0; margen = self.config["tam"]
-                if self.current_turn_player == "J1": self.active_letter_x = random.randint(margen, self.main.ANCHO//2-margen)
-                else: self.active_letter_x = random.randint(self.main.ANCHO//2+margen, self.main.ANCHO-margen)
+                if self.current_turn_player == "J1": self.active_letter_x = self.rng.randint(margen, self.main.ANCHO//2-margen)
+                else: self.active_letter_x = self.rng.randint(self.main.ANCHO//2+margen, self.main.ANCHO-margen)
         
         if self.game_options.get("time_limit_seconds",0)>0 and self.tiempo_transcurrido >= self.game_options["time_limit_seconds"]: self.run_flag=False
-        if any(m.get_fallos() >= self.game_options.get("fallos_limit",999) for m in self.player_managers.values()): self.run_flag=False
+        fallos_limit = self.game_options.get("fallos_limit",999) + self.effects.fallos_budget
+        if any(m.get_fallos() >= fallos_limit for m in self.player_managers.values()): self.run_flag=False
             
+    def _letter_surface(self, char, color):
+        """Superficie de una letra del juego; se renderiza una vez por (letra, color)."""
+        key = (char, tuple(color))
+        surf = self._glyph_cache.get(key)
+        if surf is None:
+            surf = self._glyph_cache[key] = self.fuente_letras.render(char, color)[0]
+            self.backend.upload(surf)
+        return surf
+
     def _draw_elements(self):
-        self.pantalla.blit(self.main.fondo_img, (0, 0)); self.main.dibujar_estrellas(1)
-        if self.game_options["num_jugadores"] == 2: pygame.draw.line(self.pantalla, self.main.BLANCO, (self.main.ANCHO // 2, 0), (self.main.ANCHO // 2, self.main.ALTO), 2)
+        # Superficie para el dibujo inmediato del fotograma (la pantalla, o la capa del motor SDL2)
+        self.pantalla = self.backend.begin_frame()
+        queue = self.render_queue
+        queue.submit(LAYER_BACKGROUND, self.main.fondo_img, (0, 0)); self.main.dibujar_estrellas(60 * self.game_clock.group_dt(GROUP_STARS), queue)
         
-        tiempo_actual = time.time(); anim_amplitud = 15; anim_frecuencia = 5
+        tiempo_actual = self.frame_now; anim_amplitud = 15; anim_frecuencia = 5
+        particle_step = 60 * self.game_clock.group_dt(GROUP_PARTICLES)  # Fotogramas de 60 FPS de las partículas
         if self.game_options["num_jugadores"] == 1:
+            spawners, letters = queue.layers[LAYER_SPAWNERS], queue.layers[LAYER_LETTERS]
             for letra in self.letras_en_pantalla:
-                icon_surface = self.main.spawner_icons[letra['icon_type']]
+                icon_surface = self._spawner_surface(letra)
                 icon_rect = icon_surface.get_rect(center=(letra['icon_x'], letra['icon_y']))
-                self.pantalla.blit(icon_surface, icon_rect)
+                spawners.append((icon_surface, icon_rect))
 
-                letra_surf, letra_rect = self.fuente_letras.render(letra["char"], letra["color"])
-                letra_rect.center = (letra['letter_x'], letra['letter_y'])
-                self.pantalla.blit(letra_surf, letra_rect)
+                letra_surf = self._letter_surface(letra["char"], letra["color"])
+                letra_rect = letra_surf.get_rect(center=(letra['letter_x'], letra['letter_y']))
+                letters.append((letra_surf, letra_rect))
 
-                pygame.draw.line(self.pantalla, self.main.GRIS_CLARO, icon_rect.center, letra_rect.center, 2)
+                queue.add_tow_line(icon_rect.center, letra_rect.center)
+            self.main.actualizar_y_dibujar_particulas(queue, particle_step)
+            queue.flush(self.pantalla, self.backend)
 
         else:
+            queue.flush(self.pantalla, self.backend)
+            pygame.draw.line(self.pantalla, self.main.BLANCO, (self.main.ANCHO // 2, 0), (self.main.ANCHO // 2, self.main.ALTO), 2)
             desplazamiento_x_sin = math.sin(tiempo_actual * anim_frecuencia) * anim_amplitud
             self.fuente_letras.render_to(self.pantalla, (self.active_letter_x + desplazamiento_x_sin, self.active_letter_y), self.active_letter, self.jugadores[self.current_turn_player]["color"])
+            self.main.actualizar_y_dibujar_particulas(queue, particle_step)
+            queue.flush(self.pantalla, self.backend)
 
-        self.main.actualizar_y_dibujar_particulas(); self._draw_hud(); self._draw_shield_effect()
+        self._draw_bomb_countdown()
+        self._draw_hud(); self._draw_shield_effect()
         
         if self.nivel_mostrado:
             fuente_nivel = pygame.freetype.SysFont(self.main.FUENTE_LOGO_STYLE, int(60 + 10 * math.sin(tiempo_actual * 6)))
@@ -355,70 +636,67 @@ class GameSession:
             self.main.render_text_gradient(fuente_nivel, f"NIVEL {self.nivel_actual}", rect_nivel, self.pantalla, [self.main.AMARILLO, self.main.BLANCO], self.main.COLOR_CONTORNO, 3)
 
         self.btn_pausa.draw(self.pantalla)
-        pygame.display.flip()
+        self.backend.present()
+        self.main.display_manager.mark_present()
 
     def _draw_hud(self):
-        p1_color = self.config["color"] if self.game_options["num_jugadores"] == 1 else self.jugadores['J1']['color']
-        self.fuente_ui.render_to(self.pantalla, (10, 10), f"J1: {self.player_managers['J1'].get_score()} (Fallos: {self.player_managers['J1'].get_fallos()})", p1_color)
-        if self.game_options["num_jugadores"] == 2:
-            self.fuente_ui.render_to(self.pantalla, (self.main.ANCHO//2+10, 10), f"J2: {self.player_managers['J2'].get_score()} (Fallos: {self.player_managers['J2'].get_fallos()})", self.jugadores['J2']['color'])
-            pygame.draw.circle(self.pantalla, self.jugadores[self.current_turn_player]['color'], (self.main.ANCHO//4 if self.current_turn_player=='J1' else 3*self.main.ANCHO//4, 50), 10)
-        
-        if self.game_options["time_limit_seconds"] > 0:
-            tiempo_restante = max(0, self.game_options["time_limit_seconds"]-int(self.tiempo_transcurrido))
-            minutos, segundos = divmod(int(tiempo_restante), 60)
-            self.fuente_ui.render_to(self.pantalla, (self.main.ANCHO//2-70, 50), f"Tiempo: {minutos:02d}:{segundos:02d}", self.main.BLANCO)
-        
-        if self.game_options["num_jugadores"] == 1 and self.player_managers["J1"].get_racha() > 1:
-            racha = self.player_managers["J1"].get_racha(); combo_text = f"COMBO x{racha}"
-            combo_color = self.main.ROJO if racha>=20 else self.main.AMARILLO if racha>=10 else self.main.BLANCO
-            fuente_combo = pygame.freetype.SysFont("arial", 40)
-            texto_surf, texto_rect = fuente_combo.render(combo_text, combo_color)
-            offset_x = random.randint(-2, 2) if racha>=15 else 0; offset_y = random.randint(-2, 2) if racha>=15 else 0
-            pos_x = (self.main.ANCHO - texto_rect.width)//2+offset_x; pos_y = 20+offset_y
-            self.pantalla.blit(texto_surf, (pos_x, pos_y))
-
-        y_pu_hud = self.main.ALTO-self.main.icon_size-50; x_pu_hud = self.main.ANCHO-self.main.icon_size-50
-        for tipo in self.powerup_manager.activos:
-            self.pantalla.blit(self.main.powerup_icons[tipo], (x_pu_hud, y_pu_hud))
-            tiempo_restante_pu = int(self.powerup_manager.get_remaining_time(tipo))
-            font_time = pygame.freetype.SysFont("arial", 18)
-            time_surf, time_rect = font_time.render(f"{tiempo_restante_pu}s", self.main.BLANCO)
-            time_rect.midright = (x_pu_hud-5, y_pu_hud+self.main.icon_size//2); self.pantalla.blit(time_surf, time_rect)
-            y_pu_hud -= (self.main.icon_size + 10)
+        self.hud.draw(self.pantalla, self, self.backend)
+
+    def _draw_bomb_countdown(self):
+        """Anillo con el radio de cada bomba activa; parpadea más rápido al acercarse la explosión."""
+        for effect in self.effects.activos:
+            if effect.tipo != "bomba_tiempo" or effect.params["radio"] is None: continue
+            restante = max(0.0, effect.vencimiento - self.frame_now)
+            if math.sin(self.frame_now * (6 + 18 / (restante + 0.5))) < 0: continue
+            center = (int(effect.params["x"]), int(effect.params["y"]))
+            pygame.draw.circle(self.pantalla, self.main.ROJO, center, int(effect.params["radio"]), 2)
 
     def _draw_shield_effect(self):
-        letras_a_proteger = []
+        escudo_activo = self.powerup_manager.esta_activo("escudo")
         if self.game_options["num_jugadores"] == 1:
-            if self.letras_en_pantalla:
-                letra_mas_cercana = min(self.letras_en_pantalla, key=lambda l: (self.main.ALTO - l['icon_y']) if l.get('icon_vx', 0) == 0 else (self.main.ANCHO - l['icon_x'] if l.get('icon_vx', 0) > 0 else l['icon_x']))
-                letras_a_proteger.append(letra_mas_cercana)
+            self.shield_effect.draw_tracked(self.pantalla, self.endangered, self.frame_now, escudo_activo)
         else:
-            letras_a_proteger.append({'char': self.active_letter, 'x': self.active_letter_x, 'y': self.active_letter_y})
-
-        for letra in letras_a_proteger:
-            pos_x, pos_y = letra.get('letter_x', letra.get('x')), letra.get('letter_y', letra.get('y'))
-            letra_rect = self.fuente_letras.get_rect(letra['char']); letra_rect.center = (pos_x, pos_y)
-            radio_circulo = self.config["tam"]//2 + 10
-            if self.powerup_manager.esta_activo("escudo"):
-                alfa = int(100+155*(0.5+0.5*math.sin(time.time()*8))); color_escudo = (20, 200, 255, alfa)
-            else:
-                color_escudo = (50, 50, 50, 50)
-            shield_surf = pygame.Surface((radio_circulo*2, radio_circulo*2), pygame.SRCALPHA)
-            pygame.draw.circle(shield_surf, color_escudo, (radio_circulo, radio_circulo), radio_circulo, 3)
-            self.pantalla.blit(shield_surf, shield_surf.get_rect(center=letra_rect.center))
+            self.shield_effect.draw(self.pantalla, (self.active_letter_x, self.active_letter_y), self.frame_now, escudo_activo)
 
 
     def run(self):
         if self.main.music_loaded and not pygame.mixer.music.get_busy(): pygame.mixer.music.play(-1, 0.0)
+        if self.record_replay and self.recorder is None:
+            try: self.recorder = ReplayRecorder.for_session(self)
+            except OSError as e: print(f"No se pudo iniciar la grabación de la partida: {e}")
+        try:
+            resultado = self._run_loop()
+        finally:
+            if self.recorder: self.recorder.close()
+        if resultado: return resultado
+        return self._finish()
+
+    def _run_loop(self):
+        # Descartar el intervalo desde el último tick (menús, cuenta regresiva): no es tiempo de juego
+        self.clock.tick()
+        dt_ms = self.main.display_manager.tick(self.clock)
         while self.run_flag:
-            dt = self.clock.tick(60)/1000.0
+            dt = self._begin_frame(dt_ms)
+            if self.recorder:
+                if self.recorder.keyframe_due(): self.recorder.record_keyframe(self._create_keyframe_state())
+                self.recorder.record_frame(dt_ms, self.frame_now)
+            # La entrada se vacía al inicio del fotograma, antes de actualizar y dibujar. El tiempo de
+            # reacción se mide en el reloj de juego con la resolución del fotograma (frame_now); el
+            # instante de SDL de cada pulsación solo se usa para la latencia y la grabación.
             resultado_pausa = self._handle_events()
             if resultado_pausa == "quit": pygame.quit(); sys.exit()
             if resultado_pausa: return resultado_pausa
             self._update_state(dt)
             self._draw_elements()
+            dt_ms = self.main.display_manager.tick(self.clock)
+        return None
 
+    def _finish(self):
+        """ Fin de partida: sonidos, guardado de estadísticas y pantallas de resultados. """
+        self.main.display_manager.save()  # Persistir la latencia medida con estos ajustes
+        # Las estadísticas son de un jugador: en versus se mezclarían las pulsaciones de ambos
+        if self.game_options["num_jugadores"] == 1:
+            self.stats_manager.save_session_stats(self.game_mode, self.player_managers["J1"].get_score())
         if self.main.game_over_sound: self.main.game_over_sound.play()
         if self.main.music_loaded: pygame.mixer.music.stop()
         pygame.time.delay(1000)
@@ -0,0 +1,129 @@
+# hud.py
+"""
+Capa de HUD de la partida. Cada widget de texto guarda la última superficie
+renderizada y solo vuelve a rasterizar cuando cambia el valor enlazado
+(puntuación, fallos, racha, segundos restantes); en estado estable el HUD
+se reduce a una llamada a blits. La disposición se calcula una vez a partir
+de ANCHO/ALTO.
+"""
+
+import random
+
+import pygame
+import pygame.freetype
+
+
+class TextWidget:
+    """Texto cacheado: se re-renderiza solo si cambian el texto o el color."""
+
+    def __init__(self, font, color=(255, 255, 255)):
+        self.font = font
+        self.color = color
+        self._text = None
+        self._surface = None
+        self._rect = None
+
+    def set(self, text, color=None):
+        """Actualiza el valor mostrado. Retorna True si hubo que volver a renderizar."""
+        color = color or self.color
+        if text == self._text and color == self.color and self._surface is not None:
+            return False
+        self._text, self.color = text, color
+        self._surface, self._rect = self.font.render(text, color)
+        return True
+
+    @property
+    def size(self):
+        return self._rect.size if self._rect else (0, 0)
+
+    def draw(self, batch, pos):
+        """Añade a 'batch' el blit con la esquina superior izquierda en 'pos'."""
+        if self._surface is not None:
+            batch.append((self._surface, pos))
+
+    def draw_anchored(self, batch, **anchor):
+        """Añade a 'batch' el blit alineado por un atributo de Rect (p. ej. midright=(x, y))."""
+        if self._surface is not None:
+            batch.append((self._surface, self._surface.get_rect(**anchor)))
+
+
+class HUDLayout:
+    """Posiciones fijas del HUD, precalculadas para una resolución."""
+
+    def __init__(self, ancho, alto, icon_size):
+        self.ancho, self.alto, self.icon_size = ancho, alto, icon_size
+        self.j1_score = (10, 10)
+        self.j2_score = (ancho // 2 + 10, 10)
+        self.turn_indicator = {"J1": (ancho // 4, 50), "J2": (3 * ancho // 4, 50)}
+        self.timer = (ancho // 2 - 70, 50)
+        self.combo_top = 20
+        self.powerup_x = ancho - icon_size - 50
+        self.powerup_y0 = alto - icon_size - 50
+        self.powerup_step = icon_size + 10
+
+
+class HUD:
+    """Widgets del HUD de una GameSession."""
+
+    def __init__(self, main_module, fuente_ui):
+        self.main = main_module
+        self.layout = HUDLayout(main_module.ANCHO, main_module.ALTO, main_module.icon_size)
+        self.score_widgets = {"J1": TextWidget(fuente_ui), "J2": TextWidget(fuente_ui)}
+        self.timer_widget = TextWidget(fuente_ui, main_module.BLANCO)
+        self.combo_widget = TextWidget(pygame.freetype.SysFont("arial", 40))
+        self.font_powerup_time = pygame.freetype.SysFont("arial", 18)
+        self.powerup_widgets = {}  # tipo -> TextWidget con los segundos restantes
+
+    def _powerup_widget(self, tipo):
+        widget = self.powerup_widgets.get(tipo)
+        if widget is None:
+            widget = self.powerup_widgets[tipo] = TextWidget(self.font_powerup_time, self.main.BLANCO)
+        return widget
+
+    def draw(self, surface, session, backend=None):
+        """Dibuja el HUD; todos los textos e iconos se envían en una sola llamada a blits
+        (a través de 'backend' si se indica, ver render_backend.py)."""
+        main, layout = self.main, self.layout
+        batch = []
+        num_jugadores = session.game_options["num_jugadores"]
+
+        for player_id in (("J1", "J2") if num_jugadores == 2 else ("J1",)):
+            manager = session.player_managers[player_id]
+            color = session.config["color"] if num_jugadores == 1 else session.jugadores[player_id]["color"]
+            widget = self.score_widgets[player_id]
+            widget.set(f"{player_id}: {manager.get_score()} (Fallos: {manager.get_fallos()})", color)
+            widget.draw(batch, layout.j1_score if player_id == "J1" else layout.j2_score)
+
+        if session.game_options["time_limit_seconds"] > 0:
+            tiempo_restante = max(0, session.game_options["time_limit_seconds"] - int(session.tiempo_transcurrido))
+            minutos, segundos = divmod(int(tiempo_restante), 60)
+            self.timer_widget.set(f"Tiempo: {minutos:02d}:{segundos:02d}")
+            self.timer_widget.draw(batch, layout.timer)
+
+        if num_jugadores == 1 and session.player_managers["J1"].get_racha() > 1:
+            racha = session.player_managers["J1"].get_racha()
+            combo_color = main.ROJO if racha >= 20 else main.AMARILLO if racha >= 10 else main.BLANCO
+            self.combo_widget.set(f"COMBO x{racha}", combo_color)
+            # El temblor solo desplaza el blit; no obliga a re-renderizar
+            offset_x = random.randint(-2, 2) if racha >= 15 else 0; offset_y = random.randint(-2, 2) if racha >= 15 else 0
+            width = self.combo_widget.size[0]
+            self.combo_widget.draw(batch, ((layout.ancho - width) // 2 + offset_x, layout.combo_top + offset_y))
+
+        y_pu_hud = layout.powerup_y0
+        for tipo in session.powerup_manager.activos:
+            batch.append((main.powerup_icons[tipo], (layout.powerup_x, y_pu_hud)))
+            widget = self._powerup_widget(tipo)
+            widget.set(f"{int(session.powerup_manager.get_remaining_time(tipo, now=session.frame_now))}s")
+            widget.draw_anchored(batch, midright=(layout.powerup_x - 5, y_pu_hud + layout.icon_size // 2))
+            y_pu_hud -= layout.powerup_step
+        for tipo, restante, apilados in session.effects.hud_entries(now=session.frame_now):
+            batch.append((main.powerup_icons[tipo], (layout.powerup_x, y_pu_hud)))
+            widget = self._powerup_widget(tipo)
+            widget.set(f"x{apilados} {int(restante)}s" if apilados > 1 else f"{int(restante)}s")
+            widget.draw_anchored(batch, midright=(layout.powerup_x - 5, y_pu_hud + layout.icon_size // 2))
+            y_pu_hud -= layout.powerup_step
+
+        (backend if backend is not None else surface).blits(batch, doreturn=False)
+        if num_jugadores == 2:
+            turno = session.current_turn_player
+            pygame.draw.circle(surface, session.jugadores[turno]['color'], layout.turn_indicator[turno], 10)
@@ -0,0 +1,59 @@
+# input_manager.py
+"""
+Ruta de entrada de baja latencia.
+Vacía la cola de eventos al inicio del fotograma, traduce las teclas con una
+tabla precalculada y marca cada pulsación con un instante en ms de SDL: el
+timestamp del evento si pygame lo expone (pygame-ce) o, si no (pygame 2.x
+clásico, que no lo tiene), el instante en que se vació la cola. Ese instante
+sirve para medir la latencia entrada -> pantalla y se guarda en las grabaciones.
+
+El tiempo de reacción no usa ese instante: se mide en segundos del reloj de
+juego (reaction_time), que no avanza en pausa ni en la cuenta regresiva.
+"""
+
+from collections import namedtuple
+from typing import List, Optional, Tuple
+
+import pygame
+
+# Tabla keycode -> letra mayúscula, construida una sola vez (sustituye a
+# pygame.key.name(evento.key).upper() en cada pulsación).
+KEYCODE_TO_LETTER = {pygame.K_a + i: chr(ord('A') + i) for i in range(26)}
+
+KeyStroke = namedtuple("KeyStroke", ["letter", "key", "timestamp"])
+
+
+def event_timestamp(evento, fallback_ms: int) -> int:
+    """Instante del evento en ms de pygame.time.get_ticks().
+    pygame-ce expone el timestamp de SDL; en pygame clásico se usa el instante
+    en que se vació la cola, que es la mejor aproximación disponible."""
+    return getattr(evento, "timestamp", None) or fallback_ms
+
+
+def reaction_time(spawn_t: Optional[float], now: float) -> float:
+    """Tiempo de reacción en segundos de juego entre la aparición de una letra (spawn_t)
+    y el fotograma en que se procesa la pulsación (now). 0.0 si no se conoce la aparición."""
+    if spawn_t is None or now < spawn_t:
+        return 0.0
+    return now - spawn_t
+
+
+class InputManager:
+    """Recoge los eventos del fotograma y los entrega en orden con sus pulsaciones."""
+
+    def poll(self) -> List[Tuple[pygame.event.Event, Optional[KeyStroke]]]:
+        """
+        Vacía la cola de eventos de pygame.
+        Retorna una lista de (evento, pulsación) en orden de llegada; 'pulsación'
+        es un KeyStroke para las teclas A-Z y None para cualquier otro evento.
+        """
+        drained_ms = pygame.time.get_ticks()
+        result = []
+        for evento in pygame.event.get():
+            stroke = None
+            if evento.type == pygame.KEYDOWN:
+                letter = KEYCODE_TO_LETTER.get(evento.key)
+                if letter is not None:
+                    stroke = KeyStroke(letter, evento.key, event_timestamp(evento, drained_ms))
+            result.append((evento, stroke))
+        return result
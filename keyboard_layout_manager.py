@@ -2,42 +2,126 @@ import random
 import json
 import os
 
+
+class ShuffleBag:
+    """
+    Bolsa de letras barajada: recorre una permutación preasignada con un cursor
+    y la vuelve a barajar en el mismo sitio al agotarse. Cada extracción es O(1).
+    Con 'weights' ({letra: entero}) una letra aparece ese número de veces por ronda.
+
+    El orden de cada ronda depende solo de (seed, epoch), así que el estado se
+    serializa como {"seed", "epoch", "cursor"} en lugar de la lista restante.
+    """
+
+    def __init__(self, items, seed, weights=None, epoch=0, cursor=0):
+        self.items = list(items)
+        self.weights = dict(weights) if weights else None
+        self.seed = seed
+        self.epoch = epoch
+        self._pool = self._build_pool()  # Orden canónico de la ronda
+        self._order = list(self._pool)   # Permutación preasignada que recorre el cursor
+        self._shuffle()
+        self.cursor = min(cursor, len(self._order))
+
+    def _build_pool(self):
+        if not self.weights:
+            return list(self.items)
+        pool = []
+        for item in self.items:
+            pool.extend([item] * max(0, int(self.weights.get(item, 1))))
+        return pool or list(self.items)
+
+    def _shuffle(self):
+        # Un generador por ronda derivado de la semilla: la permutación es reproducible
+        self._order[:] = self._pool
+        random.Random((self.seed * 1000003 + self.epoch) & 0xFFFFFFFFFFFFFFFF).shuffle(self._order)
+
+    def next(self):
+        """Devuelve el siguiente elemento; al agotarse la ronda, baraja y empieza otra."""
+        if self.cursor >= len(self._order):
+            self.epoch += 1
+            self._shuffle()
+            self.cursor = 0
+        item = self._order[self.cursor]
+        self.cursor += 1
+        return item
+
+    def next_n(self, n):
+        """Devuelve los siguientes n elementos (para apariciones múltiples en un mismo fotograma)."""
+        return [self.next() for _ in range(n)]
+
+    def remaining(self):
+        """Elementos que quedan en la ronda actual, en orden de salida."""
+        return self._order[self.cursor:]
+
+    def set_weights(self, weights):
+        """Cambia los pesos; la nueva distribución se aplica desde una ronda nueva."""
+        self.weights = dict(weights) if weights else None
+        self.epoch += 1
+        self._pool = self._build_pool()
+        self._order = list(self._pool)
+        self._shuffle()
+        self.cursor = 0
+
+    def to_dict(self):
+        data = {"seed": self.seed, "epoch": self.epoch, "cursor": self.cursor}
+        if self.weights:
+            data["weights"] = self.weights
+        return data
+
+    @classmethod
+    def from_dict(cls, items, data):
+        return cls(items, data["seed"], data.get("weights"), data.get("epoch", 0), data.get("cursor", 0))
+
+
 class KeyboardLayoutManager:
-    def __init__(self):
-        self.left_hand_keys = [
+    def __init__(self, rng=None, bags_state=None, left_hand_keys=None, right_hand_keys=None):
+        # Generador aleatorio (random.Random) del que se derivan las semillas de las bolsas;
+        # permite partidas reproducibles
+        self.rng = rng or random.Random()
+        self.left_hand_keys = list(left_hand_keys) if left_hand_keys else [
             'Q', 'W', 'E', 'R', 'T',
             'A', 'S', 'D', 'F', 'G',
             'Z', 'X', 'C', 'V', 'B'
         ]
-        self.right_hand_keys = [
+        self.right_hand_keys = list(right_hand_keys) if right_hand_keys else [
             'Y', 'U', 'I', 'O', 'P',
             'H', 'J', 'K', 'L', # Asumiendo un teclado español con 'Ñ'
             'N', 'M'
         ]
-        
-        self.all_game_letters = list(set(self.left_hand_keys + self.right_hand_keys))
-        
-        # Estas variables almacenarán el estado actual de las letras disponibles
-        # y se inicializarán correctamente con reset_available_letters()
-        self.current_available_letters_j1 = []
-        self.current_available_letters_j2 = []
-        self.current_all_letters = []
-
-        # ¡IMPORTANTE! Llama a reset_available_letters al final del constructor
-        # Esto asegura que las listas estén llenas cuando se crea una nueva instancia.
-        self.reset_available_letters()
+
+        # Ordenado: el orden de un set de cadenas cambia entre ejecuciones y rompería las grabaciones
+        self.all_game_letters = sorted(set(self.left_hand_keys + self.right_hand_keys))
+
+        # Una bolsa por pool: "J1" (mano izquierda), "J2" (mano derecha) y "all" (modo 1P)
+        self.bags = {}
+        bags_state = bags_state or {}
+        for name, items in self._bag_items().items():
+            if name in bags_state:
+                self.bags[name] = ShuffleBag.from_dict(items, bags_state[name])
+            else:
+                self.bags[name] = ShuffleBag(items, self.rng.getrandbits(63))
+
+    def _bag_items(self):
+        return {"J1": self.left_hand_keys, "J2": self.right_hand_keys, "all": self.all_game_letters}
+
+    def _bag_for(self, player_id=None, num_jugadores=1):
+        if num_jugadores == 2 and player_id in ("J1", "J2"):
+            return self.bags[player_id]
+        # Modo 1P, player_id no especificado o inválido: todas las letras
+        return self.bags["all"]
 
     def reset_available_letters(self):
         """Reinicia el pool de letras disponibles para cada jugador (las baraja)."""
-        self.current_available_letters_j1 = list(self.left_hand_keys)
-        random.shuffle(self.current_available_letters_j1)
-        
-        self.current_available_letters_j2 = list(self.right_hand_keys)
-        random.shuffle(self.current_available_letters_j2)
-        
-        self.current_all_letters = list(self.all_game_letters)
-        random.shuffle(self.current_all_letters)
+        for name, items in self._bag_items().items():
+            self.bags[name] = ShuffleBag(items, self.rng.getrandbits(63), self.bags[name].weights)
 
+    def set_weights(self, weights, player_id=None, num_jugadores=1):
+        """
+        Pondera la frecuencia de las letras de una bolsa ({letra: entero}, 1 = normal).
+        Por ejemplo, {'Q': 3} hace que la Q salga tres veces por ronda.
+        """
+        self._bag_for(player_id, num_jugadores).set_weights(weights)
 
     def obtener_nueva_letra(self, player_id=None, num_jugadores=1):
         """
@@ -45,65 +129,23 @@ class KeyboardLayoutManager:
         En modo 2P, selecciona del alfabeto de la mano correspondiente.
         En modo 1P, selecciona del alfabeto completo.
         """
-        if num_jugadores == 2 and player_id:
-            if player_id == "J1":
-                # Si el pool de J1 se agota, lo recarga y lo baraja de nuevo
-                if not self.current_available_letters_j1:
-                    self.current_available_letters_j1 = list(self.left_hand_keys)
-                    random.shuffle(self.current_available_letters_j1) # Barajar al recargar
-                return self.current_available_letters_j1.pop(0)
-            elif player_id == "J2":
-                # Si el pool de J2 se agota, lo recarga y lo baraja de nuevo
-                if not self.current_available_letters_j2:
-                    self.current_available_letters_j2 = list(self.right_hand_keys)
-                    random.shuffle(self.current_available_letters_j2) # Barajar al recargar
-                return self.current_available_letters_j2.pop(0)
-            else:
-                # Si hay un player_id inválido en modo 2P, por defecto se elige de todas las letras
-                if not self.current_all_letters:
-                    self.current_all_letters = list(self.all_game_letters)
-                    random.shuffle(self.current_all_letters) # Barajar al recargar
-                return self.current_all_letters.pop(0)
-        else: # num_jugadores == 1 o player_id no especificado
-            if not self.current_all_letters:
-                self.current_all_letters = list(self.all_game_letters)
-                random.shuffle(self.current_all_letters) # Barajar al recargar
-            return self.current_all_letters.pop(0)
+        return self._bag_for(player_id, num_jugadores).next()
+
+    def next_n(self, n, player_id=None, num_jugadores=1):
+        """Devuelve n letras seguidas de la misma bolsa (apariciones múltiples)."""
+        return self._bag_for(player_id, num_jugadores).next_n(n)
 
     def to_dict(self):
         """Convierte el estado del manager a un diccionario para guardar."""
         return {
             "left_hand_keys": self.left_hand_keys, # Conservar la definición base
             "right_hand_keys": self.right_hand_keys, # Conservar la definición base
-            "current_available_letters_j1": self.current_available_letters_j1,
-            "current_available_letters_j2": self.current_available_letters_j2,
-            "current_all_letters": self.current_all_letters
+            "bags": {name: bag.to_dict() for name, bag in self.bags.items()}
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, rng=None):
         """Crea una instancia del manager desde un diccionario cargado.
-        Asegura que las listas de letras estén pobladas si el estado cargado está vacío."""
-        manager = cls() # Crea una nueva instancia, que ya llama a __init__ y a reset_available_letters()
-
-        # Sobrescribe las listas con los datos cargados si existen
-        manager.left_hand_keys = data.get("left_hand_keys", manager.left_hand_keys)
-        manager.right_hand_keys = data.get("right_hand_keys", manager.right_hand_keys)
-        manager.current_available_letters_j1 = data.get("current_available_letters_j1", [])
-        manager.current_available_letters_j2 = data.get("current_available_letters_j2", [])
-        manager.current_all_letters = data.get("current_all_letters", [])
-        
-        # Re-barajar los pools si están vacíos después de la carga
-        # Esto es importante para el caso de iniciar un nuevo juego que se crea con from_dict({})
-        # o si un juego cargado guardó un pool vacío.
-        if not manager.current_available_letters_j1:
-            manager.current_available_letters_j1 = list(manager.left_hand_keys)
-            random.shuffle(manager.current_available_letters_j1)
-        if not manager.current_available_letters_j2:
-            manager.current_available_letters_j2 = list(manager.right_hand_keys)
-            random.shuffle(manager.current_available_letters_j2)
-        if not manager.current_all_letters:
-            manager.current_all_letters = list(manager.all_game_letters)
-            random.shuffle(manager.current_all_letters)
-            
-        return manager
\ No newline at end of file
+        Las partidas guardadas con el formato anterior (listas restantes) empiezan con bolsas nuevas."""
+        return cls(rng, bags_state=data.get("bags"),
+                   left_hand_keys=data.get("left_hand_keys"), right_hand_keys=data.get("right_hand_keys"))
@@ -0,0 +1,117 @@
+# level_curve.py
+"""
+Curvas de niveles: umbrales de aciertos y parámetros de cada nivel (velocidad,
+ritmo de apariciones, letras en pantalla, oleada), leídos de levels.json.
+
+Cada curva tiene una tabla de niveles y, opcionalmente, una regla procedural
+para generar niveles sin fin más allá de la tabla (modo infinito): cada nivel
+nuevo suma 'incrementos' al anterior (sin pasar de 'maximos') y su umbral se
+aleja del anterior 'umbral_paso' aciertos, multiplicados por 'umbral_crecimiento'
+en cada nivel generado.
+
+Los umbrales se mantienen en una lista ordenada: el nivel para un total de
+aciertos se busca con bisect en O(log n), y next_threshold() permite a la
+partida comparar su total acumulado con un solo número por fotograma. Los
+niveles procedurales se generan solo al alcanzarlos.
+"""
+
+import json
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from asset_pack import read_bytes
+
+LEVELS_FILE = "levels.json"
+DEFAULT_CURVE = "arcane"
+
+# Curva de respaldo si levels.json no existe o está dañado
+DEFAULT_LEVELS = [
+    {"threshold": 0, "speed": 2.0, "spawn_rate": 0.25, "max_letras": 3, "min_letras": 1, "oleada": 0},
+    {"threshold": 30, "speed": 2.5, "spawn_rate": 0.35, "max_letras": 4, "min_letras": 1, "oleada": 4},
+    {"threshold": 80, "speed": 3.0, "spawn_rate": 0.5, "max_letras": 6, "min_letras": 2, "oleada": 6},
+    {"threshold": 150, "speed": 3.5, "spawn_rate": 0.65, "max_letras": 8, "min_letras": 2, "oleada": 8},
+]
+
+
+class LevelCurve:
+    """Tabla de niveles (nivel 1 = primera entrada) con búsqueda por umbral y extensión procedural opcional."""
+
+    def __init__(self, levels: List[Dict], procedural: Optional[Dict] = None):
+        if not levels:
+            raise ValueError("La curva de niveles necesita al menos un nivel")
+        self._levels = sorted((dict(level) for level in levels), key=lambda level: level["threshold"])
+        self.thresholds = [level["threshold"] for level in self._levels]  # Ordenada, para bisect
+        self.procedural = procedural
+        self._generated = 0  # Niveles añadidos por la regla procedural
+
+    def __len__(self) -> int:
+        """Niveles conocidos hasta ahora (los procedurales se generan al alcanzarlos)."""
+        return len(self._levels)
+
+    @property
+    def unlimited(self) -> bool:
+        return self.procedural is not None
+
+    def _generate_next(self):
+        rule = self.procedural
+        previous = self._levels[-1]
+        level = dict(previous)
+        for key, step in rule.get("incrementos", {}).items():
+            value = previous.get(key, 0) + step
+            limit = rule.get("maximos", {}).get(key)
+            if limit is not None:
+                value = min(value, limit)
+            level[key] = round(value, 4) if isinstance(value, float) else value
+        gap = rule.get("umbral_paso", 100) * rule.get("umbral_crecimiento", 1.0) ** self._generated
+        level["threshold"] = previous["threshold"] + max(1, round(gap))
+        self._levels.append(level)
+        self.thresholds.append(level["threshold"])
+        self._generated += 1
+
+    def _ensure(self, level: int):
+        while self.procedural is not None and len(self._levels) < level:
+            self._generate_next()
+
+    def level_for(self, hits: int) -> int:
+        """Nivel que corresponde a 'hits' aciertos totales."""
+        while self.procedural is not None and hits >= self.thresholds[-1]:
+            self._generate_next()  # Siempre hay un umbral conocido por encima del total
+        return max(1, bisect_right(self.thresholds, hits))
+
+    def has_level(self, level: int) -> bool:
+        return level >= 1 and (self.procedural is not None or level <= len(self._levels))
+
+    def get(self, level: int) -> Dict:
+        """Parámetros del nivel; más allá de una tabla sin regla procedural, los del último nivel."""
+        self._ensure(level)
+        return self._levels[min(max(level, 1), len(self._levels)) - 1]
+
+    def next_threshold(self, level: int) -> float:
+        """Aciertos necesarios para pasar del nivel 'level' al siguiente (infinito si no hay siguiente)."""
+        if not self.has_level(level + 1):
+            return float("inf")
+        return self.get(level + 1)["threshold"]
+
+    # --- Carga ---
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LevelCurve":
+        return cls(data["niveles"], data.get("procedural"))
+
+    @classmethod
+    def load(cls, name: str = DEFAULT_CURVE, path: str = LEVELS_FILE) -> "LevelCurve":
+        """Curva 'name' de levels.json; si falta o está dañada, la curva por defecto."""
+        try:
+            curves = json.loads(read_bytes(path))["curvas"]
+        except FileNotFoundError:
+            return cls(DEFAULT_LEVELS)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error cargando las curvas de niveles: {e}")
+            return cls(DEFAULT_LEVELS)
+        if name not in curves:
+            print(f"Curva de niveles '{name}' no encontrada; se usa '{DEFAULT_CURVE}'.")
+            name = DEFAULT_CURVE
+        try:
+            return cls.from_dict(curves[name])
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"Error cargando la curva de niveles '{name}': {e}")
+            return cls(DEFAULT_LEVELS)
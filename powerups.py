@@ -1,43 +1,82 @@
 import time
 
+from timer_scheduler import TimerScheduler
+
+class _MonotonicClock:
+    """Reloj mínimo para usar PowerUp sin reloj de juego."""
+    @property
+    def now(self): return time.monotonic()
+
 class PowerUp:
-    def __init__(self):
+    def __init__(self, clock=None, scheduler=None):
         # 'self.activos' es un diccionario para gestionar múltiples power-ups activos
-        # Cada entrada es: {"tipo_powerup": {"tiempo_activado": timestamp, "duracion": segundos}}
+        # Cada entrada es: {"tipo_powerup": {"tiempo_activado": instante, "duracion": segundos}}
+        # Los instantes son del reloj de juego ('clock', ver game_clock.py) o de time.monotonic() sin él.
         self.activos = {} 
         self.duracion_default = 10 # Duración predeterminada si no se especifica
+        self.clock = clock
+        # Los vencimientos se planifican en un montículo (timer_scheduler.py): actualizar() no
+        # recorre los power-ups activos. El planificador puede compartirse con otros efectos.
+        self.scheduler = scheduler if scheduler is not None else TimerScheduler(clock or _MonotonicClock())
+        self._timers = {}  # tipo -> TimerHandle de su vencimiento
+        self._terminados = []
+
+    def _now(self, now=None):
+        if now is not None: return now
+        return self.clock.now if self.clock is not None else time.monotonic()
 
-    def activar(self, tipo, duracion=None):
+    def activar(self, tipo, duracion=None, now=None):
         """
         Activa un power-up específico. Si ya está activo, reinicia su temporizador.
         :param tipo: La cadena que identifica el power-up (ej. "ralentizar", "escudo", "doble_puntuacion").
         :param duracion: Duración en segundos para este power-up; si es None, usa la duración por defecto.
+        :param now: Instante de activación; si es None, usa el reloj de juego.
         """
         if duracion is None:
             duracion = self.duracion_default
             
         self.activos[tipo] = {
-            "tiempo_activado": time.time(),
+            "tiempo_activado": self._now(now),
             "duracion": duracion
         }
+        self._schedule_expiry(tipo)
         # print(f"Power-Up '{tipo}' activado por {duracion} segundos.") # Línea para depuración
 
-    def actualizar(self):
+    def actualizar(self, now=None):
         """ 
         Actualiza el estado de TODOS los power-ups activos.
         Elimina los que han excedido su duración.
         Retorna una lista de los tipos de power-ups que han terminado en este ciclo.
+        :param now: Instante de referencia; si es None, usa el reloj de juego (muestreado una vez por fotograma).
         """
-        terminados = []
-        # Itera sobre una copia de las claves para poder modificar el diccionario mientras iteras
-        for tipo in list(self.activos.keys()):
-            info_pu = self.activos[tipo]
-            if (time.time() - info_pu["tiempo_activado"]) > info_pu["duracion"]:
-                del self.activos[tipo] # Elimina el power-up que ha terminado
-                terminados.append(tipo)
-                # print(f"Power-Up '{tipo}' agotado por tiempo.") # Línea para depuración
+        # Dispara los vencimientos pendientes (si el planificador es compartido y ya se
+        # ejecutó en este fotograma, no hay nada que hacer) y recoge los terminados
+        self.scheduler.run_due(self._now(now))
+        terminados, self._terminados = self._terminados, []
         return terminados
 
+    def _schedule_expiry(self, tipo):
+        """(Re)planifica el fin de 'tipo'; reactivar un power-up cancela su vencimiento anterior."""
+        self.scheduler.cancel(self._timers.get(tipo))
+        info_pu = self.activos[tipo]
+        self._timers[tipo] = self.scheduler.schedule_at(info_pu["tiempo_activado"] + info_pu["duracion"], self._expire, tipo)
+
+    def _expire(self, tipo):
+        del self.activos[tipo] # Elimina el power-up que ha terminado
+        del self._timers[tipo]
+        self._terminados.append(tipo)
+        # print(f"Power-Up '{tipo}' agotado por tiempo.") # Línea para depuración
+
+    def restore(self, activos):
+        """Sustituye los power-ups activos (instantes del reloj de juego) y re-planifica sus vencimientos."""
+        for handle in self._timers.values():
+            self.scheduler.cancel(handle)
+        self._timers = {}
+        self._terminados = []
+        self.activos = {tipo: dict(info) for tipo, info in activos.items()}
+        for tipo in self.activos:
+            self._schedule_expiry(tipo)
+
     def esta_activo(self, tipo):
         """ 
         Verifica si un power-up específico está actualmente activo.
@@ -46,19 +85,39 @@ class PowerUp:
         """
         return tipo in self.activos
 
-    def get_remaining_time(self, tipo):
+    def get_remaining_time(self, tipo, now=None):
         """ 
         Retorna el tiempo restante de un power-up específico si está activo.
         :param tipo: La cadena que identifica el power-up.
+        :param now: Instante de referencia; si es None, usa el reloj de juego.
         :return: Tiempo restante en segundos (entero), o 0 si no está activo.
         """
         if tipo in self.activos:
             info_pu = self.activos[tipo]
-            elapsed = time.time() - info_pu["tiempo_activado"]
+            elapsed = self._now(now) - info_pu["tiempo_activado"]
             remaining = info_pu["duracion"] - elapsed
             return max(0, remaining)
         return 0
 
+    def to_dict(self, now=None):
+        """Serializa los power-ups activos en forma relativa: segundos restantes de cada uno."""
+        return {tipo: {"restante": self.get_remaining_time(tipo, now), "duracion": info["duracion"]}
+                for tipo, info in self.activos.items()}
+
+    def load_dict(self, data, now=None):
+        """
+        Restaura los power-ups guardados con to_dict respecto al instante actual.
+        Las partidas antiguas guardaban instantes absolutos de time.time(), que ya no son
+        comparables: esos power-ups se dan por agotados y terminan en la siguiente actualización.
+        """
+        now = self._now(now)
+        activos = {}
+        for tipo, info in data.items():
+            duracion = info.get("duracion", self.duracion_default)
+            restante = info.get("restante", 0)
+            activos[tipo] = {"tiempo_activado": now - (duracion - restante), "duracion": duracion}
+        self.restore(activos)
+
     def get_remaining_hits(self):
 
         """
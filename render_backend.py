@@ -0,0 +1,164 @@
+# render_backend.py
+"""
+Fachada de dibujo con dos implementaciones:
+
+- SoftwareBackend: blits de pygame.Surface sobre la pantalla y display.flip().
+- SDL2Backend: ventana propia con pygame._sdl2.video (Window/Renderer/Texture).
+  Las superficies enviadas por la cola de dibujo (fondo, naves, letras,
+  sprites de estrellas y partículas) se suben como texturas una sola vez y
+  se dibujan con el renderer; lo que se dibuja directamente sobre la
+  superficie del fotograma (HUD, líneas, textos) va a una capa transparente
+  que se sube al presentar y se compone encima. Si no hay GPU se usa el
+  renderer por software de SDL.
+
+La lógica del juego solo usa begin_frame(), blits() y present(). Ambas
+implementaciones miden el tiempo de cada fotograma (get_frame_time_ms).
+"""
+
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Tuple
+
+import pygame
+
+try:
+    from pygame._sdl2.video import Window, Renderer, Texture
+    from pygame._sdl2.sdl2 import error as SDL2Error
+except ImportError:
+    Window = Renderer = Texture = None
+    SDL2Error = pygame.error
+
+# Errores posibles al crear la ventana/renderer SDL2 (pygame._sdl2 usa su propia excepción)
+BACKEND_ERRORS = (pygame.error, SDL2Error)
+
+BACKEND_SOFTWARE = "software"
+BACKEND_SDL2 = "sdl2"
+BACKEND_OPTIONS = [BACKEND_SOFTWARE, BACKEND_SDL2]
+FRAME_TIME_WINDOW = 120  # Fotogramas para el promedio móvil
+TEXTURE_CACHE_SIZE = 512
+SDL_BLENDMODE_NONE = 0
+SDL_BLENDMODE_BLEND = 1
+
+
+class SoftwareBackend:
+    """Dibujo por CPU sobre la superficie de pantalla."""
+
+    name = BACKEND_SOFTWARE
+    accelerated = False
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self._frame_times = deque(maxlen=FRAME_TIME_WINDOW)
+        self._frame_start = None
+
+    def begin_frame(self) -> pygame.Surface:
+        """Empieza un fotograma de juego. Retorna la superficie para el dibujo inmediato."""
+        self._frame_start = time.perf_counter()
+        return self.screen
+
+    def upload(self, surface: pygame.Surface):
+        """Prepara una superficie estática para dibujarla muchas veces (sin efecto por software)."""
+
+    def blits(self, sequence, doreturn=False):
+        """Dibuja pares (superficie, destino); misma firma que Surface.blits."""
+        return self.screen.blits(sequence, doreturn=doreturn)
+
+    def present(self):
+        pygame.display.flip()
+        self._end_frame()
+
+    def _end_frame(self):
+        if self._frame_start is not None:
+            self._frame_times.append((time.perf_counter() - self._frame_start) * 1000.0)
+            self._frame_start = None
+
+    def get_frame_time_ms(self) -> Optional[float]:
+        """Tiempo medio (ms) entre begin_frame() y el final de present(), o None sin datos."""
+        if not self._frame_times:
+            return None
+        return sum(self._frame_times) / len(self._frame_times)
+
+    def close(self):
+        pass
+
+
+class SDL2Backend(SoftwareBackend):
+    """Dibujo con texturas mediante el Renderer de SDL2 en una ventana propia."""
+
+    name = BACKEND_SDL2
+
+    def __init__(self, screen: pygame.Surface, caption: str, window_size: Tuple[int, int], vsync: bool = False):
+        if Renderer is None:
+            raise pygame.error("pygame._sdl2.video no está disponible")
+        super().__init__(screen)
+        self.window = Window(caption, size=window_size)
+        self.renderer, self.accelerated = self._create_renderer(vsync)
+        size = screen.get_size()
+        self.renderer.logical_size = size  # Escala la resolución interna a la ventana
+        self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self._frame_texture = Texture(self.renderer, size, streaming=True)
+        self._textures = OrderedDict()  # id(superficie) -> (superficie, textura)
+        self._in_frame = False
+
+    def _create_renderer(self, vsync):
+        try:
+            return Renderer(self.window, accelerated=1, vsync=vsync), True
+        except BACKEND_ERRORS as e:
+            print(f"Renderer acelerado no disponible ({e}); se usará el renderer por software de SDL.")
+            return Renderer(self.window, accelerated=0, vsync=vsync), False
+
+    def _texture(self, surface):
+        entry = self._textures.get(id(surface))
+        if entry is not None and entry[0] is surface:
+            self._textures.move_to_end(id(surface))
+            return entry[1]
+        # La entrada guarda la superficie: su id no puede reutilizarse mientras esté en caché
+        texture = Texture.from_surface(self.renderer, surface)
+        self._textures[id(surface)] = (surface, texture)
+        if len(self._textures) > TEXTURE_CACHE_SIZE:
+            self._textures.popitem(last=False)
+        return texture
+
+    def begin_frame(self) -> pygame.Surface:
+        super().begin_frame()
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        self.overlay.fill((0, 0, 0, 0))
+        self._in_frame = True
+        return self.overlay
+
+    def upload(self, surface: pygame.Surface):
+        self._texture(surface)
+
+    def blits(self, sequence, doreturn=False):
+        texture_for = self._texture
+        for surface, dest in sequence:
+            texture = texture_for(surface)
+            if isinstance(dest, pygame.Rect):
+                x, y = dest.x, dest.y
+            else:
+                x, y = dest[0], dest[1]
+            texture.draw(dstrect=(x, y, surface.get_width(), surface.get_height()))
+        return None
+
+    def present(self):
+        if self._in_frame:
+            # Capa de dibujo inmediato, compuesta sobre las texturas
+            self._frame_texture.blend_mode = SDL_BLENDMODE_BLEND
+            self._frame_texture.update(self.overlay)
+        else:
+            # Pantallas de menú: todo está dibujado en la superficie de pantalla
+            self.renderer.clear()
+            self._frame_texture.blend_mode = SDL_BLENDMODE_NONE
+            self._frame_texture.update(self.screen)
+        self._frame_texture.draw()
+        self.renderer.present()
+        self._in_frame = False
+        self._end_frame()
+        # La ventana principal de pygame está oculta: cerrar esta ventana debe salir del juego
+        if pygame.event.peek(pygame.WINDOWCLOSE):
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def close(self):
+        self._textures.clear()
+        self.window.destroy()
@@ -0,0 +1,82 @@
+# render_queue.py
+"""
+Cola de dibujo por capas. Durante la actualización se acumulan pares
+(superficie, destino) en la capa que corresponda; al final del fotograma
+cada capa se envía en una sola llamada a Surface.blits(doreturn=False),
+en orden de capa, en lugar de un blit o draw.circle por elemento.
+
+Los círculos (estrellas, partículas) se dibujan como sprites pre-renderizados
+por (color, radio), idénticos píxel a píxel a pygame.draw.circle.
+"""
+
+import pygame
+
+# Capas, de atrás hacia delante
+LAYER_BACKGROUND = 0
+LAYER_STARS = 1
+LAYER_SPAWNERS = 2
+LAYER_LETTERS = 3
+LAYER_TOW = 4  # Solo líneas de remolque
+LAYER_PARTICLES = 5
+LAYER_HUD = 6
+NUM_LAYERS = 7
+
+_COLORKEY = (255, 0, 255)
+_COLORKEY_ALT = (0, 0, 0)
+_circle_sprites = {}
+
+
+def circle_sprite(color, radius):
+    """Sprite (2r+1 x 2r+1, con colorkey) de un círculo relleno; se crea una vez por (color, radio)."""
+    key = (tuple(color), radius)
+    sprite = _circle_sprites.get(key)
+    if sprite is None:
+        colorkey = _COLORKEY if tuple(color[:3]) != _COLORKEY else _COLORKEY_ALT
+        sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+        sprite.fill(colorkey); sprite.set_colorkey(colorkey)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        _circle_sprites[key] = sprite
+    return sprite
+
+
+class RenderQueue:
+    """Acumula blits por capa y los envía en bloque con flush()."""
+
+    def __init__(self, num_layers=NUM_LAYERS, tow_layer=LAYER_TOW):
+        self.layers = [[] for _ in range(num_layers)]
+        self.tow_layer = tow_layer
+        self.tow_lines = []  # Segmentos (inicio, fin) de las líneas de remolque
+        self.tow_color = (200, 200, 200)
+        self.tow_width = 2
+
+    def submit(self, layer, surface, dest):
+        self.layers[layer].append((surface, dest))
+
+    def submit_circle(self, layer, color, center, radius):
+        """Equivalente en cola a pygame.draw.circle(…, color, center, radius) con centro entero."""
+        if radius < 1: return  # draw.circle no dibuja nada con radio 0
+        self.layers[layer].append((circle_sprite(color, radius), (center[0] - radius, center[1] - radius)))
+
+    def add_tow_line(self, start, end):
+        self.tow_lines.append((start, end))
+
+    def flush(self, surface, backend=None):
+        """
+        Dibuja todas las capas en orden y vacía la cola (las listas se reutilizan).
+        Con 'backend' (render_backend) los blits pasan por él; las líneas van a 'surface'.
+        """
+        target = backend if backend is not None else surface
+        for index, layer in enumerate(self.layers):
+            if layer:
+                target.blits(layer, doreturn=False)
+                layer.clear()
+            if index == self.tow_layer and self.tow_lines:
+                self._flush_tow_lines(surface)
+
+    def _flush_tow_lines(self, surface):
+        # pygame.draw.lines une todos los puntos en una polilínea, así que los segmentos
+        # independientes se vacían en un único bucle con la función ya resuelta
+        draw_line, color, width = pygame.draw.line, self.tow_color, self.tow_width
+        for start, end in self.tow_lines:
+            draw_line(surface, color, start, end, width)
+        self.tow_lines.clear()
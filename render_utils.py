@@ -1,27 +1,239 @@
 import pygame
 import pygame.freetype
+import pygame.mask
 import math
+from collections import OrderedDict
+
+# NumPy es opcional: con él los degradados se generan en una sola operación de arrays
+# (surfarray); sin él se usa el relleno línea a línea original.
+try:
+    import numpy
+    import pygame.surfarray
+except ImportError:
+    numpy = None
+
+GRADIENT_VERTICAL = "vertical"
+GRADIENT_HORIZONTAL = "horizontal"
+GRADIENT_RADIAL = "radial"
+
+# Caché de textos ya compuestos (borde + degradado). Los títulos y botones se redibujan
+# cada fotograma con los mismos parámetros; solo los textos animados fallan la caché.
+_TEXT_CACHE_SIZE = 128
+_text_cache = OrderedDict()
+
+
+def _stop_positions(num_colors):
+    return [i / (num_colors - 1) for i in range(num_colors)]
+
+
+def _gradient_ramp(t, colors):
+    """Interpola las paradas de color sobre los valores 't' (0..1). Retorna un array (..., 3) uint8."""
+    stops = _stop_positions(len(colors))
+    ramp = numpy.empty(t.shape + (3,), dtype=numpy.uint8)
+    for channel in range(3):
+        ramp[..., channel] = numpy.interp(t, stops, [c[channel] for c in colors])
+    return ramp
+
+
+def _fill_gradient(pixels, colors, direction=GRADIENT_VERTICAL):
+    """Escribe el degradado en un array de píxeles (width, height, 3) de surfarray."""
+    width, height = pixels.shape[:2]
+    if direction == GRADIENT_HORIZONTAL:
+        # Una sola rampa de 'width' colores, replicada en todas las filas por broadcasting
+        pixels[...] = _gradient_ramp(numpy.arange(width) / float(width), colors)[:, None, :]
+    elif direction == GRADIENT_RADIAL:
+        xs = (numpy.arange(width) - (width - 1) / 2.0)[:, None]
+        ys = (numpy.arange(height) - (height - 1) / 2.0)[None, :]
+        pixels[...] = _gradient_ramp(numpy.hypot(xs, ys) / (math.hypot(width, height) / 2.0), colors)
+    else:
+        # Misma parametrización que el relleno original: t = y / alto
+        pixels[...] = _gradient_ramp(numpy.arange(height) / float(height), colors)[None, :, :]
+
+
+def _color_at(colors, t):
+    """Color interpolado en 't' (0..1) sobre las paradas de 'colors' (versión sin NumPy)."""
+    segments = len(colors) - 1
+    pos = min(max(t, 0.0), 1.0) * segments
+    i = min(int(pos), segments - 1)
+    local = pos - i
+    c0, c1 = colors[i], colors[i + 1]
+    return (int(c0[0] * (1 - local) + c1[0] * local),
+            int(c0[1] * (1 - local) + c1[1] * local),
+            int(c0[2] * (1 - local) + c1[2] * local))
+
+
+def gradient_glyph_numpy(font, text, gradient_colors, direction=GRADIENT_VERTICAL):
+    """Rasteriza el texto una vez y sustituye sus colores por el degradado; conserva el alfa del glifo."""
+    glyph, _ = font.render(text, (255, 255, 255))
+    if glyph.get_width() == 0 or glyph.get_height() == 0:
+        return glyph
+    if glyph.get_bitsize() != 32 or not glyph.get_flags() & pygame.SRCALPHA:
+        glyph = glyph.convert_alpha() if pygame.display.get_surface() else glyph
+    pixels = pygame.surfarray.pixels3d(glyph)
+    _fill_gradient(pixels, gradient_colors, direction)
+    del pixels  # Libera el bloqueo de la superficie antes de usarla
+    return glyph
+
+
+def gradient_glyph_python(font, text, gradient_colors, direction=GRADIENT_VERTICAL):
+    """Relleno del degradado con una línea por fila/columna y el texto como máscara (sin NumPy)."""
+    width, height = font.get_rect(text).size
+    gradient_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    if direction == GRADIENT_HORIZONTAL:
+        for x_pixel in range(width):
+            pygame.draw.line(gradient_surf, _color_at(gradient_colors, x_pixel / width), (x_pixel, 0), (x_pixel, height))
+    elif direction == GRADIENT_RADIAL:
+        radius = max(1, int(math.hypot(width, height) / 2))
+        gradient_surf.fill(_color_at(gradient_colors, 1.0))  # Esquinas fuera del último círculo
+        for r in range(radius, 0, -1):
+            pygame.draw.circle(gradient_surf, _color_at(gradient_colors, r / radius), (width // 2, height // 2), r)
+    else:
+        for y_pixel in range(height):
+            pygame.draw.line(gradient_surf, _color_at(gradient_colors, y_pixel / height), (0, y_pixel), (width, y_pixel))
+
+    # Use the text as a mask to apply the gradient only to the text
+    text_surf_mask, _ = font.render(text, (255, 255, 255)) # Render white text to use as mask
+    gradient_surf.blit(text_surf_mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return gradient_surf
+
+
+def gradient_glyph(font, text, gradient_colors, direction=GRADIENT_VERTICAL):
+    """Superficie del texto con degradado; usa NumPy si está disponible."""
+    if numpy is not None:
+        return gradient_glyph_numpy(font, text, gradient_colors, direction)
+    return gradient_glyph_python(font, text, gradient_colors, direction)
+
+
+def _max_filter_1d(alpha, radius, axis):
+    """Máximo en una ventana de 2*radius+1 a lo largo de 'axis', por duplicación: O(log radius) pasadas."""
+    size = 2 * radius + 1
+    # Ceros delante para que la ventana, que empieza en cada píxel, quede centrada
+    pad_shape = list(alpha.shape)
+    pad_shape[axis] = radius
+    result = numpy.concatenate([numpy.zeros(pad_shape, dtype=alpha.dtype), alpha], axis=axis)
+    width = 1
+    while width * 2 <= size:
+        _max_shifted(result, result.copy(), width, axis)
+        width *= 2
+    if width < size:
+        _max_shifted(result, result.copy(), size - width, axis)
+    return result[:alpha.shape[0]] if axis == 0 else result[:, :alpha.shape[1]]
+
+
+def _max_shifted(target, source, shift, axis):
+    """target[i] = max(source[i], source[i + shift]) a lo largo de 'axis'."""
+    if axis == 0:
+        numpy.maximum(target[:-shift], source[shift:], out=target[:-shift])
+    else:
+        numpy.maximum(target[:, :-shift], source[:, shift:], out=target[:, :-shift])
+
+
+def _box_blur(alpha, radius):
+    """Desenfoque de caja separable con sumas acumuladas: coste independiente del radio."""
+    result = alpha.astype(numpy.float32)
+    for axis in (0, 1):
+        padded = numpy.concatenate([numpy.zeros_like(numpy.take(result, [0], axis=axis))] + [result], axis=axis)
+        cumsum = numpy.cumsum(padded, axis=axis)
+        n = result.shape[axis]
+        hi = numpy.clip(numpy.arange(n) + radius + 1, 0, n)
+        lo = numpy.clip(numpy.arange(n) - radius, 0, n)
+        result = (numpy.take(cumsum, hi, axis=axis) - numpy.take(cumsum, lo, axis=axis)) / float(2 * radius + 1)
+    return result
+
+
+def _alpha_surface(alpha, color):
+    """Superficie del color dado usando 'alpha' (array width x height) como canal alfa."""
+    surf = pygame.Surface(alpha.shape, pygame.SRCALPHA)
+    surf.fill(tuple(color[:3]) + (255,))
+    pixels_alpha = pygame.surfarray.pixels_alpha(surf)
+    pixels_alpha[...] = alpha
+    del pixels_alpha
+    return surf
+
+
+def outline_numpy(glyph, thickness, color, glow_radius=0, glow_color=None):
+    """
+    Contorno por dilatación del alfa del glifo (filtros de máximo separables) y,
+    opcionalmente, un halo suave desenfocando esa dilatación.
+    Retorna (contorno, halo o None), ambos con 'thickness + 2 * glow_radius' de margen.
+    """
+    pad = thickness + 2 * glow_radius
+    width, height = glyph.get_size()
+    alpha = numpy.zeros((width + 2 * pad, height + 2 * pad), dtype=numpy.uint8)
+    alpha[pad:pad + width, pad:pad + height] = pygame.surfarray.pixels_alpha(glyph)
+    if thickness > 0:
+        alpha = _max_filter_1d(_max_filter_1d(alpha, thickness, 0), thickness, 1)
+    outline = _alpha_surface(alpha, color)
+    glow = None
+    if glow_radius > 0:
+        blurred = _box_blur(_box_blur(alpha, glow_radius), glow_radius)  # Dos cajas ~ gaussiana
+        glow = _alpha_surface(blurred.astype(numpy.uint8), glow_color or color)
+    return outline, glow
+
+
+def outline_mask(glyph, thickness, color, glow_radius=0, glow_color=None):
+    """
+    Contorno con pygame.mask (sin NumPy): la máscara se dilata por filas y luego por columnas,
+    4*thickness operaciones OR en lugar de (2*thickness+1)^2 renderizados.
+    Retorna (contorno, halo o None) con el mismo margen que outline_numpy.
+    """
+    pad = thickness + 2 * glow_radius
+    width, height = glyph.get_size()
+    size = (width + 2 * pad, height + 2 * pad)
+    base = pygame.mask.Mask(size)
+    base.draw(pygame.mask.from_surface(glyph, 1), (pad, pad))
+    rows = base.copy()
+    for offset in range(1, thickness + 1):
+        rows.draw(base, (offset, 0))
+        rows.draw(base, (-offset, 0))
+    dilated = rows.copy()
+    for offset in range(1, thickness + 1):
+        dilated.draw(rows, (0, offset))
+        dilated.draw(rows, (0, -offset))
+    outline = dilated.to_surface(setcolor=tuple(color[:3]) + (255,), unsetcolor=(0, 0, 0, 0))
+    glow = None
+    if glow_radius > 0:
+        glow_base = dilated.to_surface(setcolor=tuple((glow_color or color)[:3]) + (255,), unsetcolor=(0, 0, 0, 0))
+        if hasattr(pygame.transform, "gaussian_blur"):
+            glow = pygame.transform.gaussian_blur(glow_base, glow_radius)
+        else:
+            # Desenfoque barato: reducir y volver a ampliar con suavizado
+            small = pygame.transform.smoothscale(glow_base, (max(1, size[0] // glow_radius), max(1, size[1] // glow_radius)))
+            glow = pygame.transform.smoothscale(small, size)
+    return outline, glow
+
+
+def outline_glyph(glyph, thickness, color, glow_radius=0, glow_color=None):
+    """Contorno (y halo) de un glifo con alfa; usa NumPy si está disponible."""
+    if numpy is not None:
+        return outline_numpy(glyph, thickness, color, glow_radius, glow_color)
+    return outline_mask(glyph, thickness, color, glow_radius, glow_color)
+
+
+def _compose_text_gradient(font, text, gradient_colors, border_color, border_thickness, direction,
+                           glow_radius=0, glow_color=None):
+    """Compone halo + borde + degradado en una superficie propia, con margen para el borde y el halo."""
+    # El glifo se rasteriza una sola vez: su alfa sirve de máscara para el borde y el halo
+    main_surf = gradient_glyph(font, text, gradient_colors, direction)
+    pad = border_thickness + 2 * glow_radius
+    outline, glow = outline_glyph(main_surf, border_thickness, border_color, glow_radius, glow_color)
+    composed = pygame.Surface(outline.get_size(), pygame.SRCALPHA)
+    if glow is not None:
+        composed.blit(glow, (0, 0))
+    if border_thickness > 0:
+        composed.blit(outline, (0, 0))
+    composed.blit(main_surf, (pad, pad))
+    return composed
+
+
+def _font_key(font):
+    return (getattr(font, "name", None), getattr(font, "path", None), str(font.size),
+            getattr(font, "strong", False), getattr(font, "oblique", False))
+
+
+def render_text_gradient(font, text, rect, surface, gradient_colors, border_color, border_thickness,
+                         direction=GRADIENT_VERTICAL, glow_radius=0, glow_color=None):
 
-def render_text_gradient(font, text, rect, surface, gradient_colors, border_color, border_thickness):
-  
-    # Draw border first
-    offsets = []
-    for i in range(-border_thickness, border_thickness + 1):
-        for j in range(-border_thickness, border_thickness + 1):
-            if i != 0 or j != 0:
-                offsets.append((i, j))
-    
-    for ox, oy in offsets:
-        text_surf_border, text_rect_border = font.render(text, border_color)
-        text_rect_border.center = (rect.centerx + ox, rect.centery + oy)
-        surface.blit(text_surf_border, text_rect_border)  
-
-    # Create a temporary surface for the gradient text
-    text_size_for_gradient = font.get_rect(text).size  
-    temp_surf_gradient = pygame.Surface(text_size_for_gradient, pygame.SRCALPHA)
-    temp_surf_gradient_rect = temp_surf_gradient.get_rect()
-
-    # Apply gradient to the temporary surface
     num_gradient_colors = len(gradient_colors)
     if num_gradient_colors < 2:
         # Fallback to solid color if not enough gradient colors are provided
@@ -30,18 +242,17 @@ def render_text_gradient(font, text, rect, surface, gradient_colors, border_colo
         surface.blit(text_surf_main, text_rect_main)
         return
 
-    for y_pixel in range(temp_surf_gradient_rect.height):
-        t = y_pixel / temp_surf_gradient_rect.height
-        r = int(gradient_colors[0][0] * (1 - t) + gradient_colors[1][0] * t)
-        g = int(gradient_colors[0][1] * (1 - t) + gradient_colors[1][1] * t)
-        b = int(gradient_colors[0][2] * (1 - t) + gradient_colors[1][2] * t)
-        current_color = (r, g, b)
-        pygame.draw.line(temp_surf_gradient, current_color, (0, y_pixel), (temp_surf_gradient_rect.width, y_pixel))
+    key = (_font_key(font), text, tuple(tuple(c) for c in gradient_colors), tuple(border_color), border_thickness,
+           direction, glow_radius, tuple(glow_color) if glow_color else None)
+    composed = _text_cache.get(key)
+    if composed is None:
+        composed = _compose_text_gradient(font, text, gradient_colors, border_color, border_thickness, direction,
+                                          glow_radius, glow_color)
+        _text_cache[key] = composed
+        if len(_text_cache) > _TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
 
-    # Use the text as a mask to apply the gradient only to the text
-    text_surf_mask, _ = font.render(text, (255, 255, 255)) # Render white text to use as mask
-    temp_surf_gradient.blit(text_surf_mask, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
-    
     # Blit the final gradient text to the main surface
-    final_text_rect = temp_surf_gradient.get_rect(center=rect.center)
-    surface.blit(temp_surf_gradient, final_text_rect)
\ No newline at end of file
+    surface.blit(composed, composed.get_rect(center=rect.center))
@@ -0,0 +1,359 @@
+# replay.py
+"""
+Grabación y reproducción de partidas.
+
+Formato binario (little-endian):
+    cabecera   b"STRP" | versión u8 | semilla u64 | len u32 | JSON {config, game_options, started_at}
+    registros  'F' dt_ms u16, ahora f64          -> inicio de fotograma (instante del reloj de juego, game_clock.py)
+               'K' letra u8, instante u32        -> pulsación A-Z dentro del fotograma (instante SDL, informativo)
+               'S' letra u8, x i16, y i16, tipo u8 -> aparición de una letra (informativo)
+               'X' fotograma u32, t_ms u32, flags u8, len u32, zlib(JSON) -> keyframe con el estado completo
+    índice     'I' n u32 | n x (t_ms u32, fotograma u32, offset u64)   (solo keyframes KF_SEEKABLE)
+    cola       offset_índice u64 | b"STRI"
+
+Grabar es opcional: la sesión solo graba con la opción de juego "grabar_partida"
+(JuegoATH la activa con "grabar_partidas": true en config.json).
+
+La reproducción re-simula la sesión (misma semilla, mismos dt y mismas pulsaciones),
+así que es determinista. Los keyframes permiten saltar a cualquier instante sin
+re-simular desde el principio. El archivo se mapea en memoria: cargar solo lee
+cabecera e índice, y buscar un instante lee y decodifica un keyframe y como mucho
+KEYFRAME_INTERVAL_MS de fotogramas; el resto del archivo no se toca.
+
+Uso:
+    python replay.py replays/partida.strp              # reproducir a 1x
+    python replay.py replays/partida.strp --speed 4    # avance rápido
+    python replay.py replays/partida.strp --headless   # re-simular a máxima velocidad
+    python replay.py replays/partida.strp --seek 600   # empezar en el segundo 600
+"""
+
+import bisect
+import glob
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+MAGIC = b"STRP"
+INDEX_MAGIC = b"STRI"
+VERSION = 4  # 2: instantes del reloj de juego en lugar de time.time(); 3: efectos mejorados en los keyframes;
+             # 4: línea de apariciones y dificultad adaptativa
+REPLAY_DIR = "replays"
+MAX_REPLAYS = 10
+KEYFRAME_INTERVAL_MS = 5000
+# Los keyframes periódicos se escriben antes del registro 'F' de su fotograma y sirven para buscar.
+# Los de re-sincronización (tras una pausa) se escriben a mitad de fotograma y no se indexan.
+KF_SEEKABLE = 1
+
+REC_FRAME, REC_KEY, REC_SPAWN, REC_KEYFRAME, REC_INDEX = b"F", b"K", b"S", b"X", b"I"
+SPAWN_TYPES = {'nave': 0, 'barco': 1, 'barco_left': 2}
+
+_HEADER = struct.Struct("<4sBQI")
+_FRAME = struct.Struct("<Hd")
+_KEY = struct.Struct("<BI")
+_SPAWN = struct.Struct("<Bhhb")
+_KEYFRAME = struct.Struct("<IIBI")
+_INDEX_ENTRY = struct.Struct("<IIQ")
+_TRAILER = struct.Struct("<Q4s")
+
+
+def _letter_code(char) -> int:
+    return ord(char) - ord('A') if char and 'A' <= char <= 'Z' else 255
+
+
+def _clamp_i16(value) -> int:
+    return max(-32768, min(32767, int(value)))
+
+
+class ReplayRecorder:
+    """Escribe el flujo de una sesión en curso. Los métodos record_* son O(1)."""
+
+    def __init__(self, path: str, seed: int, config: Dict, game_options: Dict):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "wb")
+        meta = json.dumps({"config": {k: list(v) if isinstance(v, tuple) else v for k, v in config.items()},
+                           "game_options": game_options,
+                           "started_at": datetime.now().isoformat()}).encode("utf-8")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, seed & 0xFFFFFFFFFFFFFFFF, len(meta)))
+        self._file.write(meta)
+        self.frame_index = 0
+        self.time_ms = 0
+        self._last_keyframe_ms = None
+        self._index = []  # [(t_ms, fotograma, offset)]
+
+    @classmethod
+    def for_session(cls, session, directory: str = REPLAY_DIR) -> "ReplayRecorder":
+        """Crea un grabador con nombre por fecha y conserva solo las últimas MAX_REPLAYS grabaciones."""
+        prune_replays(directory, MAX_REPLAYS - 1)
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{session.game_mode}.strp"
+        return cls(os.path.join(directory, name), session.seed, session.config, session.game_options)
+
+    def record_frame(self, dt_ms: int, now: float):
+        self.frame_index += 1
+        self.time_ms += dt_ms
+        self._file.write(REC_FRAME + _FRAME.pack(min(dt_ms, 0xFFFF), now))
+
+    def record_key(self, letter: str, timestamp_ms: int):
+        self._file.write(REC_KEY + _KEY.pack(_letter_code(letter), timestamp_ms & 0xFFFFFFFF))
+
+    def record_spawn(self, letra: Dict):
+        self._file.write(REC_SPAWN + _SPAWN.pack(_letter_code(letra.get('char')), _clamp_i16(letra.get('icon_x', 0)),
+                                                 _clamp_i16(letra.get('icon_y', 0)), SPAWN_TYPES.get(letra.get('icon_type'), -1)))
+
+    def keyframe_due(self) -> bool:
+        return self._last_keyframe_ms is None or self.time_ms - self._last_keyframe_ms >= KEYFRAME_INTERVAL_MS
+
+    def record_keyframe(self, state: Dict, seekable: bool = True):
+        payload = zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+        if seekable:
+            self._index.append((self.time_ms, self.frame_index, self._file.tell()))
+            self._last_keyframe_ms = self.time_ms
+        self._file.write(REC_KEYFRAME + _KEYFRAME.pack(self.frame_index, self.time_ms, KF_SEEKABLE if seekable else 0, len(payload)))
+        self._file.write(payload)
+
+    def close(self):
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(REC_INDEX + struct.pack("<I", len(self._index)))
+        for entry in self._index:
+            self._file.write(_INDEX_ENTRY.pack(*entry))
+        self._file.write(_TRAILER.pack(index_offset, INDEX_MAGIC))
+        self._file.close()
+
+
+def prune_replays(directory: str = REPLAY_DIR, keep: int = MAX_REPLAYS):
+    """Elimina las grabaciones más antiguas dejando solo 'keep'."""
+    files = sorted(glob.glob(os.path.join(directory, "*.strp")))
+    for old in files[:max(0, len(files) - keep)]:
+        try: os.remove(old)
+        except OSError: pass
+
+
+class ReplayPlayer:
+    """Lee una grabación y la re-simula sobre una GameSession."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            # Mapeado de solo lectura: el sistema carga las páginas que se leen (cabecera, índice y lo buscado)
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Archivo vacío
+            self._file.close()
+            raise ValueError(f"{path} no es una grabación compatible")
+        except OSError:
+            self._file.close()
+            raise
+        if len(self.data) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} no es una grabación compatible")
+        magic, version, self.seed, meta_len = _HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} no es una grabación compatible")
+        meta = json.loads(self.data[_HEADER.size:_HEADER.size + meta_len])
+        self.config = meta["config"]
+        self.config["color"] = tuple(self.config["color"])
+        self.game_options = meta["game_options"]
+        self.started_at = meta.get("started_at")
+        self._body_start = _HEADER.size + meta_len
+        self._body_end, self.keyframes = self._read_index()
+        self._keyframe_times = [t for t, _, _ in self.keyframes]
+        self.session = None
+        self.time_ms = 0
+        self.frame_index = 0
+        self._offset = self._body_start
+        self.desyncs = 0
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+
+    # ------------------------------------------------------------------
+    # Índice
+    # ------------------------------------------------------------------
+    def _read_index(self) -> Tuple[int, List[Tuple[int, int, int]]]:
+        if len(self.data) >= _TRAILER.size:
+            index_offset, magic = _TRAILER.unpack_from(self.data, len(self.data) - _TRAILER.size)
+            if magic == INDEX_MAGIC and self.data[index_offset:index_offset + 1] == REC_INDEX:
+                (count,) = struct.unpack_from("<I", self.data, index_offset + 1)
+                base = index_offset + 5
+                entries = [_INDEX_ENTRY.unpack_from(self.data, base + i * _INDEX_ENTRY.size) for i in range(count)]
+                return index_offset, entries
+        # Grabación sin cerrar (p. ej. el juego se cerró de golpe): reconstruir el índice recorriéndola
+        entries = []
+        offset = self._body_start
+        for kind, value, start, end in self._iter_records(self._body_start, len(self.data)):
+            if kind == REC_KEYFRAME and value[2] & KF_SEEKABLE:
+                entries.append((value[1], value[0], start))
+            offset = end
+        return offset, entries
+
+    def _iter_records(self, offset: int, end: int):
+        """Genera (tipo, valores, inicio, fin) desde 'offset'. Se detiene ante un registro truncado."""
+        data = self.data
+        while offset < end:
+            kind = data[offset:offset + 1]; start = offset; offset += 1
+            try:
+                if kind == REC_FRAME:
+                    value = _FRAME.unpack_from(data, offset); offset += _FRAME.size
+                elif kind == REC_KEY:
+                    value = _KEY.unpack_from(data, offset); offset += _KEY.size
+                elif kind == REC_SPAWN:
+                    value = _SPAWN.unpack_from(data, offset); offset += _SPAWN.size
+                elif kind == REC_KEYFRAME:
+                    value = _KEYFRAME.unpack_from(data, offset); offset += _KEYFRAME.size + value[3]
+                    if offset > end: return
+                else:
+                    return
+            except struct.error:
+                return
+            yield kind, value, start, offset
+
+    def _decode_keyframe(self, offset: int) -> Dict:
+        frame, t_ms, flags, length = _KEYFRAME.unpack_from(self.data, offset + 1)
+        start = offset + 1 + _KEYFRAME.size
+        return json.loads(zlib.decompress(self.data[start:start + length]))
+
+    # ------------------------------------------------------------------
+    # Información
+    # ------------------------------------------------------------------
+    @property
+    def duration_ms(self) -> int:
+        if not self.keyframes:
+            return 0
+        # Último keyframe + fotogramas posteriores
+        t_ms = self.keyframes[-1][0]
+        for kind, value, _, _ in self._iter_records(self.keyframes[-1][2], self._body_end):
+            if kind == REC_FRAME: t_ms += value[0]
+        return t_ms
+
+    def frame_times(self) -> List[int]:
+        """Duración en ms de cada fotograma grabado (para localizar picos)."""
+        return [value[0] for kind, value, _, _ in self._iter_records(self._body_start, self._body_end) if kind == REC_FRAME]
+
+    def spawn_events(self) -> List[Tuple[int, str, int, int, int]]:
+        """Lista de (t_ms, letra, icon_x, icon_y, tipo) de todas las apariciones grabadas."""
+        events, t_ms = [], 0
+        for kind, value, _, _ in self._iter_records(self._body_start, self._body_end):
+            if kind == REC_FRAME: t_ms += value[0]
+            elif kind == REC_SPAWN: events.append((t_ms, chr(ord('A') + value[0]) if value[0] < 26 else '?', value[1], value[2], value[3]))
+        return events
+
+    # ------------------------------------------------------------------
+    # Reproducción
+    # ------------------------------------------------------------------
+    def create_session(self, main_module):
+        """Crea la GameSession de reproducción en el primer keyframe."""
+        from game_session import GameSession
+        if not self.keyframes:
+            raise ValueError("La grabación no contiene keyframes")
+        state = self._decode_keyframe(self.keyframes[0][2])
+        self.session = GameSession(main_module, dict(self.config), dict(self.game_options), initial_state=state,
+                                   seed=self.seed, show_countdown=False, record_replay=False)
+        self.session._restore_keyframe_state(state)
+        self.time_ms, self.frame_index = self.keyframes[0][0], self.keyframes[0][1]
+        self._offset = self.keyframes[0][2]
+        self._skip_record()
+        return self.session
+
+    def _skip_record(self):
+        for _, _, _, end in self._iter_records(self._offset, self._body_end):
+            self._offset = end
+            return
+
+    def seek(self, target_ms: int):
+        """Sitúa la sesión en 'target_ms': restaura el keyframe anterior y re-simula hasta el instante."""
+        i = max(0, bisect.bisect_right(self._keyframe_times, target_ms) - 1)
+        t_ms, frame, offset = self.keyframes[i]
+        if not (self.time_ms <= target_ms and t_ms <= self.time_ms):
+            # Solo se restaura si el keyframe está más cerca que la posición actual
+            self.session._restore_keyframe_state(self._decode_keyframe(offset))
+            self.time_ms, self.frame_index, self._offset = t_ms, frame, offset
+            self._skip_record()
+        while self.time_ms < target_ms and self.step():
+            pass
+
+    def step(self) -> bool:
+        """Re-simula un fotograma completo. Retorna False al final de la grabación."""
+        session = self.session
+        frame_started = False
+        for kind, value, start, end in self._iter_records(self._offset, self._body_end):
+            if kind == REC_FRAME:
+                if frame_started:
+                    break  # Comienzo del fotograma siguiente
+                frame_started = True
+                dt_ms, now = value
+                dt = session._begin_frame(dt_ms, now)
+            elif kind == REC_KEY:
+                if value[0] < 26:
+                    session._handle_keypress(chr(ord('A') + value[0]))
+            elif kind == REC_KEYFRAME:
+                if frame_started and value[2] & KF_SEEKABLE:
+                    break  # Pertenece al fotograma siguiente
+                # Keyframes intermedios (p. ej. tras una pausa) re-sincronizan el estado
+                state = self._decode_keyframe(start)
+                if state.get("score_manager_j1") != session.player_managers["J1"].to_dict():
+                    self.desyncs += 1
+                session._restore_keyframe_state(state)
+            self._offset = end
+        if not frame_started:
+            return False
+        session._update_state(dt)
+        self.time_ms += dt_ms
+        self.frame_index += 1
+        return True
+
+    def play(self, speed: float = 1.0, headless: bool = False, start_ms: int = 0):
+        """Reproduce desde 'start_ms'. headless=True re-simula sin dibujar ni esperar."""
+        import pygame
+        if start_ms: self.seek(start_ms)
+        main = self.session.main
+        frames = 0
+        t0 = time.perf_counter()
+        draw_every = max(1, int(speed))
+        while True:
+            if not self.step():
+                break
+            frames += 1
+            if headless:
+                continue
+            for evento in pygame.event.get():
+                if evento.type == pygame.QUIT or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
+                    return
+            if frames % draw_every == 0:
+                self.session._draw_elements()
+            # Esperar hasta el instante de pared que corresponde a este fotograma
+            target = (self.time_ms - start_ms) / 1000.0 / speed
+            delay = target - (time.perf_counter() - t0)
+            if delay > 0: time.sleep(delay)
+        elapsed = time.perf_counter() - t0
+        print(f"Reproducidos {frames} fotogramas ({self.time_ms / 1000:.1f} s de juego) en {elapsed:.2f} s. "
+              f"Puntuación J1: {self.session.player_managers['J1'].get_score()}. Desincronizaciones: {self.desyncs}")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Reproduce una grabación de SpeedType")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--seek", type=float, default=0.0, help="Segundo de inicio")
+    args = parser.parse_args()
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import JuegoATH
+    t0 = time.perf_counter()
+    player = ReplayPlayer(args.path)
+    player.create_session(JuegoATH)
+    print(f"Cargado en {(time.perf_counter() - t0) * 1000:.1f} ms ({player.duration_ms / 1000:.1f} s grabados)")
+    try:
+        player.play(speed=args.speed, headless=args.headless, start_ms=int(args.seek * 1000))
+    finally:
+        player.close()
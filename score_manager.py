@@ -9,17 +9,28 @@ class ScoreManager:
         self.racha_actual = 0
         self.is_double_score_active = is_double_score_active # Estado inicial de doble puntuación
 
-    def add_score(self):
+    def add_score(self, multiplier=1):
         """Añade puntos al marcador, considerando el power-up de doble puntuación.
-        Cada acierto suma 1 punto, o 2 si el power-up de doble puntuación está activo.
+        Cada acierto suma 1 punto, o 2 si el power-up de doble puntuación está activo,
+        multiplicado por 'multiplier' (efectos de enhanced_powerups.py).
         También incrementa el contador de aciertos y la racha actual."""
-        points_to_add = 1
+        points_to_add = multiplier
         if self.is_double_score_active:
             points_to_add *= 2
         self.score += points_to_add
         self.aciertos += 1
         self.racha_actual += 1
-        #Por agregar bonos.
+
+    def award_batch(self, count, points_each=1, multiplier=1):
+        """Otorga de una vez los puntos de 'count' letras eliminadas sin teclearlas (p. ej. por la
+        bomba de tiempo): 'points_each' por letra, con el multiplicador y la doble puntuación.
+        No cuenta aciertos ni altera la racha. Retorna los puntos sumados."""
+        points_to_add = count * points_each * multiplier
+        if self.is_double_score_active:
+            points_to_add *= 2
+        self.score += points_to_add
+        return points_to_add
+
     def handle_miss(self, shielded=False):
         """Maneja un fallo. Reinicia la racha y cuenta el fallo si no está protegido
         por un escudo. No resta puntos del marcador."""
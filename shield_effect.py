@@ -0,0 +1,106 @@
+# shield_effect.py
+"""
+Efecto visual del escudo. Los anillos se pre-renderizan una vez (uno por nivel
+de alfa del pulso) y las letras más amenazadas se mantienen de forma incremental
+durante la pasada de actualización, así que dibujar el efecto no asigna
+superficies ni recorre todas las letras.
+"""
+
+import math
+
+import pygame
+
+SHIELD_ACTIVE_COLOR = (20, 200, 255)
+SHIELD_IDLE_COLOR = (50, 50, 50, 50)
+PULSE_LEVELS = 32  # Niveles de alfa pre-renderizados para el pulso
+PULSE_FREQUENCY = 8
+
+
+def letter_danger(letra, ancho, alto):
+    """Distancia que le queda a la letra para salir de pantalla (menor = más amenazada)."""
+    vx = letra.get('icon_vx', 0)
+    if vx == 0:
+        return alto - letra['icon_y']
+    return ancho - letra['icon_x'] if vx > 0 else letra['icon_x']
+
+
+class EndangeredTracker:
+    """
+    Las 'capacity' letras más amenazadas, ordenadas de mayor a menor peligro.
+    Se vacía al empezar la pasada de actualización y cada letra se ofrece una vez;
+    las listas internas están preasignadas y se reutilizan entre fotogramas.
+    """
+
+    def __init__(self, capacity=1):
+        self.capacity = max(1, capacity)
+        self.letters = [None] * self.capacity
+        self.dangers = [math.inf] * self.capacity
+        self.count = 0
+
+    def begin(self):
+        for i in range(self.count):
+            self.letters[i] = None
+            self.dangers[i] = math.inf
+        self.count = 0
+
+    def offer(self, letra, danger):
+        if self.count == self.capacity and danger >= self.dangers[self.count - 1]:
+            return
+        # Inserción ordenada desplazando hacia la derecha (capacity es pequeño)
+        i = self.count if self.count < self.capacity else self.capacity - 1
+        while i > 0 and self.dangers[i - 1] > danger:
+            self.letters[i] = self.letters[i - 1]
+            self.dangers[i] = self.dangers[i - 1]
+            i -= 1
+        self.letters[i] = letra
+        self.dangers[i] = danger
+        if self.count < self.capacity:
+            self.count += 1
+
+    def discard(self, letra):
+        """Quita una letra eliminada fuera de la pasada de actualización (p. ej. al acertarla)."""
+        for i in range(self.count):
+            if self.letters[i] is letra:
+                for j in range(i, self.count - 1):
+                    self.letters[j] = self.letters[j + 1]
+                    self.dangers[j] = self.dangers[j + 1]
+                self.count -= 1
+                self.letters[self.count] = None
+                self.dangers[self.count] = math.inf
+                return
+
+
+class ShieldEffect:
+    """Anillos del escudo pre-renderizados: uno apagado y PULSE_LEVELS niveles del pulso activo."""
+
+    def __init__(self, radius, thickness=3, levels=PULSE_LEVELS):
+        self.radius = radius
+        size = (radius * 2, radius * 2)
+        self.idle_ring = self._bake_ring(size, SHIELD_IDLE_COLOR, thickness)
+        # Alfa del pulso entre 100 y 255, como el efecto original
+        self.active_rings = [self._bake_ring(size, SHIELD_ACTIVE_COLOR + (int(100 + 155 * i / (levels - 1)),), thickness)
+                             for i in range(levels)]
+        self.levels = levels
+
+    def _bake_ring(self, size, color, thickness):
+        ring = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.circle(ring, color, (self.radius, self.radius), self.radius, thickness)
+        return ring
+
+    def ring_for(self, now, active):
+        if not active:
+            return self.idle_ring
+        pulse = 0.5 + 0.5 * math.sin(now * PULSE_FREQUENCY)
+        return self.active_rings[int(pulse * (self.levels - 1) + 0.5)]
+
+    def draw(self, surface, center, now, active):
+        surface.blit(self.ring_for(now, active), (center[0] - self.radius, center[1] - self.radius))
+
+    def draw_tracked(self, surface, tracker, now, active):
+        """Dibuja el anillo sobre cada letra seguida por 'tracker' (posición de la letra remolcada)."""
+        ring = self.ring_for(now, active)
+        radius = self.radius
+        letters = tracker.letters
+        for i in range(tracker.count):
+            letra = letters[i]
+            surface.blit(ring, (letra['letter_x'] - radius, letra['letter_y'] - radius))
@@ -0,0 +1,88 @@
+# spatial_hash.py
+"""
+Rejilla uniforme (spatial hash) para consultas de vecindad sobre las letras en
+pantalla. El espacio se divide en celdas cuadradas de 'cell_size' píxeles;
+cada celda es un diccionario clave -> entrada, así que insertar, quitar y
+mover una entrada cuesta O(1) (mover dentro de la misma celda solo actualiza
+las coordenadas). Una consulta de radio r recorre las celdas que cubren el
+círculo: su coste depende de cuántas entradas hay cerca, no del total.
+
+Las coordenadas pueden ser negativas (naves que entran desde fuera de la pantalla).
+"""
+
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+class SpatialHash:
+    """Índice espacial de entradas (clave, x, y, objeto) en celdas de 'cell_size' píxeles."""
+
+    def __init__(self, cell_size: float = 128):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, list]] = {}
+        self._entries: Dict[Hashable, list] = {}  # clave -> [celda, x, y, objeto]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, key: Hashable, x: float, y: float, item: Any = None):
+        if key in self._entries:
+            self.remove(key)
+        cell = self._cell(x, y)
+        entry = [cell, x, y, item]
+        self._entries[key] = entry
+        self._cells.setdefault(cell, {})[key] = entry
+
+    def remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        bucket = self._cells[entry[0]]
+        del bucket[key]
+        if not bucket:
+            del self._cells[entry[0]]
+
+    def move(self, key: Hashable, x: float, y: float):
+        entry = self._entries[key]
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        if cell != entry[0]:
+            bucket = self._cells[entry[0]]
+            del bucket[key]
+            if not bucket:
+                del self._cells[entry[0]]
+            self._cells.setdefault(cell, {})[key] = entry
+            entry[0] = cell
+        entry[1] = x; entry[2] = y
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+
+    def _near(self, x: float, y: float, radius: float):
+        """Entradas a 'radius' o menos de (x, y)."""
+        size = self.cell_size
+        x0, x1 = int((x - radius) // size), int((x + radius) // size)
+        y0, y1 = int((y - radius) // size), int((y + radius) // size)
+        limite = radius * radius
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for entry in bucket.values():
+                        dx, dy = entry[1] - x, entry[2] - y
+                        if dx * dx + dy * dy <= limite:
+                            yield entry
+
+    def query(self, x: float, y: float, radius: float) -> List[Any]:
+        """Objetos de las entradas a 'radius' o menos de (x, y)."""
+        return [entry[3] for entry in self._near(x, y, radius)]
+
+    def count_within(self, x: float, y: float, radius: float) -> int:
+        """Número de entradas a 'radius' o menos de (x, y)."""
+        return sum(1 for _ in self._near(x, y, radius))
@@ -0,0 +1,130 @@
+# spawn_scheduler.py
+"""
+Línea de tiempo de apariciones de letras (modo 1 jugador).
+
+Los eventos de aparición se guardan en un montículo mínimo ordenado por
+instante del reloj de juego. Hay tres fuentes:
+
+- flujo continuo: un evento que se re-planifica solo, a 1/ritmo segundos
+  (con algo de variación); el ritmo lo da una curva (letras por segundo en
+  función del instante, p. ej. según el nivel).
+- ráfagas (burst): N letras en un instante.
+- oleadas (wave): N letras repartidas a intervalos iguales en una duración.
+
+Los eventos vencidos se acumulan en 'pending' y se entregan como mucho
+max_per_frame por fotograma, sin superar max_letters en pantalla: una
+oleada de 50 letras se reparte entre fotogramas en lugar de crearlas todas
+en uno. El flujo continuo no acumula letras mientras la pantalla está llena.
+Además se mantienen al menos min_letters en pantalla, para que la partida
+nunca se quede sin letras que escribir.
+
+Los instantes se serializan en forma relativa (to_dict/load_dict) para las
+partidas guardadas y en forma exacta (snapshot/restore) para los keyframes.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional
+
+STREAM = "flujo"  # Tipo del evento que se re-planifica solo
+STREAM_JITTER = 0.3  # Variación del intervalo del flujo: +-30%
+
+
+class SpawnScheduler:
+    """Planificador de apariciones sobre el reloj de juego; due() dice cuántas letras crear en cada fotograma."""
+
+    def __init__(self, clock, rng, rate_curve: Callable[[float], float], max_letters: int = 3,
+                 min_letters: int = 1, max_per_frame: int = 2):
+        self.clock = clock
+        self.rng = rng
+        self.rate_curve = rate_curve  # instante de juego -> letras por segundo
+        self.max_letters = max_letters
+        self.min_letters = min_letters
+        self.max_per_frame = max_per_frame
+        self.pending = 0  # Letras vencidas aún sin crear
+        self._heap: List[tuple] = []  # (instante, secuencia, cantidad, tipo)
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, at: float, count: int, kind: Optional[str] = None):
+        heapq.heappush(self._heap, (at, next(self._sequence), count, kind))
+
+    def _stream_interval(self, now: float) -> float:
+        rate = self.rate_curve(now)
+        if rate <= 0:
+            return 1.0  # Sin flujo por ahora: se vuelve a consultar la curva en un segundo
+        return 1.0 / rate * self.rng.uniform(1 - STREAM_JITTER, 1 + STREAM_JITTER)
+
+    def start(self, now: Optional[float] = None):
+        """Inicia el flujo continuo (elimina el anterior si lo hubiera)."""
+        now = self.clock.now if now is None else now
+        self._heap = [event for event in self._heap if event[3] != STREAM]
+        heapq.heapify(self._heap)
+        self._push(now + self._stream_interval(now), 1, STREAM)
+
+    def burst(self, count: int, at: Optional[float] = None):
+        """'count' letras en el instante 'at' (ahora si es None)."""
+        self._push(self.clock.now if at is None else at, count)
+
+    def wave(self, count: int, duration: float, at: Optional[float] = None):
+        """'count' letras repartidas a intervalos iguales durante 'duration' segundos desde 'at'."""
+        start = self.clock.now if at is None else at
+        step = duration / count if count else 0.0
+        for i in range(count):
+            self._push(start + i * step, 1)
+
+    def due(self, on_screen: int, now: Optional[float] = None) -> int:
+        """
+        Procesa los eventos vencidos hasta 'now' y retorna cuántas letras crear en este fotograma,
+        dado que hay 'on_screen' en pantalla. El coste es O(log n) por evento vencido.
+        """
+        now = self.clock.now if now is None else now
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            at, _, count, kind = heapq.heappop(heap)
+            if kind == STREAM:
+                # Con la pantalla llena el flujo no se acumula: esa letra se pierde
+                if on_screen + self.pending < self.max_letters:
+                    self.pending += count
+                self._push(max(at + self._stream_interval(at), now), 1, STREAM)
+            else:
+                self.pending += count
+        # Nunca dejar la pantalla por debajo del mínimo
+        self.pending = max(self.pending, self.min_letters - on_screen)
+        count = min(self.pending, self.max_per_frame, self.max_letters - on_screen)
+        if count <= 0:
+            return 0
+        self.pending -= count
+        return count
+
+    def clear(self):
+        self._heap = []
+        self.pending = 0
+
+    # --- Serialización ---
+    def to_dict(self, now: Optional[float] = None) -> Dict:
+        """Forma relativa: segundos que faltan para cada evento."""
+        now = self.clock.now if now is None else now
+        return {"pending": self.pending,
+                "eventos": [{"en": at - now, "cantidad": count, "tipo": kind} for at, _, count, kind in sorted(self._heap)]}
+
+    def load_dict(self, data: Dict, now: Optional[float] = None):
+        now = self.clock.now if now is None else now
+        self.restore({"pending": data.get("pending", 0),
+                      "eventos": [{"instante": now + e["en"], "cantidad": e["cantidad"], "tipo": e.get("tipo")}
+                                  for e in data.get("eventos", [])]})
+        if not any(event[3] == STREAM for event in self._heap):
+            self.start(now)  # Partidas guardadas antes de existir la línea de tiempo
+
+    def snapshot(self) -> Dict:
+        """Estado con los instantes exactos del reloj (keyframes de las grabaciones)."""
+        return {"pending": self.pending,
+                "eventos": [{"instante": at, "cantidad": count, "tipo": kind} for at, _, count, kind in sorted(self._heap)]}
+
+    def restore(self, data: Dict):
+        self.clear()
+        self.pending = data.get("pending", 0)
+        for event in data.get("eventos", []):
+            self._push(event["instante"], event["cantidad"], event.get("tipo"))
@@ -0,0 +1,59 @@
+# sprite_cache.py
+"""
+Variantes pre-calculadas de un sprite: N orientaciones (y sus versiones
+espejadas) generadas una sola vez al cargar, rotando la imagen original a
+resolución completa y reduciéndola después con smoothscale. En tiempo de
+juego orientar una nave según su velocidad es una búsqueda en una lista,
+sin llamadas a transform.rotate.
+"""
+
+import math
+from typing import List, Tuple
+
+import pygame
+
+DEFAULT_ANGLES = 24  # Pasos de 15 grados
+
+
+class SpriteVariants:
+    """
+    Orientaciones de un sprite cuyo 'morro' apunta hacia arriba en la imagen base.
+    El índice 0 es la imagen sin rotar; los ángulos crecen en sentido antihorario,
+    como en pygame.transform.rotate.
+    """
+
+    def __init__(self, image: pygame.Surface, size: Tuple[int, int], angles: int = DEFAULT_ANGLES):
+        self.size = size
+        self.num_angles = max(1, angles)
+        self.step = 360.0 / self.num_angles
+        # Factor de escala de la imagen original al tamaño final (se aplica tras rotar)
+        self._scale = (size[0] / image.get_width(), size[1] / image.get_height())
+        self.rotated = self._build(image)
+        self.mirrored = self._build(pygame.transform.flip(image, True, False))
+
+    def _build(self, image: pygame.Surface) -> List[pygame.Surface]:
+        variants = []
+        for i in range(self.num_angles):
+            rotated = pygame.transform.rotate(image, i * self.step) if i else image
+            width = max(1, round(rotated.get_width() * self._scale[0]))
+            height = max(1, round(rotated.get_height() * self._scale[1]))
+            variants.append(pygame.transform.smoothscale(rotated, (width, height)))
+        return variants
+
+    def index_for_angle(self, degrees: float) -> int:
+        return int(round(degrees / self.step)) % self.num_angles
+
+    def index_for_velocity(self, vx: float, vy: float) -> int:
+        """Índice de la orientación con el morro en la dirección de (vx, vy), en coordenadas de pantalla."""
+        if vx == 0 and vy == 0:
+            return 0
+        return self.index_for_angle(math.degrees(math.atan2(-vx, -vy)))
+
+    def get(self, index: int, mirrored: bool = False) -> pygame.Surface:
+        return (self.mirrored if mirrored else self.rotated)[index % self.num_angles]
+
+    def for_angle(self, degrees: float, mirrored: bool = False) -> pygame.Surface:
+        return self.get(self.index_for_angle(degrees), mirrored)
+
+    def for_velocity(self, vx: float, vy: float, mirrored: bool = False) -> pygame.Surface:
+        return self.get(self.index_for_velocity(vx, vy), mirrored)
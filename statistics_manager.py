@@ -251,5 +251,6 @@ class StatisticsManager:
         self.wpm_history = []
         self.last_wpm_update = time.time()
         self.current_streak = 0
+        self.max_streak = 0
         self.key_stats = {}
         self.letters_per_second = []
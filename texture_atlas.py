@@ -0,0 +1,91 @@
+# texture_atlas.py
+"""
+Atlas de iconos: una sola imagen (atlas.png) con todos los iconos ya escalados
+a los tamaños que usa el juego y un índice JSON (atlas.json) con sus
+rectángulos. Se decodifica una vez y cada icono es una subsuperficie.
+
+El atlas se genera sin conexión con:
+    python create_powerup_images.py --atlas
+y se lee a través de asset_pack (del paquete assets.pak o de los archivos sueltos).
+
+Si falta el atlas o un icono no está empaquetado a ese tamaño, se carga el
+archivo suelto y se escala como antes (modo de desarrollo).
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from asset_pack import load_surface, read_bytes
+
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+
+
+def sprite_key(filename: str, size: Tuple[int, int]) -> str:
+    """Clave de un icono en el índice: archivo de origen y tamaño de uso."""
+    return f"{filename}@{size[0]}x{size[1]}"
+
+
+class TextureAtlas:
+    """Atlas cargado: imagen decodificada una vez y rectángulos por clave."""
+
+    def __init__(self, image: pygame.Surface, sprites: Dict[str, Dict]):
+        self.image = image
+        self.sprites = sprites
+        self._cache = {}
+
+    def has(self, key: str) -> bool:
+        return key in self.sprites
+
+    def get(self, key: str) -> pygame.Surface:
+        """Subsuperficie del icono (comparte píxeles con el atlas, sin copia)."""
+        surface = self._cache.get(key)
+        if surface is None:
+            entry = self.sprites[key]
+            surface = self._cache[key] = self.image.subsurface((entry["x"], entry["y"], entry["w"], entry["h"]))
+        return surface
+
+    @classmethod
+    def load(cls) -> Optional["TextureAtlas"]:
+        """Carga atlas.png + atlas.json. Retorna None si no existen o están dañados."""
+        try:
+            index = json.loads(read_bytes(ATLAS_INDEX))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error cargando el atlas de texturas: {e}")
+            return None
+        try:
+            return cls(load_surface(index.get("image", ATLAS_IMAGE)), index["sprites"])
+        except (OSError, pygame.error, KeyError) as e:
+            print(f"Error cargando el atlas de texturas: {e}")
+            return None
+
+
+_atlas = None
+_atlas_loaded = False
+
+
+def get_atlas() -> Optional[TextureAtlas]:
+    """Atlas del juego, cargado la primera vez que se pide (None si no hay atlas)."""
+    global _atlas, _atlas_loaded
+    if not _atlas_loaded:
+        _atlas = TextureAtlas.load()
+        _atlas_loaded = True
+    return _atlas
+
+
+def load_image(filename: str, size: Tuple[int, int]) -> pygame.Surface:
+    """
+    Icono 'filename' a 'size': del atlas si está empaquetado, si no del archivo suelto
+    (convert_alpha + scale). Lanza pygame.error/FileNotFoundError como pygame.image.load.
+    Del atlas se obtiene una subsuperficie compartida por todos los que piden el mismo
+    icono: se puede modificar sin riesgo (ver asset_pack), pero el cambio se ve en todos.
+    """
+    atlas = get_atlas()
+    key = sprite_key(filename, size)
+    if atlas is not None and atlas.has(key):
+        return atlas.get(key)
+    return pygame.transform.scale(load_surface(filename), size)
@@ -0,0 +1,114 @@
+# timer_scheduler.py
+"""
+Planificador de temporizadores sobre el reloj de juego (game_clock.py).
+
+Los temporizadores se guardan en un montículo mínimo ordenado por instante de
+vencimiento. run_due() solo mira la cima del montículo: un fotograma sin
+vencimientos cuesta O(1) sin importar cuántos efectos haya activos, y cada
+vencimiento cuesta O(log n). Cancelar es O(1) (la entrada se marca y se
+descarta cuando llega a la cima).
+
+Tipos de temporizador:
+- schedule / schedule_at: se dispara una vez (p. ej. fin de un power-up).
+- schedule_interval: se dispara cada 'interval' segundos de juego hasta
+  cancelarlo (efectos con actualización periódica).
+"""
+
+import heapq
+import itertools
+from typing import Callable, List, Optional
+
+
+class TimerHandle:
+    """Referencia a un temporizador planificado; permite cancelarlo."""
+
+    __slots__ = ("deadline", "callback", "args", "interval", "cancelled", "scheduler")
+
+    def __init__(self, deadline: float, callback: Callable, args: tuple, interval: Optional[float] = None,
+                 scheduler: Optional["TimerScheduler"] = None):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+        self.scheduler = scheduler  # Para que cancelar desde el handle descuente los pendientes
+
+    def cancel(self):
+        if self.scheduler is not None:
+            self.scheduler.cancel(self)
+        else:
+            self.cancelled = True
+
+
+class TimerScheduler:
+    """Montículo de temporizadores con vencimientos en segundos del reloj de juego."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._heap: List[tuple] = []  # (vencimiento, secuencia, handle)
+        self._sequence = itertools.count()  # Desempate estable: mismo vencimiento -> orden de alta
+        self._active = 0
+
+    def __len__(self) -> int:
+        """Temporizadores pendientes (sin contar los cancelados)."""
+        return self._active
+
+    def schedule_at(self, deadline: float, callback: Callable, *args, interval: Optional[float] = None) -> TimerHandle:
+        handle = TimerHandle(deadline, callback, args, interval, self)
+        heapq.heappush(self._heap, (deadline, next(self._sequence), handle))
+        self._active += 1
+        return handle
+
+    def schedule(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """Llama a callback(*args) cuando hayan pasado 'delay' segundos de juego."""
+        return self.schedule_at(self.clock.now + delay, callback, *args)
+
+    def schedule_interval(self, interval: float, callback: Callable, *args) -> TimerHandle:
+        """Llama a callback(*args) cada 'interval' segundos de juego hasta cancelar el handle."""
+        return self.schedule_at(self.clock.now + interval, callback, *args, interval=interval)
+
+    def cancel(self, handle: Optional[TimerHandle]):
+        if handle is not None and not handle.cancelled:
+            handle.cancelled = True
+            self._active -= 1
+
+    def next_deadline(self) -> Optional[float]:
+        self._discard_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def _discard_cancelled(self):
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """
+        Dispara, en orden de vencimiento, los temporizadores vencidos (vencimiento < now).
+        Un temporizador periódico atrasado se dispara una vez y se re-planifica a partir de now.
+        Retorna el número de llamadas realizadas.
+        """
+        if now is None: now = self.clock.now
+        heap = self._heap
+        fired = 0
+        while heap:
+            deadline, _, handle = heap[0]
+            if handle.cancelled:
+                heapq.heappop(heap); continue
+            if deadline >= now:
+                break
+            heapq.heappop(heap)
+            if handle.interval is not None:
+                handle.deadline = max(deadline + handle.interval, now)
+                heapq.heappush(heap, (handle.deadline, next(self._sequence), handle))
+            else:
+                handle.cancelled = True
+                self._active -= 1
+            handle.callback(*handle.args)
+            fired += 1
+        return fired
+
+    def clear(self):
+        for _, _, handle in self._heap:
+            handle.cancelled = True
+        self._heap.clear()
+        self._active = 0